@@ -0,0 +1,169 @@
+"""
+NumPy-backed category statistics for corpus-scale requirement sets.
+
+CategoryMatrix matches every requirement against the taxonomy once and keeps
+the result as a sparse requirement × keyword incidence matrix (CSR index
+arrays). Category membership, per-category and per-section counts,
+co-occurrence and gaps are then derived with array operations instead of
+re-scanning texts or looping over requirements in Python.
+
+Membership agrees with group_requirements() for the same taxonomy and
+matching mode.
+"""
+
+from typing import Iterable, Optional
+
+import numpy as np
+
+from app.taxonomy import get_taxonomy
+
+
+class CategoryMatrix:
+    """
+    Requirement × keyword incidence for one taxonomy.
+
+    Args:
+        requirements (Iterable[dict]): Requirement dicts with a "text" key and
+            optionally a "section" key (used by the per-section statistics).
+        taxonomy_path (str | None): Taxonomy file (default taxonomy if None).
+        word_boundary (bool): Only match whole words.
+        stem (bool): Match on stemmed words.
+
+    Attributes:
+        categories (list[str]): Column labels of the category statistics.
+        keywords (list[str]): Column labels of the incidence matrix.
+        sections (list[str]): Section labels in order of first appearance.
+        indptr, indices (np.ndarray): CSR structure of the incidence matrix;
+            the keywords of requirement i are indices[indptr[i]:indptr[i + 1]].
+        keyword_categories (np.ndarray): keywords × categories boolean matrix.
+    """
+
+    def __init__(
+        self,
+        requirements: Iterable[dict],
+        taxonomy_path: Optional[str] = None,
+        word_boundary: bool = False,
+        stem: bool = False,
+    ):
+        matcher = get_taxonomy(taxonomy_path).matcher(
+            word_boundary=word_boundary, stem=stem
+        )
+        self.requirements = list(requirements)
+        self.categories = list(matcher.categories)
+        self.keywords = list(matcher.keywords)
+
+        self.keyword_categories = np.zeros(
+            (len(self.keywords), len(self.categories)), dtype=bool
+        )
+        for row, mask in enumerate(matcher.keyword_masks):
+            for column in range(len(self.categories)):
+                self.keyword_categories[row, column] = bool(mask >> column & 1)
+
+        indices: list[int] = []
+        lengths = np.zeros(len(self.requirements), dtype=np.int64)
+        section_ids: dict[str, int] = {}
+        section_index = np.zeros(len(self.requirements), dtype=np.int64)
+        for row, req in enumerate(self.requirements):
+            found = sorted(matcher.match_keywords(req.get("text", "")))
+            indices.extend(found)
+            lengths[row] = len(found)
+            section = req.get("section") or ""
+            section_index[row] = section_ids.setdefault(section, len(section_ids))
+
+        self.indices = np.array(indices, dtype=np.int64)
+        self.indptr = np.concatenate(([0], np.cumsum(lengths)))
+        self.sections = list(section_ids)
+        self._section_index = section_index
+        self._membership: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_sections(cls, parsed_sections: list[dict], **kwargs) -> "CategoryMatrix":
+        """
+        Builds the matrix from parsed sections, taking requirements as
+        extract_requirement_lines() does and labelling each with its section title.
+        """
+        from app.export import extract_requirement_lines
+
+        requirements = [
+            dict(req, section=section.get("title", ""))
+            for section in parsed_sections
+            for req in extract_requirement_lines([section])
+        ]
+        return cls(requirements, **kwargs)
+
+    @property
+    def membership(self) -> np.ndarray:
+        """
+        requirements × categories boolean matrix: incidence @ keyword_categories.
+        """
+        if self._membership is None:
+            membership = np.zeros(
+                (len(self.requirements), len(self.categories)), dtype=bool
+            )
+            rows = np.flatnonzero(np.diff(self.indptr))
+            if rows.size:
+                # OR-reduce each non-empty row's keyword -> category rows
+                hits = self.keyword_categories[self.indices]
+                membership[rows] = np.logical_or.reduceat(
+                    hits, self.indptr[rows], axis=0
+                )
+            self._membership = membership
+        return self._membership
+
+    def category_counts(self) -> dict[str, int]:
+        """
+        Number of requirements in each category.
+        """
+        counts = self.membership.sum(axis=0)
+        return {c: int(n) for c, n in zip(self.categories, counts)}
+
+    def keyword_counts(self) -> dict[str, int]:
+        """
+        Number of requirements containing each (normalized) keyword.
+        """
+        counts = np.bincount(self.indices, minlength=len(self.keywords))
+        return {k: int(n) for k, n in zip(self.keywords, counts)}
+
+    def section_counts(self) -> np.ndarray:
+        """
+        sections × categories matrix of requirement counts (rows follow
+        `sections`, columns follow `categories`).
+        """
+        counts = np.zeros((len(self.sections), len(self.categories)), dtype=np.int64)
+        np.add.at(counts, self._section_index, self.membership)
+        return counts
+
+    def co_occurrence(self) -> np.ndarray:
+        """
+        categories × categories matrix: entry (a, b) is the number of
+        requirements in both a and b (the diagonal holds category counts).
+        """
+        membership = self.membership.astype(np.int64)
+        return membership.T @ membership
+
+    def gaps(self) -> list[str]:
+        """
+        Categories without any requirement, as detect_gaps() reports them.
+        """
+        counts = self.membership.sum(axis=0)
+        return [c for c, n in zip(self.categories, counts) if n == 0]
+
+    def section_gaps(self) -> dict[str, list[str]]:
+        """
+        Categories missing from each section.
+        """
+        counts = self.section_counts()
+        return {
+            section: [c for c, n in zip(self.categories, row) if n == 0]
+            for section, row in zip(self.sections, counts)
+        }
+
+    def groups(self) -> dict[str, list[dict]]:
+        """
+        Requirements per category, in the shape group_requirements() returns.
+        """
+        membership = self.membership
+        return {
+            category: [self.requirements[i] for i in np.flatnonzero(membership[:, c])]
+            for c, category in enumerate(self.categories)
+        }
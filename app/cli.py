@@ -0,0 +1,285 @@
+"""
+Batch command line interface for SpecSense corpora.
+
+    python -m app.cli specs/ "exports/**/*.txt" -o corpus.jsonl --workers 8 --llm
+
+Input files (.txt / .docx, given as files, directories or glob patterns) are
+ingested and parsed in a process pool. With --llm, each file's sections are
+analyzed as soon as it is parsed, all files sharing one limit on LLM requests
+in flight (on top of the process-wide rate limiter). One JSON object per
+section and per requirement is written as each file finishes; progress and a
+throughput summary go to stderr.
+
+Record shapes (one per line):
+    {"type": "section", "file", "index", "id", "title", "body",
+     "requirements": [ids], ["analysis", "tests" with --llm]}
+    {"type": "requirement", "file", "section", "section_index", "id", "text",
+     "categories": [taxonomy categories matched]}
+    {"type": "error", "file", "stage": "parse" | "llm", "error"}
+"""
+
+import argparse
+import asyncio
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional, TextIO
+
+from app.ingestion import parse_path
+from app.llm import DEFAULT_MAX_CONCURRENCY, analyze_sections_async
+from app.llm_client import close_shared_clients
+from app.taxonomy import get_taxonomy
+
+SUPPORTED_SUFFIXES = (".txt", ".docx")
+RECORD_TYPES = ("all", "sections", "requirements")
+
+
+def expand_inputs(patterns: list[str]) -> tuple[list[str], list[str]]:
+    """
+    Resolves files, directories (searched recursively) and glob patterns to
+    the supported files they contain.
+
+    Returns:
+        (files in input order without duplicates, inputs that matched nothing)
+    """
+    files: dict[str, None] = {}
+    unmatched = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            found = sorted(
+                os.path.join(root, name)
+                for root, _, names in os.walk(pattern)
+                for name in names
+            )
+        elif glob.has_magic(pattern):
+            found = sorted(glob.glob(pattern, recursive=True))
+        else:
+            found = [pattern] if os.path.isfile(pattern) else []
+        found = [path for path in found if path.lower().endswith(SUPPORTED_SUFFIXES)]
+        if not found:
+            unmatched.append(pattern)
+        files.update(dict.fromkeys(found))
+    return list(files), unmatched
+
+
+def process_file(path: str, taxonomy_path: Optional[str] = None) -> dict:
+    """
+    Parses one file (.txt streamed from its mapped bytes, see
+    app.ingestion.parse_path); runs in a worker process.
+
+    Returns:
+        dict: {"file", "bytes", "sections"}, each requirement carrying the
+        taxonomy "categories" its text matches.
+    """
+    sections = parse_path(path)
+    if sections is None:
+        raise ValueError(f"Unsupported file type: {path}")
+    matcher = get_taxonomy(taxonomy_path).matcher()
+    for section in sections:
+        for requirement in section["requirements"]:
+            requirement["categories"] = matcher.match(requirement["text"])
+    return {"file": path, "bytes": os.path.getsize(path), "sections": sections}
+
+
+def build_records(result: dict, analyses: Optional[list[dict]], record_types: str) -> list[dict]:
+    """
+    Flattens a processed file into JSONL records (see the module docstring).
+    """
+    records = []
+    for index, section in enumerate(result["sections"]):
+        if record_types in ("all", "sections"):
+            record = {
+                "type": "section",
+                "file": result["file"],
+                "index": index,
+                "id": section["id"],
+                "title": section["title"],
+                "body": section["body"],
+                "requirements": [r["id"] for r in section["requirements"]],
+            }
+            if analyses is not None:
+                record.update(analyses[index])
+            records.append(record)
+        if record_types in ("all", "requirements"):
+            records.extend(
+                {
+                    "type": "requirement",
+                    "file": result["file"],
+                    "section": section["title"],
+                    "section_index": index,
+                    "id": requirement["id"],
+                    "text": requirement["text"],
+                    "categories": requirement["categories"],
+                }
+                for requirement in section["requirements"]
+            )
+    return records
+
+
+class BatchStats:
+    """
+    Running totals for the progress lines and the final summary.
+    """
+
+    def __init__(self, total_files: int):
+        self.total_files = total_files
+        self.files = 0
+        self.failed = 0
+        self.sections = 0
+        self.requirements = 0
+        self.bytes = 0
+        self.records = 0
+        self.started = time.perf_counter()
+
+    def add(self, result: dict, records: int) -> None:
+        self.files += 1
+        self.sections += len(result["sections"])
+        self.requirements += sum(len(s["requirements"]) for s in result["sections"])
+        self.bytes += result["bytes"]
+        self.records += records
+
+    def summary(self) -> str:
+        elapsed = max(time.perf_counter() - self.started, 1e-9)
+        return (
+            f"Processed {self.files} of {self.total_files} files ({self.failed} failed): "
+            f"{self.sections} sections, {self.requirements} requirements, "
+            f"{self.bytes / 1e6:.1f} MB, {self.records} records in {elapsed:.1f} s "
+            f"({self.files / elapsed:.1f} files/s, {self.sections / elapsed:.0f} sections/s, "
+            f"{self.bytes / 1e6 / elapsed:.2f} MB/s)"
+        )
+
+
+def _write(out: TextIO, records: list[dict]) -> None:
+    for record in records:
+        out.write(json.dumps(record, ensure_ascii=False) + "\n")
+    out.flush()
+
+
+async def run_batch(
+    files: list[str],
+    out: TextIO,
+    executor: Executor,
+    use_llm: bool = False,
+    llm_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    taxonomy_path: Optional[str] = None,
+    record_types: str = "all",
+    progress: Optional[TextIO] = None,
+) -> BatchStats:
+    """
+    Processes `files` on `executor`, writing each file's records to `out` as
+    soon as it (and, with `use_llm`, its analysis) is done.
+
+    Returns:
+        BatchStats: Totals for the run.
+    """
+    loop = asyncio.get_running_loop()
+    # One limit for every file, so concurrency does not grow with the corpus
+    llm_limit = asyncio.Semaphore(max(1, llm_concurrency))
+    stats = BatchStats(len(files))
+
+    async def handle(path: str) -> tuple[str, Optional[dict], Optional[list], Optional[dict]]:
+        try:
+            result = await loop.run_in_executor(executor, process_file, path, taxonomy_path)
+        except Exception as e:
+            return path, None, None, {"stage": "parse", "error": str(e)}
+        if not use_llm:
+            return path, result, None, None
+        try:
+            analyses = await analyze_sections_async(
+                [section["body"] for section in result["sections"]], semaphore=llm_limit
+            )
+        except Exception as e:
+            return path, result, None, {"stage": "llm", "error": str(e)}
+        return path, result, analyses, None
+
+    done = 0
+    try:
+        for finished in asyncio.as_completed([handle(path) for path in files]):
+            path, result, analyses, error = await finished
+            done += 1
+            records = build_records(result, analyses, record_types) if result else []
+            if error:
+                stats.failed += 1
+                records.append({"type": "error", "file": path, **error})
+            _write(out, records)
+            if result:
+                stats.add(result, len(records))
+            if progress:
+                detail = (
+                    f"{len(result['sections'])} sections" if result else "failed"
+                ) + (f" ({error['stage']} error: {error['error']})" if error else "")
+                print(f"[{done}/{len(files)}] {path}: {detail}", file=progress)
+    finally:
+        # Close this loop's HTTP pools before asyncio.run() tears the loop down
+        await close_shared_clients()
+    return stats
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.cli",
+        description="Parse .txt/.docx SRS files in bulk and write JSONL records.",
+    )
+    parser.add_argument("inputs", nargs="+", help="files, directories or glob patterns")
+    parser.add_argument("-o", "--output", default="-", help="JSONL output file (default: stdout)")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="parser processes (0 parses in this process)",
+    )
+    parser.add_argument("--llm", action="store_true", help="also run LLM analysis per section")
+    parser.add_argument(
+        "--llm-concurrency",
+        type=int,
+        default=DEFAULT_MAX_CONCURRENCY,
+        help="LLM requests in flight across all files",
+    )
+    parser.add_argument("--taxonomy", help="requirement taxonomy file for categories")
+    parser.add_argument("--records", choices=RECORD_TYPES, default="all")
+    parser.add_argument("-q", "--quiet", action="store_true", help="no per-file progress")
+    args = parser.parse_args(argv)
+
+    files, unmatched = expand_inputs(args.inputs)
+    for pattern in unmatched:
+        print(f"warning: no .txt or .docx files match {pattern}", file=sys.stderr)
+    if not files:
+        parser.error("no input files")
+    if args.taxonomy:
+        try:
+            get_taxonomy(args.taxonomy)
+        except ValueError as e:
+            parser.error(str(e))
+
+    executor: Executor = (
+        ProcessPoolExecutor(max_workers=args.workers)
+        if args.workers > 0
+        else ThreadPoolExecutor(max_workers=1)
+    )
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        with executor:
+            stats = asyncio.run(
+                run_batch(
+                    files,
+                    out,
+                    executor,
+                    use_llm=args.llm,
+                    llm_concurrency=args.llm_concurrency,
+                    taxonomy_path=args.taxonomy,
+                    record_types=args.records,
+                    progress=None if args.quiet else sys.stderr,
+                )
+            )
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(stats.summary(), file=sys.stderr)
+    return 1 if stats.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,317 @@
+"""
+Streaming .docx reader.
+
+A .docx is a zip archive whose body lives in word/document.xml. Instead of
+building python-docx's object model for the whole document, the reader
+iterparses document.xml straight out of the zip and yields one paragraph or
+table row at a time, clearing each element once it has been read, so memory
+stays bounded by the largest paragraph or row rather than the document.
+Table rows can be rendered as requirement-ready lines (iter_docx_lines()), so
+requirements kept in Word tables (ID | Text | Priority) are not lost.
+
+Style ids are resolved against a map built once from word/styles.xml, and
+paragraph text and style names follow python-docx's Paragraph.text and
+Paragraph.style.name. Unlike python-docx's Document.paragraphs, paragraphs in
+body-level content controls (w:sdt, which Word uses to wrap generated TOCs)
+are included too.
+"""
+
+import zipfile
+from io import BytesIO
+import re
+from typing import Iterator, NamedTuple, Optional, Union
+
+from docx.styles import BabelFish
+from lxml import etree
+
+from app.requirement_ids import get_requirement_id_registry
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+
+class DocParagraph(NamedTuple):
+    """
+    A .docx paragraph: its text and style name ("" when unstyled).
+    """
+
+    text: str
+    style: str
+
+
+class DocTableRow(NamedTuple):
+    """
+    A row of a body-level .docx table: `table` and `row` are 0-based indexes
+    (tables counted in document order), `cells` the cell texts.
+    """
+
+    table: int
+    row: int
+    cells: tuple[str, ...]
+
+
+# Style given to table rows rendered as lines by iter_docx_lines()
+TABLE_ROW_STYLE = "Table Row"
+
+# Header words marking a table's requirement ID and text columns
+_ID_HEADERS = frozenset({"id", "ids", "identifier", "ref", "reference", "key"})
+_TEXT_HEADERS = frozenset({"text", "requirement", "requirements", "description", "statement"})
+_HEADER_WORD = re.compile(r"[a-z]+")
+
+
+def _w(tag: str) -> str:
+    return f"{{{W_NS}}}{tag}"
+
+
+W_BODY = _w("body")
+W_P = _w("p")
+W_TBL = _w("tbl")
+W_TR = _w("tr")
+W_TC = _w("tc")
+W_SDT = _w("sdt")
+W_SDT_CONTENT = _w("sdtContent")
+W_R = _w("r")
+W_HYPERLINK = _w("hyperlink")
+W_VAL = _w("val")
+W_TYPE = _w("type")
+
+# Run content and its text equivalent (w:t carries its own text; w:br depends on its type)
+_RUN_TEXT = {
+    _w("tab"): "\t",
+    _w("ptab"): "\t",
+    _w("cr"): "\n",
+    _w("noBreakHyphen"): "-",
+}
+
+
+def _open_zip(source) -> zipfile.ZipFile:
+    if isinstance(source, (bytes, bytearray)):
+        source = BytesIO(source)
+    return zipfile.ZipFile(source)
+
+
+def read_docx_styles(archive: zipfile.ZipFile) -> tuple[dict[str, str], str]:
+    """
+    Builds the paragraph style map of an opened .docx archive.
+
+    Returns:
+        (style id -> display name, name of the default paragraph style or "")
+    """
+    styles: dict[str, str] = {}
+    default = ""
+    try:
+        data = archive.read("word/styles.xml")
+    except KeyError:
+        return styles, default
+    for style in etree.fromstring(data).iter(_w("style")):
+        if style.get(W_TYPE) != "paragraph":
+            continue
+        name_el = style.find(_w("name"))
+        name = name_el.get(W_VAL, "") if name_el is not None else ""
+        name = BabelFish.internal2ui(name)
+        styles[style.get(_w("styleId"), "")] = name
+        if style.get(_w("default")) in ("1", "true", "on"):
+            default = name
+    return styles, default
+
+
+def _run_text(run) -> str:
+    parts = []
+    for child in run:
+        if child.tag == _w("t"):
+            parts.append(child.text or "")
+        elif child.tag == _w("br"):
+            if child.get(W_TYPE) in (None, "textWrapping"):
+                parts.append("\n")
+        else:
+            parts.append(_RUN_TEXT.get(child.tag, ""))
+    return "".join(parts)
+
+
+def paragraph_text(p) -> str:
+    """
+    Text of a w:p element, as python-docx's Paragraph.text computes it.
+    """
+    parts = []
+    for child in p:
+        if child.tag == W_R:
+            parts.append(_run_text(child))
+        elif child.tag == W_HYPERLINK:
+            parts.extend(_run_text(run) for run in child.iterchildren(W_R))
+    return "".join(parts)
+
+
+def paragraph_style(p, styles: dict[str, str], default: str) -> str:
+    """
+    Style name of a w:p element; unknown or missing style ids resolve to
+    the default paragraph style, as in python-docx.
+    """
+    style_el = p.find(f"{_w('pPr')}/{_w('pStyle')}")
+    if style_el is None:
+        return default
+    return styles.get(style_el.get(W_VAL, ""), default)
+
+
+def _is_body_level(element) -> bool:
+    # Direct children of w:body, or of a body-level content control
+    parent = element.getparent()
+    while parent is not None and parent.tag == W_SDT_CONTENT:
+        sdt = parent.getparent()
+        parent = sdt.getparent() if sdt is not None else None
+    return parent is not None and parent.tag == W_BODY
+
+
+def iter_docx_elements(source) -> Iterator[tuple]:
+    """
+    Streams the body-level blocks of a .docx.
+
+    Args:
+        source (str | bytes | BinaryIO): Path, raw bytes or binary file object.
+
+    Yields:
+        (element, styles, default_style) for each body paragraph (w:p) and
+        each row (w:tr) of a body table, in document order. Elements are only
+        valid until the next item is requested; they are cleared afterwards,
+        so a table is never held in memory beyond its current row.
+    """
+    with _open_zip(source) as archive:
+        styles, default = read_docx_styles(archive)
+        with archive.open("word/document.xml") as xml:
+            for _, element in etree.iterparse(
+                xml, events=("end",), tag=(W_P, W_TR, W_TBL, W_SDT)
+            ):
+                parent = element.getparent()
+                at_body = parent is not None and parent.tag == W_BODY
+                if element.tag == W_P and _is_body_level(element):
+                    yield element, styles, default
+                elif element.tag == W_TR and parent is not None and _is_body_level(parent):
+                    yield element, styles, default
+                    _release(element)
+                    continue
+                if at_body:
+                    _release(element)
+
+
+def _release(element) -> None:
+    # Drop the element's content and every already-read sibling before it
+    element.clear()
+    parent = element.getparent()
+    if parent is not None:
+        while element.getprevious() is not None:
+            del parent[0]
+
+
+def iter_docx_blocks(source) -> Iterator[Union[DocParagraph, DocTableRow]]:
+    """
+    Streams the body of a .docx as paragraphs and table rows, in document order.
+
+    Args:
+        source (str | bytes | BinaryIO): Path, raw bytes or binary file object.
+
+    Yields:
+        DocParagraph | DocTableRow: Cell texts follow python-docx's _Cell.text
+        (the cell's paragraphs joined by newlines); nested tables are not read.
+    """
+    table = None
+    table_index = -1
+    row_index = 0
+    for element, styles, default in iter_docx_elements(source):
+        if element.tag == W_P:
+            yield DocParagraph(paragraph_text(element), paragraph_style(element, styles, default))
+            continue
+        if element.getparent() is not table:
+            table = element.getparent()
+            table_index += 1
+            row_index = 0
+        cells = tuple(
+            "\n".join(paragraph_text(p) for p in cell.iterchildren(W_P))
+            for cell in element.iterchildren(W_TC)
+        )
+        yield DocTableRow(table_index, row_index, cells)
+        row_index += 1
+
+
+def iter_docx_paragraphs(source) -> Iterator[DocParagraph]:
+    """
+    Streams the body paragraphs of a .docx as DocParagraph(text, style).
+
+    Args:
+        source (str | bytes | BinaryIO): Path, raw bytes or binary file object.
+
+    Yields:
+        DocParagraph: Paragraph text and style name, in document order
+        (tables are skipped, as in python-docx's Document.paragraphs).
+    """
+    for block in iter_docx_blocks(source):
+        if isinstance(block, DocParagraph):
+            yield block
+
+
+def _column_role(header: str) -> Optional[str]:
+    words = set(_HEADER_WORD.findall(header.lower()))
+    if words & _ID_HEADERS:
+        return "id"
+    if words & _TEXT_HEADERS:
+        return "text"
+    return None
+
+
+def _id_prefix(value: str) -> str:
+    # Keep IDs the registry already recognizes; label the rest so the
+    # "ID: xxx" pattern picks them up
+    if get_requirement_id_registry().search_line(value):
+        return value
+    return f"ID: {value}"
+
+
+def table_row_line(cells: tuple[str, ...], header: Optional[tuple[str, ...]] = None) -> str:
+    """
+    Renders a table row as one requirement-ready line.
+
+    With a header naming an ID column and a text column (e.g. ID | Text |
+    Priority), the row becomes "<ID> <text> (Priority: High)", the layout of a
+    requirement paragraph (so app.export.extract_requirement_lines() keeps it),
+    with IDs the requirement ID patterns do not know prefixed by "ID: ".
+    Otherwise the non-empty cells are joined with " | ".
+
+    Example:
+        ("REQ-7", "The system shall log out.", "High") with header
+        ("ID", "Text", "Priority") → 'REQ-7 The system shall log out. (Priority: High)'
+    """
+    cells = tuple(" ".join(cell.split()) for cell in cells)
+    roles = [_column_role(h) for h in header] if header else []
+    if "id" in roles and "text" in roles:
+        id_value = cells[roles.index("id")] if roles.index("id") < len(cells) else ""
+        text = cells[roles.index("text")] if roles.index("text") < len(cells) else ""
+        details = "; ".join(
+            f"{name.strip()}: {value}"
+            for name, role, value in zip(header or (), roles, cells)
+            if role is None and value
+        )
+        line = f"{_id_prefix(id_value)} {text}" if id_value else text
+        return f"{line} ({details})" if details else line
+    return " | ".join(cell for cell in cells if cell)
+
+
+def iter_docx_lines(source) -> Iterator[DocParagraph]:
+    """
+    Streams a .docx as text lines: paragraphs as they are, and each table row
+    rendered by table_row_line() with style TABLE_ROW_STYLE.
+
+    A table's first row is taken as its header (and not emitted) when it names
+    both an ID and a text column; every row is rendered as it streams by, so
+    requirement tables reach extract_requirement_statements() without a
+    separate conversion pass.
+    """
+    header: Optional[tuple[str, ...]] = None
+    for block in iter_docx_blocks(source):
+        if isinstance(block, DocParagraph):
+            yield block
+            continue
+        if block.row == 0:
+            roles = {_column_role(cell) for cell in block.cells}
+            header = block.cells if {"id", "text"} <= roles else None
+            if header is not None:
+                continue
+        line = table_row_line(block.cells, header)
+        if line:
+            yield DocParagraph(line, TABLE_ROW_STYLE)
@@ -1,6 +1,8 @@
-import re
+from typing import Optional
+
+from app.parser import extract_requirement_statements
 from app.requirement_grouper import group_requirements, detect_gaps
-from app.llm import llm_group_requirement
+from app.llm import llm_group_requirements_batch
 from app.traceability import build_traceability_index
 
 
@@ -42,26 +44,37 @@ def format_analysis_as_markdown(analysis_results: dict) -> str:
 
 def extract_requirement_lines(sections: list[dict]) -> list[dict]:
     """
-    Extracts individual REQ-xxx lines from section bodies.
-    Returns a list of dicts like {"id": "REQ-1", "text": "..."}
+    Extracts requirement lines that start with their ID (e.g. "REQ-1 The system ...").
+    Returns a list of dicts like {"id": "REQ-1", "text": "The system ..."}
+
+    Reuses each section's parsed "requirements"; sections without them (e.g.
+    hand-built dicts) are scanned from their body.
     """
     reqs = []
     for section in sections:
-        lines = section.get("body", "").splitlines()
-        for line in lines:
-            if match := re.match(r"(REQ-\d+)\s+(.*)", line.strip()):
-                reqs.append({"id": match.group(1), "text": match.group(2)})
+        requirements = section.get("requirements")
+        if requirements is None:
+            requirements = extract_requirement_statements(section.get("body", ""))
+        for requirement in requirements:
+            req_id, line = requirement["id"], requirement["text"]
+            rest = line[len(req_id) :]
+            # Lines that only mention an ID elsewhere are cross-references
+            if line.startswith(req_id) and rest[:1].isspace():
+                reqs.append({"id": req_id, "text": rest.strip()})
     return reqs
 
 
-def generate_requirement_summary_from_sections(parsed_sections: list[dict]) -> str:
+def generate_requirement_summary_from_sections(
+    parsed_sections: list[dict], taxonomy_path: Optional[str] = None
+) -> str:
     """
     UI-facing summary generator.
-    Accepts parsed sections and processes internally.
+    Accepts parsed sections and processes internally, grouping against the
+    taxonomy file at `taxonomy_path` (default taxonomy if None).
     """
     reqs = extract_requirement_lines(parsed_sections)
-    grouped = group_requirements(reqs)
-    gaps = detect_gaps(grouped)
+    grouped = group_requirements(reqs, taxonomy_path=taxonomy_path)
+    gaps = detect_gaps(grouped, taxonomy_path=taxonomy_path)
     return generate_requirement_summary(grouped, gaps)
 
 
@@ -102,13 +115,12 @@ def group_requirements_with_llm(parsed_sections: list[dict]) -> list[dict]:
         list[dict]: List of REQs with LLM-assigned groups (id, text, llm_group).
     """
     reqs = extract_requirement_lines(parsed_sections)
-    enriched = []
-
-    for req in reqs:
-        groups = llm_group_requirement(req["text"])
-        enriched.append({"id": req["id"], "text": req["text"], "llm_group": groups})
+    groups = llm_group_requirements_batch([req["text"] for req in reqs])
 
-    return enriched
+    return [
+        {"id": req["id"], "text": req["text"], "llm_group": req_groups}
+        for req, req_groups in zip(reqs, groups)
+    ]
 
 
 def format_traceability_as_markdown(sections: list[dict]) -> str:
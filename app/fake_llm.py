@@ -0,0 +1,370 @@
+"""
+Offline stand-in for the OpenAI chat completions API, for load testing.
+
+FakeLLM answers `chat.completions.create` requests with deterministic canned
+outputs for every SpecSense prompt type (analysis, tests, combined, packed,
+grouping, TOC comparison, summary), after a configurable simulated latency and
+with optional 429 / 5xx error injection. It can be used two ways:
+
+- in-process: install_fake_llm() routes the shared clients from app.llm_client
+  through an httpx transport backed by FakeLLM (no sockets involved);
+- out-of-process: `python -m app.fake_llm --port 8089` serves the same API over
+  HTTP, for use with OPENAI_BASE_URL=http://127.0.0.1:8089/v1.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+VAGUE_TERMS = re.compile(
+    r"\b(fast|quick(ly)?|user-friendly|easy|efficient|appropriate|should|etc)\b",
+    re.IGNORECASE,
+)
+
+CLEAN_ANALYSIS = "✅ This requirement is well-defined and testable."
+
+
+def classify_prompt(messages: list[dict]) -> str:
+    """
+    Identifies which SpecSense prompt a request was built from.
+
+    Returns:
+        str: One of "packed", "combined", "analysis", "tests", "grouping_batch",
+        "grouping", "toc", "summary" or "unknown".
+    """
+    system = " ".join(m["content"] for m in messages if m.get("role") == "system")
+    user = " ".join(m["content"] for m in messages if m.get("role") == "user")
+
+    if "several numbered requirement sections" in system:
+        return "packed"
+    if "exactly two string fields" in system:
+        return "combined"
+    if "Analyze the following requirement" in system:
+        return "analysis"
+    if user.startswith("Based on the following software requirement"):
+        return "tests"
+    if "Classify each numbered requirement" in system:
+        return "grouping_batch"
+    if "Classify the following requirement" in system:
+        return "grouping"
+    if "Table of Contents (TOC)" in user:
+        return "toc"
+    if "Software Requirements Specification (SRS)" in system:
+        return "summary"
+    return "unknown"
+
+
+def _analysis_for(text: str) -> str:
+    vague = sorted({m.group(0).lower() for m in VAGUE_TERMS.finditer(text)})
+    if not vague:
+        return CLEAN_ANALYSIS
+    return (
+        "**Vagueness:**\n"
+        f"- The terms {', '.join(repr(v) for v in vague)} are not measurable."
+    )
+
+
+def _tests_for(text: str) -> str:
+    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()[:6]
+    return (
+        f"- Verify the nominal behavior described (case {digest}-1)\n"
+        f"- Verify behavior with invalid input (case {digest}-2)"
+    )
+
+
+def _categories_for(text: str, categories: list[str]) -> list[str]:
+    from app.requirement_grouper import get_requirement_categories
+
+    lowered = text.lower()
+    taxonomy = get_requirement_categories()
+    matched = [
+        cat
+        for cat in categories
+        if any(keyword in lowered for keyword in taxonomy.get(cat, []))
+    ]
+    return matched or categories[:1]
+
+
+def canned_response(messages: list[dict]) -> str:
+    """
+    Returns the deterministic response text for a chat request.
+    """
+    kind = classify_prompt(messages)
+    system = " ".join(m["content"] for m in messages if m.get("role") == "system")
+    user = " ".join(m["content"] for m in messages if m.get("role") == "user")
+
+    if kind == "analysis":
+        return _analysis_for(user)
+    if kind == "tests":
+        return _tests_for(user)
+    if kind == "combined":
+        return json.dumps({"analysis": _analysis_for(user), "tests": _tests_for(user)})
+    if kind == "packed":
+        sections = re.split(r"^### Section (\d+)\n", user, flags=re.MULTILINE)[1:]
+        return json.dumps(
+            {
+                number: {"analysis": _analysis_for(body), "tests": _tests_for(body)}
+                for number, body in zip(sections[::2], sections[1::2])
+            }
+        )
+    if kind in ("grouping", "grouping_batch"):
+        category_line = next(
+            (line for line in system.splitlines() if line.startswith('"')), ""
+        )
+        categories = re.findall(r'"([^"]+)"', category_line)
+        if kind == "grouping":
+            return json.dumps(_categories_for(user, categories))
+        items = re.findall(r"^(\d+)\. (.*)$", user, flags=re.MULTILINE)
+        return json.dumps(
+            {number: _categories_for(text, categories) for number, text in items}
+        )
+    if kind == "toc":
+        standard = user.split("Standard TOC:\n", 1)[-1].split("\n\n", 1)[0]
+        return (
+            "Matched Sections:\n"
+            f"{standard}\n\n"
+            "Fuzzy Matched Sections:\n- None\n\n"
+            "Missing Sections:\n- None"
+        )
+    if kind == "summary":
+        return (
+            "Most requirements are clear and testable. A few rely on unmeasurable "
+            "qualifiers and would benefit from explicit acceptance criteria."
+        )
+    return "OK"
+
+
+class FakeLLM:
+    """
+    Deterministic fake chat completions backend with latency and fault injection.
+
+    Args:
+        latency (str): "fixed", "uniform" or "lognormal" latency distribution.
+        latency_ms (float): Mean (fixed/lognormal) or upper bound (uniform) latency.
+        latency_sigma (float): Shape parameter for the lognormal distribution.
+        error_rate (float): Probability of answering with a 500 error.
+        rate_limit_rate (float): Probability of answering with a 429 error.
+        retry_after (float): Retry-After seconds sent with injected 429s.
+        seed (int | None): Seed for latency and fault sampling.
+    """
+
+    def __init__(
+        self,
+        latency: str = "fixed",
+        latency_ms: float = 0.0,
+        latency_sigma: float = 0.5,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        retry_after: float = 1.0,
+        seed: Optional[int] = None,
+    ):
+        if latency not in ("fixed", "uniform", "lognormal"):
+            raise ValueError(f"Unknown latency distribution: {latency}")
+        self.latency = latency
+        self.latency_ms = latency_ms
+        self.latency_sigma = latency_sigma
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "errors": 0, "rate_limited": 0}
+
+    def sample_latency(self) -> float:
+        """
+        Draws one simulated latency, in seconds.
+        """
+        with self._lock:
+            if self.latency == "uniform":
+                ms = self._random.uniform(0, self.latency_ms)
+            elif self.latency == "lognormal" and self.latency_ms > 0:
+                # Parameterized so the distribution's mean is latency_ms
+                mu = _lognormal_mu(self.latency_ms, self.latency_sigma)
+                ms = self._random.lognormvariate(mu, self.latency_sigma)
+            else:
+                ms = self.latency_ms
+        return ms / 1000.0
+
+    def respond(self, body: dict) -> tuple[int, dict, dict]:
+        """
+        Produces the HTTP status, headers and JSON payload for one request body
+        (without waiting for the simulated latency).
+        """
+        with self._lock:
+            self.stats["requests"] += 1
+            roll = self._random.random()
+            if roll < self.rate_limit_rate:
+                self.stats["rate_limited"] += 1
+                return (
+                    429,
+                    {"retry-after": str(self.retry_after)},
+                    _error_payload("Rate limit reached (injected)", "rate_limit_error"),
+                )
+            if roll < self.rate_limit_rate + self.error_rate:
+                self.stats["errors"] += 1
+                return (
+                    500,
+                    {},
+                    _error_payload("Server error (injected)", "server_error"),
+                )
+
+        messages = body.get("messages", [])
+        content = canned_response(messages)
+        prompt_tokens = sum(len(str(m.get("content", ""))) for m in messages) // 4
+        completion_tokens = len(content) // 4
+        return (
+            200,
+            {},
+            {
+                "id": "chatcmpl-fake-"
+                + hashlib.sha256(content.encode("utf-8")).hexdigest()[:12],
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": body.get("model", "fake"),
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": content},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": prompt_tokens + completion_tokens,
+                },
+            },
+        )
+
+    def sync_transport(self):
+        """
+        Returns an httpx transport serving this fake to synchronous clients.
+        """
+        import httpx
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            time.sleep(self.sample_latency())
+            status, headers, payload = self.respond(json.loads(request.content))
+            return httpx.Response(status, headers=headers, json=payload)
+
+        return httpx.MockTransport(handler)
+
+    def async_transport(self):
+        """
+        Returns an httpx transport serving this fake to asyncio clients.
+        """
+        import httpx
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            await asyncio.sleep(self.sample_latency())
+            status, headers, payload = self.respond(json.loads(await request.aread()))
+            return httpx.Response(status, headers=headers, json=payload)
+
+        return httpx.MockTransport(handler)
+
+
+def _lognormal_mu(mean: float, sigma: float) -> float:
+    return math.log(mean) - sigma**2 / 2
+
+
+def _error_payload(message: str, error_type: str) -> dict:
+    return {"error": {"message": message, "type": error_type, "code": error_type}}
+
+
+def install_fake_llm(fake: Optional[FakeLLM] = None) -> FakeLLM:
+    """
+    Routes every shared OpenAI client through an in-process FakeLLM.
+
+    Returns:
+        FakeLLM: The installed fake (a default one if none was given). Call
+        app.llm_client.reset_clients() to go back to the real API.
+    """
+    import os
+    from app.llm_client import configure_clients
+
+    fake = fake or FakeLLM()
+    os.environ.setdefault("OPENAI_API_KEY", "fake-key")
+    configure_clients(
+        base_url="http://fake-llm.local/v1",
+        transport_factory=lambda is_async: (
+            fake.async_transport() if is_async else fake.sync_transport()
+        ),
+    )
+    return fake
+
+
+def make_server(
+    fake: FakeLLM, host: str = "127.0.0.1", port: int = 8089
+) -> ThreadingHTTPServer:
+    """
+    Builds (but does not start) an HTTP server exposing POST /v1/chat/completions.
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            if not self.path.rstrip("/").endswith("/chat/completions"):
+                self.send_error(404)
+                return
+            length = int(self.headers.get("Content-Length", 0))
+            body = json.loads(self.rfile.read(length) or b"{}")
+            time.sleep(fake.sample_latency())
+            status, headers, payload = fake.respond(body)
+            data = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass  # keep load-test output quiet
+
+    return ThreadingHTTPServer((host, port), Handler)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Serve a fake OpenAI chat API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument(
+        "--latency", choices=["fixed", "uniform", "lognormal"], default="fixed"
+    )
+    parser.add_argument("--latency-ms", type=float, default=200.0)
+    parser.add_argument("--latency-sigma", type=float, default=0.5)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    fake = FakeLLM(
+        latency=args.latency,
+        latency_ms=args.latency_ms,
+        latency_sigma=args.latency_sigma,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after,
+        seed=args.seed,
+    )
+    server = make_server(fake, args.host, args.port)
+    print(f"Fake LLM listening on http://{args.host}:{args.port}/v1")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,17 @@
 import re
 
+_NUMBERED_HEADER = re.compile(r"(\d+(?:\.\d+)*)[.)]?\s+(.*)")
+_ALL_CAPS_LINE = re.compile(r"[A-Z\s]+")
+_TRAILING_NUMBER = re.compile(r"\d+$")
+_DOT_LEADER = re.compile(r"\.{4,}")
+
+# Kinds returned by classify_line(); None means the line is body text
+TOC_LINE = "toc"
+MARKDOWN_HEADER = "markdown"
+NUMBERED_HEADER = "numbered"
+ALL_CAPS_HEADER = "all_caps"
+FALLBACK_HEADER = "fallback"
+
 
 def is_markdown_header(line) -> bool:
     """Returns True if the line is a Markdown-style header (e.g., '# Section')."""
@@ -8,12 +20,12 @@ def is_markdown_header(line) -> bool:
 
 def is_numbered_header(line) -> bool:
     """Returns True if the line starts with a numbered pattern (e.g., '1.', '2.1.3')."""
-    return bool(re.match(r"^\d+(\.\d+)*[.)]?\s+", line))
+    return _NUMBERED_HEADER.match(line) is not None
 
 
 def is_all_caps_header(line) -> bool:
     """Returns True if the line is in ALL CAPS and reasonably short (likely a section)."""
-    return re.match(r"^[A-Z\s]+$", line) is not None and len(line.split()) <= 5
+    return _ALL_CAPS_LINE.fullmatch(line) is not None and len(line.split()) <= 5
 
 
 def extract_id_and_title(line: str) -> tuple[str | None, str]:
@@ -21,7 +33,7 @@ def extract_id_and_title(line: str) -> tuple[str | None, str]:
     Extracts a section ID (like '5.1.9') and title from a header line.
     If no ID is found, returns (None, line).
     """
-    match = re.match(r"^(\d+(?:\.\d+)*)(?:[.)]?)\s+(.*)", line)
+    match = _NUMBERED_HEADER.match(line)
     if match:
         return match.group(1), match.group(2).strip()
     return None, line.strip()
@@ -53,18 +65,25 @@ def is_toc_line(line: str) -> bool:
     Matches patterns like '1. Introduction .......... 2'
     """
     line = line.strip()
-    if "..." in line or re.search(r"\.{4,}", line):  # 4+ dots
-        if re.search(r"\d+$", line):  # ends in a number
+    if "..." in line or _DOT_LEADER.search(line):  # 4+ dots
+        if _TRAILING_NUMBER.search(line):  # ends in a number
             return True
     return False
 
 
+def is_toc_style(style_name: str) -> bool:
+    """
+    Returns True if a .docx paragraph style name is associated with a Table of Contents.
+    """
+    style_name = (style_name or "").lower()
+    return style_name.startswith("toc") or "toc" in style_name
+
+
 def is_docx_toc_paragraph(para) -> bool:
     """
     Returns True if the .docx paragraph uses a style associated with a Table of Contents.
     """
-    style_name = para.style.name.lower() if para.style else ""
-    return style_name.startswith("toc") or "toc" in style_name
+    return is_toc_style(para.style.name if para.style else "")
 
 
 def clean_toc_line(line: str) -> str:
@@ -88,3 +107,55 @@ def is_isolated_all_caps_header(line: str, prev_line: str, next_line: str) -> bo
     return is_all_caps_header(line) and (
         prev_line.strip() == "" or next_line.strip() == ""
     )
+
+
+def classify_line(
+    line: str, prev_line: str = "", next_line: str = "", allow_toc: bool = True
+) -> tuple[str | None, str | None, str | None]:
+    """
+    Applies every header rule to one line in a single pass.
+
+    Equivalent to checking, in order, is_toc_line (only when `allow_toc`),
+    is_markdown_header, is_numbered_header / is_isolated_all_caps_header and
+    is_fallback_header, but dispatches on the first character and uses
+    precompiled patterns, so each line is matched at most once per rule.
+
+    Args:
+        line (str): The line to classify, already stripped.
+        prev_line (str): The previous raw line; only inspected for ALL-CAPS candidates.
+        next_line (str): The next raw line; only inspected for ALL-CAPS candidates.
+        allow_toc (bool): Whether TOC-style lines should be recognized.
+
+    Returns:
+        tuple: (kind, section_id, section_title). `kind` is one of TOC_LINE,
+        MARKDOWN_HEADER, NUMBERED_HEADER, ALL_CAPS_HEADER, FALLBACK_HEADER, or
+        None for body text; id and title are None unless the line is a header.
+    """
+    if not line:
+        return None, None, None
+
+    if allow_toc and "..." in line and _TRAILING_NUMBER.search(line):
+        return TOC_LINE, None, None
+
+    first = line[0]
+    if first == "#" and line.startswith("# "):
+        section_id, section_title = extract_id_and_title(line[2:].strip())
+        return MARKDOWN_HEADER, section_id, section_title
+
+    if first.isdecimal():
+        match = _NUMBERED_HEADER.match(line)
+        if match:
+            return NUMBERED_HEADER, match.group(1), match.group(2).strip()
+    elif (
+        "A" <= first <= "Z"
+        and _ALL_CAPS_LINE.fullmatch(line)
+        and len(line.split()) <= 5
+        and (not prev_line.strip() or not next_line.strip())
+    ):
+        return ALL_CAPS_HEADER, None, line
+
+    words = line.split()
+    if len(words) <= 4 and line.istitle():
+        return FALLBACK_HEADER, None, line
+
+    return None, None, None
@@ -0,0 +1,214 @@
+"""
+Incremental re-parse and re-analysis for revised documents.
+
+Reviewers upload revision after revision of the same SRS with small edits.
+IncrementalAnalyzer remembers the previous revision's sections and the LLM
+results for each section body (by content hash), so a new revision only pays
+for sections whose body actually changed; everything else is reused and the
+reuse is reported.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from app.llm import analyze_sections
+from app.llm_cache import normalize_text
+from app.parser import _build_section, _iter_lines, _scan_sections
+
+# Documents whose revision history is kept in memory at once (least recently used dropped)
+MAX_TRACKED_DOCUMENTS = 32
+
+_PARSED_KEYS = ("id", "title", "body", "requirements")
+
+
+def body_hash(body: str) -> str:
+    """
+    Content hash of a section body; whitespace-only edits keep the same hash.
+    """
+    return hashlib.sha256(normalize_text(body).encode("utf-8")).hexdigest()
+
+
+def _empty_report() -> dict:
+    return {
+        "sections": 0,
+        "unchanged": [],
+        "changed": [],
+        "added": [],
+        "removed": [],
+        "reused_sections": 0,
+        "reused_analyses": 0,
+        "new_analyses": 0,
+    }
+
+
+def _is_error(result: dict) -> bool:
+    return any(
+        str(result.get(field, "")).startswith("OpenAI error:")
+        for field in ("analysis", "tests")
+    )
+
+
+class IncrementalAnalyzer:
+    """
+    Tracks one document across revisions.
+
+    parse() re-parses a new revision, reusing the previous revision's section
+    dicts for sections whose id, title and body are unchanged. analyze() runs
+    the LLM engine only for bodies whose hash has no stored result. Both update
+    `report`:
+
+        sections         number of sections in the new revision
+        unchanged        titles whose body hash existed in the previous revision
+        changed          titles matching a previous (id, title) with a new body
+        added            titles of sections with no previous counterpart
+        removed          titles of previous sections that no longer appear
+        reused_sections  sections taken over from the previous parse
+        reused_analyses  sections answered from stored LLM results
+        new_analyses     sections sent to the LLM engine
+    """
+
+    def __init__(self) -> None:
+        self.sections: list[dict] = []
+        self.report: dict = _empty_report()
+        self._hashes: list[str] = []
+        self._results: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def parse(self, text: str) -> list[dict]:
+        """
+        Parses a new revision, reusing unchanged sections from the previous one.
+
+        Returns:
+            list[dict]: Sections identical to parse_sections_with_bodies(text);
+            callers may add keys to them without affecting later revisions.
+        """
+        return self._parse(text)[0]
+
+    def _parse(self, text: str) -> tuple[list[dict], dict]:
+        with self._lock:
+            previous = {(s["id"], s["title"], s["body"]): s for s in self.sections}
+            previous_hashes = set(self._hashes)
+            previous_headers = {(s["id"], s["title"]) for s in self.sections}
+
+            report = _empty_report()
+            sections, hashes, seen_headers = [], [], set()
+            pairs = ((line, None) for line in _iter_lines(text))
+            for header, body_lines, _ in _scan_sections(pairs):
+                body = "\n".join(body_lines).strip()
+                old = previous.get((header["id"], header["title"], body))
+                if old is not None:
+                    section = dict(old)
+                    report["reused_sections"] += 1
+                else:
+                    section = _build_section(header, body_lines)
+                digest = body_hash(section["body"])
+                key = (section["id"], section["title"])
+                if digest in previous_hashes:
+                    report["unchanged"].append(section["title"])
+                elif key in previous_headers:
+                    report["changed"].append(section["title"])
+                else:
+                    report["added"].append(section["title"])
+                seen_headers.add(key)
+                sections.append(section)
+                hashes.append(digest)
+
+            report["removed"] = [
+                s["title"]
+                for s in self.sections
+                if (s["id"], s["title"]) not in seen_headers
+            ]
+            report["sections"] = len(sections)
+
+            # Keep private copies so callers annotating sections do not leak into the next diff
+            self.sections = [{k: s[k] for k in _PARSED_KEYS} for s in sections]
+            self._hashes = hashes
+            self.report = report
+            return sections, dict(report)
+
+    def analyze(self, sections: Optional[list[dict]] = None, **kwargs) -> list[dict]:
+        """
+        Returns {"analysis", "tests"} for each section, calling
+        app.llm.analyze_sections() only for bodies without a stored result.
+
+        The analyzer's lock is only held to look up and store results, not
+        during the LLM calls, so other revisions are parsed meanwhile.
+
+        Args:
+            sections (list[dict] | None): Sections from the last parse() (default).
+            **kwargs: Passed through to analyze_sections().
+
+        Returns:
+            list[dict]: Results aligned with `sections`.
+        """
+        return self._analyze(sections, **kwargs)[0]
+
+    def _analyze(self, sections: Optional[list[dict]], **kwargs) -> tuple[list[dict], int]:
+        with self._lock:
+            sections = self.sections if sections is None else sections
+            hashes = [body_hash(s.get("body", "")) for s in sections]
+            known = {h: self._results[h] for h in hashes if h in self._results}
+
+        pending: dict[str, str] = {}
+        for section, digest in zip(sections, hashes):
+            if digest not in known and digest not in pending:
+                pending[digest] = section.get("body", "").strip()
+
+        fresh = {}
+        if pending:
+            fresh = dict(zip(pending, analyze_sections(list(pending.values()), **kwargs)))
+
+        new = sum(1 for digest in hashes if digest in pending)
+        with self._lock:
+            # Keep results for bodies of this or the latest revision; failed
+            # calls are not kept, so the next revision retries them
+            current = set(hashes) | set(self._hashes)
+            self._results = {h: r for h, r in self._results.items() if h in current}
+            self._results.update((h, r) for h, r in fresh.items() if not _is_error(r))
+            self.report["new_analyses"] = new
+            self.report["reused_analyses"] = len(hashes) - new
+
+        results = [
+            dict(fresh[digest] if digest in fresh else known[digest]) for digest in hashes
+        ]
+        return results, new
+
+    def update(self, text: str, **kwargs) -> tuple[list[dict], list[dict], dict]:
+        """
+        parse() followed by analyze(); returns (sections, results, report),
+        the report covering this revision even when others run concurrently.
+        """
+        sections, report = self._parse(text)
+        results, new = self._analyze(sections, **kwargs)
+        report["new_analyses"] = new
+        report["reused_analyses"] = len(sections) - new
+        return sections, results, report
+
+
+_analyzers: "OrderedDict[tuple[str, str], IncrementalAnalyzer]" = OrderedDict()
+_analyzers_lock = threading.Lock()
+
+
+def get_incremental_analyzer(document_key: str, owner: str = "") -> IncrementalAnalyzer:
+    """
+    Returns the analyzer tracking `document_key` (e.g. the uploaded filename)
+    for `owner` (e.g. a web session id), creating it on first use. Owners never
+    share revision history or stored LLM results, even for equal filenames.
+    """
+    key = (owner, document_key)
+    with _analyzers_lock:
+        analyzer = _analyzers.pop(key, None) or IncrementalAnalyzer()
+        _analyzers[key] = analyzer
+        while len(_analyzers) > MAX_TRACKED_DOCUMENTS:
+            _analyzers.popitem(last=False)
+        return analyzer
+
+
+def reset_incremental_analyzers() -> None:
+    """
+    Forgets every tracked document.
+    """
+    with _analyzers_lock:
+        _analyzers.clear()
@@ -0,0 +1,208 @@
+"""
+Single-load ingestion of uploaded SRS documents.
+
+An upload is read and parsed once into an IngestedDocument that carries
+everything downstream steps need: the body text for the parser and analysis,
+the cleaned TOC lines for the structure check, and (for .docx) the paragraph
+texts with their style names, read with the streaming reader in
+app.docx_stream. Documents are cached by a hash of the upload's
+bytes, so re-running a check on the same upload (e.g. on a Streamlit rerun)
+neither re-opens the .docx nor re-decodes the text.
+
+An IngestedDocument keeps the whole body text, which the structure check and
+analysis need. Callers that only want sections of a file on disk (the batch
+CLI) use parse_path(), which streams .txt files straight into the parser.
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+
+from app.docx_stream import TABLE_ROW_STYLE, DocParagraph, iter_docx_lines
+from app.header_rules import clean_toc_line, is_toc_style
+from app.parser import iter_sections, parse_document
+from app.text_stream import ByteSource, byte_view, decode_text, iter_text_chunks, iter_text_lines
+from app.toc_extractor import extract_toc_lines_from_paragraphs, extract_toc_lines_from_text
+
+# Ingested uploads kept in memory, least recently used dropped first
+MAX_CACHED_DOCUMENTS = 16
+
+
+class IngestedDocument(NamedTuple):
+    """
+    An upload parsed once.
+
+    Attributes:
+        filename (str): Lowercased upload name ("" if unknown).
+        is_docx (bool): True for .docx uploads.
+        digest (str): SHA-256 of the upload's bytes (the cache key).
+        text (str): Body text; for .docx, paragraphs outside the TOC and
+            table rows (as requirement-ready lines) joined by newlines.
+        toc_lines (tuple[str, ...]): TOC entries, cleaned with clean_toc_line().
+        paragraphs (tuple[DocParagraph, ...]): .docx paragraphs with their
+            styles, and table rows with style TABLE_ROW_STYLE, in document
+            order (empty for .txt).
+    """
+
+    filename: str
+    is_docx: bool
+    digest: str
+    text: str
+    toc_lines: tuple[str, ...]
+    paragraphs: tuple[DocParagraph, ...]
+
+
+_documents: "OrderedDict[tuple[str, bool], IngestedDocument]" = OrderedDict()
+_documents_lock = threading.Lock()
+
+
+def _upload_name(uploaded_file) -> str:
+    name = getattr(uploaded_file, "filename", None) or getattr(uploaded_file, "name", None)
+    return name.lower() if isinstance(name, str) else ""
+
+
+def _read_bytes(uploaded_file) -> bytes:
+    # Read from the start and rewind, so the stream stays usable for the caller
+    if hasattr(uploaded_file, "seek"):
+        uploaded_file.seek(0)
+    data = uploaded_file.read()
+    if hasattr(uploaded_file, "seek"):
+        uploaded_file.seek(0)
+    return data
+
+
+def _ingest_docx(data: bytes) -> tuple[str, tuple[str, ...], tuple[DocParagraph, ...]]:
+    paragraphs = tuple(iter_docx_lines(data))
+    text = "\n".join(p.text for p in paragraphs if not is_toc_style(p.style))
+    toc_lines = tuple(
+        clean_toc_line(line)
+        for line in extract_toc_lines_from_paragraphs(
+            p for p in paragraphs if p.style != TABLE_ROW_STYLE
+        )
+    )
+    return text, toc_lines, paragraphs
+
+
+def _cached(digest: str, is_docx: bool) -> Optional[IngestedDocument]:
+    with _documents_lock:
+        document = _documents.get((digest, is_docx))
+        if document is not None:
+            _documents.move_to_end((digest, is_docx))
+        return document
+
+
+def ingest_bytes(data: ByteSource, filename: str = "", is_docx: bool = False) -> IngestedDocument:
+    """
+    Parses raw upload bytes, or returns the cached document for identical bytes.
+
+    Args:
+        data (bytes | memoryview | mmap): The uploaded file's content.
+        filename (str): Upload name, kept for display and keying analyses.
+        is_docx (bool): Parse as .docx (otherwise as text, decoded
+            incrementally with its encoding detected; see app.text_stream).
+
+    Returns:
+        IngestedDocument
+    """
+    digest = hashlib.sha256(data).hexdigest()
+    key = (digest, is_docx)
+    cached = _cached(digest, is_docx)
+    if cached is not None:
+        return cached._replace(filename=filename)
+
+    if is_docx:
+        text, toc_lines, paragraphs = _ingest_docx(bytes(data))
+    else:
+        text = decode_text(data)
+        toc_lines, paragraphs = tuple(extract_toc_lines_from_text(text)), ()
+    document = IngestedDocument(filename, is_docx, digest, text, toc_lines, paragraphs)
+
+    with _documents_lock:
+        _documents[key] = document
+        while len(_documents) > MAX_CACHED_DOCUMENTS:
+            _documents.popitem(last=False)
+    return document
+
+
+def ingest_upload(uploaded_file, is_docx: Optional[bool] = None) -> Optional[IngestedDocument]:
+    """
+    Reads an uploaded Streamlit/Flask file (.txt or .docx) once.
+
+    Args:
+        uploaded_file: File-like object with a `name` or `filename`, or None.
+        is_docx (bool | None): Overrides detection from the file name (for
+            streams without a name).
+
+    Returns:
+        IngestedDocument, or None if there is no file or its type is unsupported.
+    """
+    if uploaded_file is None:
+        return None
+    if isinstance(uploaded_file, IngestedDocument):
+        return uploaded_file
+
+    filename = _upload_name(uploaded_file)
+    if is_docx is None:
+        if filename.endswith(".docx"):
+            is_docx = True
+        elif filename.endswith(".txt"):
+            is_docx = False
+        else:
+            return None
+    if is_docx:
+        return ingest_bytes(_read_bytes(uploaded_file), filename, is_docx)
+    # Text is hashed and decoded straight from the upload's buffer (or a
+    # memory-mapped spool file), without an intermediate bytes copy
+    with byte_view(uploaded_file) as data:
+        return ingest_bytes(data, filename, is_docx)
+
+
+def ingest_path(path: str) -> Optional[IngestedDocument]:
+    """
+    Reads a .txt or .docx file from disk once (text files are memory-mapped,
+    but decoded into the document's full body text; see parse_path()).
+
+    Returns:
+        IngestedDocument, or None if the file type is unsupported.
+    """
+    filename = os.path.basename(path).lower()
+    if filename.endswith(".docx"):
+        with open(path, "rb") as f:
+            return ingest_bytes(f.read(), filename, is_docx=True)
+    if filename.endswith(".txt"):
+        with byte_view(path) as data:
+            return ingest_bytes(data, filename, is_docx=False)
+    return None
+
+
+def parse_path(path: str) -> Optional[list[dict]]:
+    """
+    Parses a .txt or .docx file from disk into sections.
+
+    A .txt file is memory-mapped, hashed from the mapped bytes and, unless an
+    IngestedDocument with the same content is cached, decoded chunk by chunk
+    straight into iter_sections(), so neither its bytes nor its whole text is
+    ever copied into memory. A .docx goes through ingest_path().
+
+    Returns:
+        list[dict]: Same as parse_document(ingest_path(path)), or None if the
+        file type is unsupported.
+    """
+    if not path.lower().endswith(".txt"):
+        document = ingest_path(path)
+        return parse_document(document) if document is not None else None
+    with byte_view(path) as data:
+        cached = _cached(hashlib.sha256(data).hexdigest(), False)
+        if cached is not None:
+            return parse_document(cached)
+        return list(iter_sections(iter_text_lines(iter_text_chunks(data))))
+
+
+def clear_ingestion_cache() -> None:
+    """
+    Forgets every cached upload.
+    """
+    with _documents_lock:
+        _documents.clear()
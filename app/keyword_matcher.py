@@ -0,0 +1,262 @@
+"""
+Multi-keyword matcher for requirement categorization.
+
+KeywordMatcher compiles a taxonomy ({category: [keywords]}) once into a single
+trie-shaped regular expression — a prefix-sharing automaton executed by the C
+regex engine — and tags a text with every matching category in one
+left-to-right pass, instead of testing each keyword separately.
+
+Matching modes:
+- substring (default): a keyword matches anywhere, exactly like `keyword in text`;
+- word_boundary: a keyword only matches as whole words ("data" does not match
+  "metadata");
+- stem: text and keywords are reduced with a light suffix stemmer before
+  matching ("encrypted" matches "encryption"); implies word boundaries.
+"""
+
+import re
+from functools import lru_cache
+from typing import Iterable, Optional
+
+_WORD = re.compile(r"\w+")
+
+# Suffixes removed by stem(), longest first; "ies" becomes "y"
+_SUFFIXES = ("ions", "ings", "ion", "ing", "ies", "ers", "ed", "es", "er", "ly", "s")
+
+
+@lru_cache(maxsize=65536)
+def stem(word: str) -> str:
+    """
+    Light English suffix stemmer (not a full Porter stemmer), tuned so common
+    inflections of SRS keywords share a stem: encrypt/encrypted/encryption,
+    store/stored/stores, retry/retries, transmit/transmitted.
+    """
+    word = word.lower()
+    for suffix in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            if suffix == "s" and word.endswith("ss"):
+                continue
+            word = word[: -len(suffix)] + ("y" if suffix == "ies" else "")
+            break
+    if len(word) > 3 and word[-1] == word[-2] and word[-1] not in "lsz":
+        word = word[:-1]  # transmitt -> transmit
+    if len(word) > 3 and word.endswith("e"):
+        word = word[:-1]  # store -> stor, to meet stored -> stor
+    return word
+
+
+def _stem_text(text: str) -> str:
+    return " ".join(map(stem, _WORD.findall(text.lower())))
+
+
+def _is_word_char(char: str) -> bool:
+    # Same definition as the regex \w class for str patterns
+    return char.isalnum() or char == "_"
+
+
+def _is_boundary(text: str, index: int) -> bool:
+    # Whether \b holds at `index` of `text` (0 < index < len(text))
+    return _is_word_char(text[index - 1]) != _is_word_char(text[index])
+
+
+def _trie_regex(words: Iterable[str]) -> str:
+    """
+    Builds a regex matching any of `words` that shares common prefixes, e.g.
+    ["encrypt", "encryption", "error"] -> "e(?:ncrypt(?:ion)?|rror)". Greedy
+    optional tails make the longest keyword at a position win.
+    """
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: dict) -> str:
+        branches = [re.escape(char) + build(child) for char, child in node.items() if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie) or r"(?!)"
+
+
+# Below this many keywords, substring mode checks them one by one with `in`
+# (C-level search with a per-category early exit); the compiled scan only
+# pays off beyond it
+SMALL_TAXONOMY_KEYWORDS = 48
+
+
+class KeywordMatcher:
+    """
+    Compiled multi-keyword matcher over a category taxonomy.
+
+    Matches found by the scan consume text, so two extra tables computed at
+    build time keep the result exact: each keyword's closure (the categories of
+    every keyword occurring inside it) and the offsets inside it where another
+    keyword could start and run past its end, which are probed separately.
+
+    Args:
+        taxonomy (dict[str, list[str]]): Category name -> keywords.
+        word_boundary (bool): Only match keywords as whole words.
+        stem (bool): Match on stemmed words (implies word_boundary).
+    """
+
+    def __init__(
+        self,
+        taxonomy: dict[str, list[str]],
+        word_boundary: bool = False,
+        stem: bool = False,
+    ):
+        self.categories = list(taxonomy)
+        self.word_boundary = word_boundary or stem
+        self.stem = stem
+
+        masks: dict[str, int] = {}
+        for index, category in enumerate(self.categories):
+            for keyword in taxonomy[category]:
+                key = _stem_text(keyword) if stem else keyword.lower()
+                if key:
+                    masks[key] = masks.get(key, 0) | (1 << index)
+        self._all = (1 << len(self.categories)) - 1
+        # Normalized keywords and their category masks, in taxonomy order
+        self.keywords = list(masks)
+        self.keyword_masks = [masks[keyword] for keyword in self.keywords]
+
+        self._small: Optional[list[tuple[int, tuple[str, ...]]]] = None
+        if not self.word_boundary and len(masks) <= SMALL_TAXONOMY_KEYWORDS:
+            self._small = [
+                (1 << index, tuple(k for k, m in masks.items() if m >> index & 1))
+                for index in range(len(self.categories))
+            ]
+
+        pattern = _trie_regex(masks)
+        if self.word_boundary:
+            pattern = rf"\b(?:{pattern})\b"
+        self._pattern = re.compile(pattern)
+        positions = {keyword: i for i, keyword in enumerate(self.keywords)}
+        self._inner = {kw: self._inner_keywords(kw, positions) for kw in masks}
+        self._closure = {}
+        for keyword, inner in self._inner.items():
+            mask = 0
+            for i in inner:
+                mask |= self.keyword_masks[i]
+            self._closure[keyword] = mask
+
+        # Proper prefixes of keywords -> (next characters, categories reachable)
+        prefixes: dict[str, tuple[str, int]] = {}
+        for keyword in masks:
+            for end in range(1, len(keyword)):
+                follow, mask = prefixes.get(keyword[:end], ("", 0))
+                if keyword[end] not in follow:
+                    follow += keyword[end]
+                prefixes[keyword[:end]] = (follow, mask | self._closure[keyword])
+        self._probes = {kw: self._overlap_offsets(kw, prefixes) for kw in masks}
+
+    def _inner_keywords(self, keyword: str, index: dict[str, int]) -> tuple[int, ...]:
+        # Indices of every keyword occurring inside `keyword` (itself included)
+        found = set()
+        length = len(keyword)
+        for start in range(length):
+            if self.word_boundary and start and not _is_boundary(keyword, start):
+                continue
+            for end in range(start + 1, length + 1):
+                if self.word_boundary and end < length and not _is_boundary(keyword, end):
+                    continue
+                if keyword[start:end] in index:
+                    found.add(index[keyword[start:end]])
+        return tuple(sorted(found))
+
+    def _overlap_offsets(self, keyword: str, prefixes: dict[str, tuple[str, int]]) -> tuple:
+        """
+        Finds the offsets k where keyword[k:] is a proper prefix of a longer
+        keyword, as (k, characters that can follow keyword, categories those
+        longer keywords could add), so a probe is skipped unless it can matter.
+        """
+        offsets = []
+        for k in range(1, len(keyword)):
+            if self.word_boundary and not _is_boundary(keyword, k):
+                continue
+            if keyword[k:] in prefixes:
+                follow, mask = prefixes[keyword[k:]]
+                offsets.append((k, follow, mask))
+        return tuple(offsets)
+
+    def match_mask(self, text: str) -> int:
+        """
+        Returns a bit mask of matching categories (bit i = self.categories[i]).
+        """
+        if self._small is not None:
+            text = text.lower()
+            found = 0
+            for bit, keywords in self._small:
+                for keyword in keywords:
+                    if keyword in text:
+                        found |= bit
+                        break
+            return found
+
+        text = _stem_text(text) if self.stem else text.lower()
+        pattern, closure, probes, full = self._pattern, self._closure, self._probes, self._all
+        found = 0
+        for match in pattern.finditer(text):
+            keyword = match.group()
+            found |= closure[keyword]
+            # Keywords starting inside this match and running past its end;
+            # later starts are found by the scan itself
+            end = match.end()
+            for offset, follow, mask in probes[keyword]:
+                if found | mask != found and text[end : end + 1] in follow:
+                    crossing = pattern.match(text, match.start() + offset)
+                    if crossing is not None:
+                        found |= closure[crossing.group()]
+            if found == full:
+                break
+        return found
+
+    def match_keywords(self, text: str) -> set[int]:
+        """
+        Returns the indices (into self.keywords) of every keyword in `text`.
+        """
+        if self._small is not None:
+            text = text.lower()
+            return {i for i, keyword in enumerate(self.keywords) if keyword in text}
+
+        text = _stem_text(text) if self.stem else text.lower()
+        pattern, inner, probes = self._pattern, self._inner, self._probes
+        found: set[int] = set()
+        for match in pattern.finditer(text):
+            keyword = match.group()
+            found.update(inner[keyword])
+            end = match.end()
+            for offset, follow, _ in probes[keyword]:
+                if text[end : end + 1] in follow:
+                    crossing = pattern.match(text, match.start() + offset)
+                    if crossing is not None:
+                        found.update(inner[crossing.group()])
+        return found
+
+    def match(self, text: str) -> list[str]:
+        """
+        Returns every category with a keyword in `text`, in taxonomy order.
+        """
+        mask = self.match_mask(text)
+        return [c for i, c in enumerate(self.categories) if mask >> i & 1]
+
+    def group(self, items: Iterable[dict], field: str = "text") -> dict[str, list[dict]]:
+        """
+        Buckets items by the categories their `field` matches; an item can land
+        in several categories. Every category is present in the result.
+        """
+        grouped: dict[str, list[dict]] = {category: [] for category in self.categories}
+        buckets = [grouped[category] for category in self.categories]
+        for item in items:
+            mask = self.match_mask(item.get(field, ""))
+            index = 0
+            while mask:
+                if mask & 1:
+                    buckets[index].append(item)
+                mask >>= 1
+                index += 1
+        return grouped
@@ -2,22 +2,303 @@
 Handles communication with OpenAI's API for analyzing requirement clarity.
 """
 
-from openai import OpenAI
+import asyncio
 import os
+import threading
+from contextvars import copy_context
+from typing import Any, Awaitable, Callable, Coroutine, Optional, Sequence, TypeVar
 from dotenv import load_dotenv
 import json
+import jsonschema
+from app.llm_client import get_shared_client
+from app.llm_cache import LLMCache, get_cache, make_cache_key
+from app.rate_limiter import get_rate_limiter
+from app.packing import (
+    MAX_PACK_COMPLETION_TOKENS,
+    MAX_SECTION_TOKENS,
+    PACK_COMPLETION_TOKENS,
+    estimate_tokens,
+    pack_sections,
+    split_oversized,
+)
 
 load_dotenv()
 
+ANALYSIS_MODEL = "gpt-3.5-turbo-0125"
 
-def get_client():
+SKIPPED_ANALYSIS = "Skipped analysis — section too short or empty."
+SKIPPED_TESTS = "⚠️ Skipped: section too short or empty."
+
+# Prompt template versions; bump one whenever its prompt text changes so cached
+# responses produced by the old wording are no longer served.
+PROMPT_VERSIONS = {
+    "analysis": "1",
+    "tests": "1",
+    "combined": "1",
+    "packed": "1",
+    "toc": "1",
+    "grouping": "1",
+    "grouping_batch": "1",
+    "summary": "1",
+}
+
+# Structured output contract for the combined analysis + tests call.
+ANALYSIS_WITH_TESTS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "analysis": {"type": "string", "minLength": 1},
+        "tests": {"type": "string", "minLength": 1},
+    },
+    "required": ["analysis", "tests"],
+}
+
+# Analyze each section with one structured call instead of analysis + tests calls.
+COMBINED_ANALYSIS = os.getenv(
+    "SPECSENSE_COMBINED_ANALYSIS", "1"
+).strip().lower() not in {
+    "0",
+    "false",
+    "no",
+    "off",
+}
+
+# Packing limits for batched requirement classification.
+GROUPING_BATCH_TOKEN_BUDGET = int(os.getenv("SPECSENSE_GROUPING_TOKEN_BUDGET", "2000"))
+GROUPING_MAX_BATCH_SIZE = 50
+
+# Completion size assumed for rate limiting when a request sets no max_tokens.
+DEFAULT_COMPLETION_TOKENS = 500
+
+# Pack short sections into shared requests and split oversized ones (combined mode only).
+PACK_SECTIONS = os.getenv("SPECSENSE_PACK_SECTIONS", "1").strip().lower() not in {
+    "0",
+    "false",
+    "no",
+    "off",
+}
+
+# Upper bound on in-flight LLM requests for one batch of sections.
+DEFAULT_MAX_CONCURRENCY = int(os.getenv("SPECSENSE_LLM_CONCURRENCY", "8"))
+
+T = TypeVar("T")
+R = TypeVar("R")
 
+
+def _get_api_key() -> str:
     api_key = os.getenv("OPENAI_API_KEY")
 
     if api_key is None or api_key.strip() == "":
         raise ValueError("OpenAI API key not set")
 
-    return OpenAI(api_key=api_key)
+    return api_key
+
+
+def get_client():
+    """
+    Returns the shared, connection-pooled OpenAI client (see app.llm_client).
+    """
+    return get_shared_client(_get_api_key())
+
+
+def get_async_client():
+    """
+    Returns the shared asyncio-compatible OpenAI client for the concurrent analysis engine.
+    """
+    return get_shared_client(_get_api_key(), is_async=True)
+
+
+def build_analysis_messages(text: str) -> list[dict]:
+    """
+    Builds the chat messages used to analyze a single requirement section.
+    """
+    return [
+        {
+            "role": "system",
+            "content": (
+                "You're an expert in software and systems engineering. "
+                "Analyze the following requirement for ambiguity, vagueness, implicit behavior, or untestability.\n"
+                "Only report issues that are actually present — if the requirement is clear, say so.\n"
+                "\n"
+                "Return your analysis in Markdown format using the following sections (only include relevant ones):\n"
+                "- Ambiguity\n"
+                "- Vagueness\n"
+                "- Implicit behavior\n"
+                "- Testability issues\n"
+                "\n"
+                "If no issues are found, simply return:\n"
+                "✅ This requirement is well-defined and testable."
+            ),
+        },
+        {"role": "user", "content": text},
+    ]
+
+
+def build_combined_messages(text: str) -> list[dict]:
+    """
+    Builds the chat messages for a single call that returns both the analysis
+    and the test suggestions as a JSON object (see ANALYSIS_WITH_TESTS_SCHEMA).
+    """
+    return [
+        {
+            "role": "system",
+            "content": (
+                "You're an expert in software and systems engineering. "
+                "Analyze the following requirement for ambiguity, vagueness, implicit behavior, or untestability, "
+                "then suggest test cases for it.\n"
+                "Only report issues that are actually present — if the requirement is clear, say so.\n"
+                "\n"
+                "Respond with a JSON object with exactly two string fields:\n"
+                '- "analysis": your analysis in Markdown, using only the relevant sections among '
+                "Ambiguity, Vagueness, Implicit behavior, Testability issues. "
+                "If no issues are found, use exactly: ✅ This requirement is well-defined and testable.\n"
+                '- "tests": concise test cases as Markdown bullet points.'
+            ),
+        },
+        {"role": "user", "content": text},
+    ]
+
+
+def build_packed_messages(texts: Sequence[str]) -> list[dict]:
+    """
+    Builds the chat messages for analyzing several short sections in one call.
+    Sections are numbered from 1 and answered as a JSON object keyed by number.
+    """
+    sections = "\n\n".join(
+        f"### Section {number}\n{text}" for number, text in enumerate(texts, start=1)
+    )
+    return [
+        {
+            "role": "system",
+            "content": (
+                "You're an expert in software and systems engineering. "
+                "You will receive several numbered requirement sections. For each one, analyze it "
+                "for ambiguity, vagueness, implicit behavior, or untestability, then suggest test cases.\n"
+                "Only report issues that are actually present — if a requirement is clear, say so.\n"
+                "\n"
+                "Respond with a JSON object mapping every section number (as a string) to an object "
+                "with exactly two string fields:\n"
+                '- "analysis": your analysis in Markdown, using only the relevant sections among '
+                "Ambiguity, Vagueness, Implicit behavior, Testability issues. "
+                "If no issues are found, use exactly: ✅ This requirement is well-defined and testable.\n"
+                '- "tests": concise test cases as Markdown bullet points.\n'
+                "Analyze each section independently."
+            ),
+        },
+        {"role": "user", "content": sections},
+    ]
+
+
+def build_test_messages(section_text: str) -> list[dict]:
+    """
+    Builds the chat messages used to request test ideas for a requirement section.
+    """
+    prompt = (
+        "Based on the following software requirement, suggest test cases. "
+        "Be concise. Use bullet points.\n\n"
+        f"Requirement:\n{section_text}"
+    )
+    return [{"role": "user", "content": prompt}]
+
+
+def _response_text(response) -> str:
+    """
+    Pulls the message content out of a chat completion response, falling back
+    to a warning string when the content is missing or not text.
+    """
+    content = response.choices[0].message.content
+    if not content or not isinstance(content, str):
+        return "⚠️ Unexpected LLM response format"
+    return content.strip()
+
+
+def _is_too_short(text: str) -> bool:
+    return not text or len(text.strip()) < 20
+
+
+def _cache_lookup(
+    request: dict, prompt: str
+) -> tuple[Optional[LLMCache], str, Optional[str]]:
+    cache = get_cache()
+    if cache is None:
+        return None, "", None
+    key = make_cache_key(
+        request["model"],
+        f"{prompt}:{PROMPT_VERSIONS[prompt]}",
+        request["temperature"],
+        request["messages"],
+        request.get("max_tokens"),
+    )
+    return cache, key, cache.get(key)
+
+
+def _cache_store(
+    cache: Optional[LLMCache],
+    key: str,
+    content: str,
+    validate: Optional[Callable[[str], bool]],
+) -> None:
+    # Never cache warnings about malformed responses
+    if cache is None or content.startswith("⚠️"):
+        return
+    if validate is not None and not validate(content):
+        return
+    cache.set(key, content)
+
+
+def _request_tokens(request: dict) -> int:
+    # Prompt estimate plus the completion allowance, for TPM accounting
+    prompt_tokens = sum(estimate_tokens(str(m["content"])) for m in request["messages"])
+    return prompt_tokens + request.get("max_tokens", DEFAULT_COMPLETION_TOKENS)
+
+
+def _chat(
+    prompt: str, validate: Optional[Callable[[str], bool]] = None, **request
+) -> str:
+    """
+    Runs one chat completion through the response cache.
+
+    Args:
+        prompt (str): Prompt template name (a PROMPT_VERSIONS key), part of the cache key.
+        validate (Callable | None): Optional check; responses failing it are not cached.
+        **request: Keyword arguments for chat.completions.create().
+
+    Returns:
+        str: The stripped response text. API errors propagate to the caller.
+    """
+    cache, key, cached = _cache_lookup(request, prompt)
+    if cached is not None:
+        return cached
+
+    client = get_client()
+    response = get_rate_limiter().call(
+        request["model"],
+        _request_tokens(request),
+        lambda: client.chat.completions.create(**request),
+    )
+    content = _response_text(response)
+    _cache_store(cache, key, content, validate)
+    return content
+
+
+async def _chat_async(
+    prompt: str, validate: Optional[Callable[[str], bool]] = None, **request
+) -> str:
+    """
+    Async counterpart of _chat(), using the shared async client.
+    """
+    cache, key, cached = _cache_lookup(request, prompt)
+    if cached is not None:
+        return cached
+
+    client = get_async_client()
+    response = await get_rate_limiter().call_async(
+        request["model"],
+        _request_tokens(request),
+        lambda: client.chat.completions.create(**request),
+    )
+    content = _response_text(response)
+    _cache_store(cache, key, content, validate)
+    return content
 
 
 def analyze_requirement(text: str) -> str:
@@ -27,42 +308,19 @@ def analyze_requirement(text: str) -> str:
 
     # Skip empty input
     text = text.strip()
-    if not text or len(text.strip()) < 20:
-        return "Skipped analysis — section too short or empty."
+    if _is_too_short(text):
+        return SKIPPED_ANALYSIS
 
     # LLM call to generate analysis
     try:
-        response = get_client().chat.completions.create(
-            model="gpt-3.5-turbo-0125",
-            messages=[
-                {
-                    "role": "system",
-                    "content": (
-                        "You're an expert in software and systems engineering. "
-                        "Analyze the following requirement for ambiguity, vagueness, implicit behavior, or untestability.\n"
-                        "Only report issues that are actually present — if the requirement is clear, say so.\n"
-                        "\n"
-                        "Return your analysis in Markdown format using the following sections (only include relevant ones):\n"
-                        "- Ambiguity\n"
-                        "- Vagueness\n"
-                        "- Implicit behavior\n"
-                        "- Testability issues\n"
-                        "\n"
-                        "If no issues are found, simply return:\n"
-                        "✅ This requirement is well-defined and testable."
-                    ),
-                },
-                {"role": "user", "content": text},
-            ],
+        return _chat(
+            "analysis",
+            model=ANALYSIS_MODEL,
+            messages=build_analysis_messages(text),
             temperature=0.2,
             max_tokens=300,
         )
 
-        content = response.choices[0].message.content
-        if not content or not isinstance(content, str):
-            return "⚠️ Unexpected LLM response format"
-        return content.strip()
-
     except Exception as e:
         return f"OpenAI error: {str(e)}"
 
@@ -71,29 +329,403 @@ def suggest_tests(section_text: str) -> str:
     """
     Calls the LLM to suggest test ideas for a given requirement section.
     """
-    prompt = (
-        "Based on the following software requirement, suggest test cases. "
-        "Be concise. Use bullet points.\n\n"
-        f"Requirement:\n{section_text}"
-    )
+    try:
+        return _chat(
+            "tests",
+            model=ANALYSIS_MODEL,
+            messages=build_test_messages(section_text),
+            temperature=0.2,
+            max_tokens=300,
+        )
+
+    except Exception as e:
+        return f"OpenAI error: {str(e)}"
+
+
+async def analyze_requirement_async(text: str) -> str:
+    """
+    Async counterpart of analyze_requirement(), used by the concurrent engine.
+    """
+    text = text.strip()
+    if _is_too_short(text):
+        return SKIPPED_ANALYSIS
 
     try:
-        response = get_client().chat.completions.create(
-            model="gpt-3.5-turbo-0125",
-            messages=[{"role": "user", "content": prompt}],
+        return await _chat_async(
+            "analysis",
+            model=ANALYSIS_MODEL,
+            messages=build_analysis_messages(text),
             temperature=0.2,
             max_tokens=300,
         )
 
-        content = response.choices[0].message.content
-        if not content or not isinstance(content, str):
-            return "⚠️ Unexpected LLM response format"
-        return content.strip()
+    except Exception as e:
+        return f"OpenAI error: {str(e)}"
+
+
+async def suggest_tests_async(section_text: str) -> str:
+    """
+    Async counterpart of suggest_tests(), used by the concurrent engine.
+    """
+    try:
+        return await _chat_async(
+            "tests",
+            model=ANALYSIS_MODEL,
+            messages=build_test_messages(section_text),
+            temperature=0.2,
+            max_tokens=300,
+        )
 
     except Exception as e:
         return f"OpenAI error: {str(e)}"
 
 
+def parse_combined_response(content: str) -> Optional[dict]:
+    """
+    Parses and validates a combined analysis + tests response.
+
+    Args:
+        content (str): Raw response text expected to be a JSON object.
+
+    Returns:
+        dict | None: {"analysis": str, "tests": str}, or None if the content is
+        not valid JSON or does not match ANALYSIS_WITH_TESTS_SCHEMA.
+    """
+    try:
+        parsed = json.loads(content)
+        jsonschema.validate(parsed, ANALYSIS_WITH_TESTS_SCHEMA)
+    except (json.JSONDecodeError, jsonschema.ValidationError):
+        return None
+    return {"analysis": parsed["analysis"].strip(), "tests": parsed["tests"].strip()}
+
+
+def _is_valid_combined(content: str) -> bool:
+    return parse_combined_response(content) is not None
+
+
+def _combined_request(text: str) -> dict:
+    return {
+        "model": ANALYSIS_MODEL,
+        "messages": build_combined_messages(text),
+        "temperature": 0.2,
+        "max_tokens": 600,
+        "response_format": {"type": "json_object"},
+    }
+
+
+def analyze_with_tests(text: str) -> dict:
+    """
+    Analyzes a requirement and suggests tests in one structured LLM call.
+
+    Falls back to the two-call path (analyze_requirement + suggest_tests) when the
+    combined response is not valid JSON matching ANALYSIS_WITH_TESTS_SCHEMA.
+
+    Returns:
+        dict: {"analysis": str, "tests": str}
+    """
+    text = text.strip()
+    if _is_too_short(text):
+        return {"analysis": SKIPPED_ANALYSIS, "tests": SKIPPED_TESTS}
+
+    try:
+        content = _chat(
+            "combined", validate=_is_valid_combined, **_combined_request(text)
+        )
+    except Exception as e:
+        return {
+            "analysis": f"OpenAI error: {str(e)}",
+            "tests": f"OpenAI error: {str(e)}",
+        }
+
+    result = parse_combined_response(content)
+    if result is not None:
+        return result
+    return {"analysis": analyze_requirement(text), "tests": suggest_tests(text)}
+
+
+async def analyze_with_tests_async(text: str) -> dict:
+    """
+    Async counterpart of analyze_with_tests(), used by the concurrent engine.
+    """
+    text = text.strip()
+    if _is_too_short(text):
+        return {"analysis": SKIPPED_ANALYSIS, "tests": SKIPPED_TESTS}
+
+    try:
+        content = await _chat_async(
+            "combined", validate=_is_valid_combined, **_combined_request(text)
+        )
+    except Exception as e:
+        return {
+            "analysis": f"OpenAI error: {str(e)}",
+            "tests": f"OpenAI error: {str(e)}",
+        }
+
+    result = parse_combined_response(content)
+    if result is not None:
+        return result
+    return await _analyze_separately(text)
+
+
+def parse_packed_response(content: str, count: int) -> dict[int, dict]:
+    """
+    Demultiplexes a packed response into per-section results.
+
+    Args:
+        content (str): Raw JSON object keyed by section number ("1".."count").
+        count (int): Number of sections that were sent.
+
+    Returns:
+        dict[int, dict]: 0-based position → {"analysis", "tests"} for every entry
+        that is present and valid. Missing or malformed entries are omitted.
+    """
+    try:
+        parsed = json.loads(content)
+    except json.JSONDecodeError:
+        return {}
+    if not isinstance(parsed, dict):
+        return {}
+
+    results = {}
+    for position in range(count):
+        item = parsed.get(str(position + 1))
+        if item is None:
+            continue
+        result = parse_combined_response(json.dumps(item))
+        if result is not None:
+            results[position] = result
+    return results
+
+
+async def analyze_packed_async(
+    texts: Sequence[str], semaphore: Optional[asyncio.Semaphore] = None
+) -> list[dict]:
+    """
+    Analyzes several short sections with one request and splits the answer back
+    out per section. Sections missing from the response (or the whole batch, on
+    error) are retried individually with analyze_with_tests_async().
+
+    Args:
+        texts (Sequence[str]): Section bodies (at most MAX_PACK_SECTIONS, so
+            each answer fits in the completion budget).
+        semaphore (asyncio.Semaphore | None): Limit on requests in flight,
+            held per request (the packed call and each retry).
+
+    Returns:
+        list[dict]: {"analysis", "tests"} per text, in input order.
+    """
+    texts = [text.strip() for text in texts]
+    semaphore = semaphore or asyncio.Semaphore(DEFAULT_MAX_CONCURRENCY)
+    if len(texts) == 1:
+        async with semaphore:
+            return [await analyze_with_tests_async(texts[0])]
+
+    try:
+        async with semaphore:
+            content = await _chat_async(
+                "packed",
+                validate=lambda c: len(parse_packed_response(c, len(texts))) == len(texts),
+                model=ANALYSIS_MODEL,
+                messages=build_packed_messages(texts),
+                temperature=0.2,
+                max_tokens=min(
+                    MAX_PACK_COMPLETION_TOKENS, PACK_COMPLETION_TOKENS * len(texts)
+                ),
+                response_format={"type": "json_object"},
+            )
+        packed = parse_packed_response(content, len(texts))
+    except Exception:
+        packed = {}
+
+    missing = [position for position in range(len(texts)) if position not in packed]
+    retried = await gather_bounded(
+        [texts[position] for position in missing],
+        analyze_with_tests_async,
+        semaphore=semaphore,
+    )
+    packed.update(zip(missing, retried))
+    return [packed[position] for position in range(len(texts))]
+
+
+async def analyze_oversized_async(
+    text: str, semaphore: Optional[asyncio.Semaphore] = None
+) -> dict:
+    """
+    Analyzes a section too large for one request by splitting it into chunks
+    (see app.packing.split_oversized) and joining the per-chunk answers.
+    Chunks are analyzed concurrently within `semaphore`'s limit.
+    """
+    chunks = split_oversized(text.strip(), MAX_SECTION_TOKENS)
+    parts = await gather_bounded(chunks, analyze_with_tests_async, semaphore=semaphore)
+    if len(parts) == 1:
+        return parts[0]
+
+    total = len(parts)
+    return {
+        key: "\n\n".join(
+            f"**Part {number}/{total}**\n\n{part[key]}"
+            for number, part in enumerate(parts, start=1)
+        )
+        for key in ("analysis", "tests")
+    }
+
+
+async def gather_bounded(
+    items: Sequence[T],
+    worker: Callable[[T], Awaitable[R]],
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    semaphore: Optional[asyncio.Semaphore] = None,
+) -> list[R]:
+    """
+    Runs `worker` over every item with at most `max_concurrency` calls in flight.
+
+    Args:
+        items (Sequence): Inputs to process.
+        worker (Callable): Async function applied to each item.
+        max_concurrency (int): Maximum number of simultaneous worker calls.
+        semaphore (asyncio.Semaphore | None): Limit shared with other callers
+            (e.g. one per batch run over many documents); replaces
+            `max_concurrency` when given.
+
+    Returns:
+        list: Worker results in the same order as `items`.
+    """
+    semaphore = semaphore or asyncio.Semaphore(max(1, max_concurrency))
+
+    async def run(item: T) -> R:
+        async with semaphore:
+            return await worker(item)
+
+    return list(await asyncio.gather(*(run(item) for item in items)))
+
+
+async def _analyze_separately(body: str) -> dict:
+    analysis = await analyze_requirement_async(body)
+
+    # Only request tests if the analysis was actually performed
+    if SKIPPED_ANALYSIS in analysis:
+        return {"analysis": analysis, "tests": SKIPPED_TESTS}
+
+    return {"analysis": analysis, "tests": await suggest_tests_async(body)}
+
+
+async def _analyze_packed_group(group: list[str], semaphore: asyncio.Semaphore) -> list[dict]:
+    # Slots are taken per request inside, so a group's retries and chunks run
+    # within the same limit instead of under one held slot
+    if len(group) == 1 and estimate_tokens(group[0]) > MAX_SECTION_TOKENS:
+        return [await analyze_oversized_async(group[0], semaphore)]
+    return await analyze_packed_async(group, semaphore)
+
+
+async def analyze_sections_async(
+    bodies: Sequence[str],
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    combined: bool = COMBINED_ANALYSIS,
+    pack: bool = PACK_SECTIONS,
+    semaphore: Optional[asyncio.Semaphore] = None,
+) -> list[dict]:
+    """
+    Analyzes many section bodies concurrently.
+
+    Args:
+        bodies (Sequence[str]): Section body texts, in document order.
+        max_concurrency (int): Maximum number of requests in flight at once.
+        combined (bool): Use one structured call per section instead of two.
+        pack (bool): In combined mode, share requests between short sections
+            and split oversized ones (see app.packing).
+        semaphore (asyncio.Semaphore | None): Shared limit on requests in
+            flight, used instead of `max_concurrency` (see gather_bounded()).
+
+    Returns:
+        list[dict]: One {"analysis": ..., "tests": ...} dict per body, in input order.
+    """
+    if not combined:
+        return await gather_bounded(
+            bodies, _analyze_separately, max_concurrency, semaphore
+        )
+    if not pack:
+        return await gather_bounded(
+            bodies, analyze_with_tests_async, max_concurrency, semaphore
+        )
+
+    results: list[dict] = [
+        {"analysis": SKIPPED_ANALYSIS, "tests": SKIPPED_TESTS} for _ in bodies
+    ]
+    # Too-short sections are skipped without a request, so keep them out of packing
+    active = [i for i, body in enumerate(bodies) if not _is_too_short(body.strip())]
+    groups = [
+        [active[i] for i in group]
+        for group in pack_sections([bodies[i].strip() for i in active])
+    ]
+
+    semaphore = semaphore or asyncio.Semaphore(max(1, max_concurrency))
+    answers = await asyncio.gather(
+        *(
+            _analyze_packed_group([bodies[i].strip() for i in group], semaphore)
+            for group in groups
+        )
+    )
+    for group, group_answers in zip(groups, answers):
+        for index, answer in zip(group, group_answers):
+            results[index] = answer
+    return results
+
+
+def analyze_sections(
+    bodies: Sequence[str],
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    combined: bool = COMBINED_ANALYSIS,
+    pack: bool = PACK_SECTIONS,
+) -> list[dict]:
+    """
+    Synchronous entry point for the concurrent analysis engine, used by the
+    Flask and Streamlit front ends.
+
+    Wall-clock time scales with the number of requests / max_concurrency rather
+    than with the number of sections.
+    """
+    return _run_coroutine(
+        analyze_sections_async(bodies, max_concurrency, combined, pack)
+    )
+
+
+_engine_loop: asyncio.AbstractEventLoop | None = None
+_engine_lock = threading.Lock()
+
+
+def _get_engine_loop() -> asyncio.AbstractEventLoop:
+    """
+    Returns the long-lived event loop that runs engine coroutines.
+
+    A single background loop (rather than asyncio.run() per call) lets the pooled
+    async client and its keep-alive connections survive across Flask requests
+    and Streamlit reruns.
+    """
+    global _engine_loop
+    with _engine_lock:
+        if _engine_loop is None or _engine_loop.is_closed():
+            loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=loop.run_forever, name="specsense-llm", daemon=True
+            ).start()
+            _engine_loop = loop
+        return _engine_loop
+
+
+def _run_coroutine(coro: Coroutine[Any, Any, R]) -> R:
+    # Carry the caller's context variables (e.g. cache bypass) onto the engine loop
+    context = copy_context()
+
+    async def with_caller_context() -> R:
+        for var, value in context.items():
+            var.set(value)
+        return await coro
+
+    return asyncio.run_coroutine_threadsafe(
+        with_caller_context(), _get_engine_loop()
+    ).result()
+
+
 def compare_toc_sections_with_llm(
     standard_sections: list[str], document_sections: list[str]
 ) -> str:
@@ -134,7 +766,8 @@ def compare_toc_sections_with_llm(
             f"Document TOC:\n{chr(10).join(f'- {s}' for s in document_sections)}"
         )
 
-        response = get_client().chat.completions.create(
+        return _chat(
+            "toc",
             model="gpt-4",
             messages=[
                 {
@@ -145,11 +778,6 @@ def compare_toc_sections_with_llm(
             ],
             temperature=0.2,
         )
-
-        content = response.choices[0].message.content
-        if not content or not isinstance(content, str):
-            return "⚠️ Unexpected LLM response format"
-        return content.strip()
     except Exception as e:
         return f"OpenAI error: {str(e)}"
 
@@ -178,17 +806,17 @@ def llm_group_requirement(text: str) -> list[str]:
     Uses GPT to classify a requirement into one or more semantic categories.
     Returns a list of category names (e.g., ["Authentication", "Security"]).
     """
-    from app.requirement_grouper import get_requirement_categories
+    from app.taxonomy import get_taxonomy
 
-    categories = list(get_requirement_categories().keys())
+    categories = list(get_taxonomy().categories)
     prompt = build_grouping_prompt(categories)
 
     if not text or len(text.strip()) < 20:
         return []
 
     try:
-        client = get_client()
-        response = client.chat.completions.create(
+        content = _chat(
+            "grouping",
             model="gpt-3.5-turbo",
             messages=[
                 {
@@ -200,8 +828,6 @@ def llm_group_requirement(text: str) -> list[str]:
             temperature=0.2,
         )
 
-        content = response.choices[0].message.content.strip()
-
         try:
             parsed = json.loads(content)
             if isinstance(parsed, list):
@@ -215,6 +841,128 @@ def llm_group_requirement(text: str) -> list[str]:
         return [f"OpenAI error: {str(e)}"]
 
 
+def build_batch_grouping_prompt(categories: list[str]) -> str:
+    """
+    Builds a system prompt for classifying many numbered requirements in one call.
+
+    Args:
+        categories (list[str]): List of known category names.
+
+    Returns:
+        str: A system prompt requesting a JSON object mapping each item number to
+             a JSON array of matching categories.
+    """
+    category_list = ", ".join(f'"{cat}"' for cat in categories)
+    return (
+        "You are an expert requirements analyst.\n"
+        "Classify each numbered requirement below into one or more of these categories:\n"
+        f"{category_list}\n\n"
+        "Return only a JSON object mapping every item number (as a string) to a JSON array of "
+        'category names, e.g. {"1": ["Authentication", "Security"], "2": []}.'
+    )
+
+
+def _parse_batch_grouping(content: str, expected: list[str]) -> Optional[dict]:
+    try:
+        parsed = json.loads(content)
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(parsed, dict) or any(k not in parsed for k in expected):
+        return None
+    if any(not isinstance(parsed[k], list) for k in expected):
+        return None
+    return {k: [cat for cat in parsed[k] if isinstance(cat, str)] for k in expected}
+
+
+def _classify_batch(texts: list[str], prompt: str) -> list[list[str]]:
+    """
+    Classifies one batch; on failure, splits it in half and retries each half.
+    A batch of one falls back to llm_group_requirement().
+    """
+    if len(texts) == 1:
+        return [llm_group_requirement(texts[0])]
+
+    numbers = [str(i) for i in range(1, len(texts) + 1)]
+    body = "\n".join(f"{n}. {text}" for n, text in zip(numbers, texts))
+
+    try:
+        content = _chat(
+            "grouping_batch",
+            validate=lambda c: _parse_batch_grouping(c, numbers) is not None,
+            model="gpt-3.5-turbo",
+            messages=[
+                {"role": "system", "content": prompt},
+                {"role": "user", "content": body},
+            ],
+            temperature=0.2,
+            response_format={"type": "json_object"},
+        )
+        parsed = _parse_batch_grouping(content, numbers)
+    except Exception:
+        parsed = None
+
+    if parsed is not None:
+        return [parsed[n] for n in numbers]
+
+    middle = len(texts) // 2
+    return _classify_batch(texts[:middle], prompt) + _classify_batch(
+        texts[middle:], prompt
+    )
+
+
+def llm_group_requirements_batch(
+    texts: list[str],
+    token_budget: int = GROUPING_BATCH_TOKEN_BUDGET,
+    max_batch_size: int = GROUPING_MAX_BATCH_SIZE,
+) -> list[list[str]]:
+    """
+    Classifies many requirements with as few LLM calls as possible.
+
+    Requirements are packed in order into numbered batches whose estimated input
+    stays under `token_budget`; each batch is answered with a JSON object of
+    item number → categories. Batches that fail or come back malformed are split
+    in half and retried, down to single-requirement calls.
+
+    Args:
+        texts (list[str]): Requirement texts.
+        token_budget (int): Approximate token limit for one batch's user message.
+        max_batch_size (int): Upper bound on requirements per batch.
+
+    Returns:
+        list[list[str]]: Categories per requirement, aligned with `texts`.
+            Short requirements (under 20 characters) get an empty list, as in
+            llm_group_requirement().
+    """
+    from app.taxonomy import get_taxonomy
+
+    prompt = build_batch_grouping_prompt(list(get_taxonomy().categories))
+    results: list[list[str]] = [[] for _ in texts]
+
+    batches: list[list[int]] = []
+    current: list[int] = []
+    current_tokens = 0
+    for index, text in enumerate(texts):
+        if _is_too_short(text):
+            continue
+        tokens = estimate_tokens(text) + 4  # numbering + newline overhead
+        if current and (
+            current_tokens + tokens > token_budget or len(current) >= max_batch_size
+        ):
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append(index)
+        current_tokens += tokens
+    if current:
+        batches.append(current)
+
+    for batch in batches:
+        groups = _classify_batch([texts[i].strip() for i in batch], prompt)
+        for index, categories in zip(batch, groups):
+            results[index] = categories
+
+    return results
+
+
 def build_summary_prompt(clean_count: int, total_count: int) -> str:
     return (
         "You are an expert requirements analyst reviewing a Software Requirements Specification (SRS).\n"
@@ -262,8 +1010,6 @@ def summarize_analysis(analysis_results: dict) -> str:
     Uses GPT to generate a high-level summary based on all section-level analyses.
     Includes numeric context for balance and avoids overgeneralized framing.
     """
-    from app.llm import get_client
-
     sections = [
         section
         for section in analysis_results.values()
@@ -285,8 +1031,8 @@ def summarize_analysis(analysis_results: dict) -> str:
     prompt = build_summary_prompt(clean_count, total_count)
 
     try:
-        client = get_client()
-        response = client.chat.completions.create(
+        return _chat(
+            "summary",
             model="gpt-4",
             messages=[
                 {"role": "system", "content": prompt},
@@ -294,6 +1040,5 @@ def summarize_analysis(analysis_results: dict) -> str:
             ],
             temperature=0.4,
         )
-        return response.choices[0].message.content.strip()
     except Exception as e:
         return f"⚠️ Summary generation failed: {str(e)}"
@@ -0,0 +1,383 @@
+"""
+Content-addressed, disk-backed cache for LLM responses.
+
+Reviewers re-upload the same SRS many times; caching each completion by
+(model, prompt version, sampling parameters, normalized input) means unchanged
+sections are answered from disk instead of being billed again.
+
+The store is a single SQLite file in WAL mode, so several Flask worker
+processes can read and write it concurrently. Entry count and stored bytes are
+kept as running totals by triggers, so a write checks the eviction limits
+without scanning the table.
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+DEFAULT_CACHE_PATH = os.path.join(".specsense_cache", "llm_cache.sqlite3")
+DEFAULT_TTL_SECONDS = 30 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 50_000
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# Lookups between writes of the in-memory hit/miss counts and access times
+DEFAULT_FLUSH_EVERY = 100
+
+_bypass: ContextVar[bool] = ContextVar("specsense_llm_cache_bypass", default=False)
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalizes prompt text so cosmetic whitespace changes do not miss the cache.
+    Line endings are unified, trailing whitespace is dropped and the text is stripped.
+    """
+    return "\n".join(line.rstrip() for line in text.strip().splitlines())
+
+
+def make_cache_key(
+    model: str,
+    prompt_version: str,
+    temperature: float,
+    messages: list[dict],
+    max_tokens: Optional[int] = None,
+) -> str:
+    """
+    Builds a stable SHA-256 key for one chat completion request.
+
+    Args:
+        model (str): Model name sent to the API.
+        prompt_version (str): Version tag of the prompt template; bump it when a prompt changes.
+        temperature (float): Sampling temperature.
+        messages (list[dict]): Chat messages; contents are normalized before hashing.
+        max_tokens (int | None): Completion token limit, if any.
+
+    Returns:
+        str: Hex digest identifying the request.
+    """
+    payload = {
+        "model": model,
+        "prompt_version": prompt_version,
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+        "messages": [
+            [m.get("role", ""), normalize_text(str(m.get("content", "")))]
+            for m in messages
+        ],
+    }
+    raw = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """
+    SQLite-backed response cache with TTL expiry and LRU eviction.
+
+    Entries older than `ttl_seconds` are treated as misses. When the cache grows
+    past `max_entries` rows or `max_bytes` of stored text, the least recently
+    used entries are evicted. Hit/miss counters are persisted in the same file so
+    they aggregate across worker processes.
+
+    get() never writes: counters, access times and expired keys are kept in
+    memory and written in batches (see flush()), so concurrent readers in
+    several processes do not queue for SQLite's writer lock.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_CACHE_PATH,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        flush_every: int = DEFAULT_FLUSH_EVERY,
+    ):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.flush_every = max(1, flush_every)
+        self._local = threading.local()
+        self._pending_lock = threading.Lock()
+        self._pending_pid = os.getpid()
+        self._hits = self._misses = 0
+        self._touched: dict[str, float] = {}
+        self._expired: set[str] = set()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS entries (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_entries_last_access
+                    ON entries (last_access);
+                CREATE TABLE IF NOT EXISTS counters (
+                    name TEXT PRIMARY KEY,
+                    value INTEGER NOT NULL
+                );
+                INSERT OR IGNORE INTO counters (name, value) VALUES ('hits', 0), ('misses', 0);
+                INSERT OR IGNORE INTO counters (name, value)
+                    SELECT 'entries', COUNT(*) FROM entries;
+                INSERT OR IGNORE INTO counters (name, value)
+                    SELECT 'bytes', COALESCE(SUM(size), 0) FROM entries;
+                CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries BEGIN
+                    UPDATE counters SET value = value + 1 WHERE name = 'entries';
+                    UPDATE counters SET value = value + NEW.size WHERE name = 'bytes';
+                END;
+                CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries BEGIN
+                    UPDATE counters SET value = value - 1 WHERE name = 'entries';
+                    UPDATE counters SET value = value - OLD.size WHERE name = 'bytes';
+                END;
+                CREATE TRIGGER IF NOT EXISTS entries_resize AFTER UPDATE OF size ON entries BEGIN
+                    UPDATE counters SET value = value - OLD.size + NEW.size WHERE name = 'bytes';
+                END;
+                """
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        # One connection per thread and per process (connections must not cross a fork)
+        conn = getattr(self._local, "conn", None)
+        if conn is None or getattr(self._local, "pid", None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Returns the cached value for `key`, or None on a miss or expired entry.
+
+        Lookups only read the database: the hit/miss counts, the entry's new
+        access time and expired keys are recorded in memory and written by
+        flush().
+        """
+        conn = self._connect()
+        now = time.time()
+        row = conn.execute(
+            "SELECT value, created_at FROM entries WHERE key = ?", (key,)
+        ).fetchone()
+
+        hit = row is not None and now - row[1] <= self.ttl_seconds
+        with self._pending_lock:
+            self._reset_pending_after_fork()
+            if hit:
+                self._hits += 1
+                self._touched[key] = now
+            else:
+                self._misses += 1
+                if row is not None:
+                    self._expired.add(key)
+            due = self._hits + self._misses >= self.flush_every
+        if due:
+            self.flush()
+        return row[0] if hit else None
+
+    def _reset_pending(self) -> None:
+        self._pending_pid = os.getpid()
+        self._hits = self._misses = 0
+        self._touched = {}
+        self._expired = set()
+
+    def _reset_pending_after_fork(self) -> None:
+        # A forked child must not write its parent's pending counts again
+        if self._pending_pid != os.getpid():
+            self._reset_pending()
+
+    def _write_pending(self, conn: sqlite3.Connection) -> None:
+        # Runs inside a write transaction
+        with self._pending_lock:
+            self._reset_pending_after_fork()
+            hits, misses = self._hits, self._misses
+            touched, expired = self._touched, self._expired
+            self._hits = self._misses = 0
+            self._touched, self._expired = {}, set()
+        if hits or misses:
+            conn.executemany(
+                "UPDATE counters SET value = value + ? WHERE name = ?",
+                ((hits, "hits"), (misses, "misses")),
+            )
+        conn.executemany(
+            "UPDATE entries SET last_access = MAX(last_access, ?) WHERE key = ?",
+            ((at, key) for key, at in touched.items()),
+        )
+        # Only rows still expired: another process may have stored a fresh value
+        cutoff = time.time() - self.ttl_seconds
+        conn.executemany(
+            "DELETE FROM entries WHERE key = ? AND created_at < ?",
+            ((key, cutoff) for key in expired),
+        )
+
+    def flush(self) -> None:
+        """
+        Writes this process's pending hit/miss counts, access times and
+        expired-entry deletions in one transaction (done automatically every
+        `flush_every` lookups, on every set() and before stats()).
+        """
+        with self._pending_lock:
+            self._reset_pending_after_fork()
+            if not (self._hits or self._misses or self._touched or self._expired):
+                return
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._write_pending(conn)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def set(self, key: str, value: str) -> None:
+        """
+        Stores `value` under `key`, then evicts least-recently-used entries if needed.
+        """
+        conn = self._connect()
+        now = time.time()
+        # The write, the totals it is checked against and the eviction share one
+        # transaction, so concurrent writers never evict from a stale total
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # An upsert (not INSERT OR REPLACE) so the totals triggers see the size change
+            conn.execute(
+                "INSERT INTO entries (key, value, size, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?) ON CONFLICT (key) DO UPDATE SET "
+                "value = excluded.value, size = excluded.size, "
+                "created_at = excluded.created_at, last_access = excluded.last_access",
+                (key, value, len(value.encode("utf-8")), now, now),
+            )
+            # Pending access times first, so eviction sees recent hits
+            self._write_pending(conn)
+            self._evict(conn)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _totals(self, conn: sqlite3.Connection) -> tuple[int, int]:
+        counters = dict(
+            conn.execute(
+                "SELECT name, value FROM counters WHERE name IN ('entries', 'bytes')"
+            ).fetchall()
+        )
+        return counters.get("entries", 0), counters.get("bytes", 0)
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        # Runs inside set()'s write transaction
+        count, total = self._totals(conn)
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+
+        doomed = []
+        for key, size in conn.execute(
+            "SELECT key, size FROM entries ORDER BY last_access ASC"
+        ):
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            count -= 1
+            total -= size
+        conn.executemany("DELETE FROM entries WHERE key = ?", doomed)
+
+    def stats(self) -> dict:
+        """
+        Returns hit/miss counters plus current entry count and stored bytes.
+        """
+        self.flush()
+        conn = self._connect()
+        counters = dict(conn.execute("SELECT name, value FROM counters").fetchall())
+        return {
+            "hits": counters.get("hits", 0),
+            "misses": counters.get("misses", 0),
+            "entries": counters.get("entries", 0),
+            "bytes": counters.get("bytes", 0),
+        }
+
+    def clear(self) -> None:
+        """
+        Removes all entries and resets the counters.
+        """
+        with self._pending_lock:
+            self._reset_pending()
+        conn = self._connect()
+        conn.execute("DELETE FROM entries")
+        conn.execute("UPDATE counters SET value = 0")
+
+
+_caches: dict[str, LLMCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache() -> Optional[LLMCache]:
+    """
+    Returns the process-wide cache configured by environment variables, or None
+    when caching is disabled or bypassed for the current context.
+
+    Environment:
+        SPECSENSE_LLM_CACHE: set to "off" (or 0/false/no) to disable caching.
+        SPECSENSE_LLM_CACHE_PATH: SQLite file location.
+        SPECSENSE_LLM_CACHE_TTL: entry lifetime in seconds.
+        SPECSENSE_LLM_CACHE_MAX_ENTRIES / SPECSENSE_LLM_CACHE_MAX_BYTES: eviction limits.
+    """
+    if _bypass.get():
+        return None
+    if os.getenv("SPECSENSE_LLM_CACHE", "on").strip().lower() in {
+        "off",
+        "0",
+        "false",
+        "no",
+    }:
+        return None
+
+    path = os.getenv("SPECSENSE_LLM_CACHE_PATH", DEFAULT_CACHE_PATH)
+    with _caches_lock:
+        cache = _caches.get(path)
+        if cache is None:
+            cache = LLMCache(
+                path,
+                ttl_seconds=float(
+                    os.getenv("SPECSENSE_LLM_CACHE_TTL", DEFAULT_TTL_SECONDS)
+                ),
+                max_entries=int(
+                    os.getenv("SPECSENSE_LLM_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)
+                ),
+                max_bytes=int(
+                    os.getenv("SPECSENSE_LLM_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES)
+                ),
+            )
+            _caches[path] = cache
+            # Write the last partial batch of counters when the process exits
+            atexit.register(_flush_quietly, cache)
+        return cache
+
+
+def _flush_quietly(cache: LLMCache) -> None:
+    try:
+        cache.flush()
+    except sqlite3.Error:
+        pass
+
+
+@contextmanager
+def bypass_cache() -> Iterator[None]:
+    """
+    Context manager that skips the cache (no reads, no writes) for LLM calls made
+    inside it, including calls awaited on the async engine from this context.
+    """
+    token = _bypass.set(True)
+    try:
+        yield
+    finally:
+        _bypass.reset(token)
@@ -0,0 +1,212 @@
+"""
+Process-wide registry of pooled OpenAI clients.
+
+Creating an `OpenAI` client per call also creates a fresh HTTP connection pool,
+so every request pays for a new TLS handshake. The registry below builds one
+client per (API key, base URL, event loop) and hands the same instance to every
+caller, so keep-alive connections are reused across sections and requests.
+Async clients are held per event loop in a weak mapping, so they go away with
+their loop; close_shared_clients() closes a loop's pools before it shuts down.
+"""
+
+import asyncio
+import importlib.util
+import os
+import threading
+import weakref
+from typing import Any, Optional
+
+from openai import AsyncOpenAI, OpenAI
+
+
+def _env_flag(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() not in {"0", "false", "no", "off", ""}
+
+
+def _default_settings() -> dict:
+    return {
+        # OPENAI_BASE_URL lets a local OpenAI-compatible server stand in for the API
+        "base_url": os.getenv("OPENAI_BASE_URL") or None,
+        "max_connections": int(os.getenv("SPECSENSE_HTTP_MAX_CONNECTIONS", "20")),
+        "max_keepalive_connections": int(
+            os.getenv("SPECSENSE_HTTP_MAX_KEEPALIVE", "10")
+        ),
+        "keepalive_expiry": float(os.getenv("SPECSENSE_HTTP_KEEPALIVE_EXPIRY", "30")),
+        # HTTP/2 needs the optional `h2` package (pip install httpx[http2])
+        "http2": _env_flag("SPECSENSE_HTTP2", False),
+        "timeout": float(os.getenv("SPECSENSE_HTTP_TIMEOUT", "60")),
+        # Optional callable(is_async) -> httpx transport, e.g. app.fake_llm
+        "transport_factory": None,
+    }
+
+
+_settings: dict = _default_settings()
+_clients: dict[tuple, Any] = {}
+# Event loop -> its async clients; entries vanish once the loop is collected
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[tuple, Any]]" = (
+    weakref.WeakKeyDictionary()
+)
+_lock = threading.Lock()
+# Close tasks scheduled on other loops, kept referenced until they finish
+_closing: set = set()
+
+
+def _drop_clients() -> tuple[list, list]:
+    # Called with _lock held; returns what was dropped so it can be closed outside the lock
+    sync_clients = list(_clients.values())
+    async_clients = [(loop, list(clients.values())) for loop, clients in _async_clients.items()]
+    _clients.clear()
+    _async_clients.clear()
+    return sync_clients, async_clients
+
+
+def _schedule_close(loop: asyncio.AbstractEventLoop, close) -> None:
+    task = loop.create_task(close())
+    _closing.add(task)
+    task.add_done_callback(_closing.discard)
+
+
+def _close_dropped(sync_clients: list, async_clients: list) -> None:
+    """
+    Closes dropped clients: sync ones at once, async ones on their own loop
+    when it is running. Clients of a loop that is idle cannot be closed from
+    here; run close_shared_clients() on that loop before reconfiguring.
+    """
+    for client in sync_clients:
+        close = getattr(client, "close", None)
+        if close is not None:
+            close()
+    for loop, clients in async_clients:
+        if loop.is_closed() or not loop.is_running():
+            continue
+        for client in clients:
+            close = getattr(client, "close", None)
+            if close is not None:
+                loop.call_soon_threadsafe(_schedule_close, loop, close)
+
+
+def configure_clients(**overrides) -> dict:
+    """
+    Updates the connection settings used for new clients and closes and drops
+    the cached ones (see _close_dropped() for async clients).
+
+    Accepted keys: base_url, max_connections, max_keepalive_connections,
+    keepalive_expiry, http2, timeout, transport_factory. Passing None for a key
+    restores its environment/default value.
+
+    Returns:
+        dict: The settings now in effect.
+    """
+    unknown = set(overrides) - set(_settings)
+    if unknown:
+        raise ValueError(f"Unknown client setting(s): {', '.join(sorted(unknown))}")
+
+    defaults = _default_settings()
+    with _lock:
+        for key, value in overrides.items():
+            _settings[key] = defaults[key] if value is None else value
+        dropped = _drop_clients()
+        settings = dict(_settings)
+    _close_dropped(*dropped)
+    return settings
+
+
+def reset_clients() -> None:
+    """
+    Closes and forgets every cached client and reloads settings from the environment.
+    """
+    global _settings
+    with _lock:
+        dropped = _drop_clients()
+        _settings = _default_settings()
+    _close_dropped(*dropped)
+
+
+def _http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+def _build_client(api_key: str, is_async: bool, settings: dict):
+    """
+    Builds an OpenAI client whose HTTP pool follows the configured limits.
+    """
+    import httpx
+
+    limits = httpx.Limits(
+        max_connections=settings["max_connections"],
+        max_keepalive_connections=settings["max_keepalive_connections"],
+        keepalive_expiry=settings["keepalive_expiry"],
+    )
+    # HTTP/2 needs the optional `h2` package; fall back to HTTP/1.1 without it
+    http2 = settings["http2"] and _http2_available()
+    timeout = settings["timeout"]
+    factory = settings["transport_factory"]
+    transport = factory(is_async) if factory else None
+
+    # Retries are handled by app.rate_limiter so backoff is shared across callers
+    if is_async:
+        return AsyncOpenAI(
+            api_key=api_key,
+            base_url=settings["base_url"],
+            max_retries=0,
+            http_client=httpx.AsyncClient(
+                limits=limits, http2=http2, timeout=timeout, transport=transport
+            ),
+        )
+    return OpenAI(
+        api_key=api_key,
+        base_url=settings["base_url"],
+        max_retries=0,
+        http_client=httpx.Client(
+            limits=limits, http2=http2, timeout=timeout, transport=transport
+        ),
+    )
+
+
+def _current_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def get_shared_client(api_key: str, is_async: bool = False):
+    """
+    Returns the pooled client for this API key, creating it on first use.
+
+    Async clients are additionally keyed by the running event loop, since an
+    httpx async pool cannot be shared between loops.
+    """
+    loop = _current_loop() if is_async else None
+    with _lock:
+        if loop is None:
+            clients = _clients
+        else:
+            clients = _async_clients.setdefault(loop, {})
+        key = (is_async, api_key, _settings["base_url"])
+        client = clients.get(key)
+        if client is None:
+            client = _build_client(api_key, is_async, dict(_settings))
+            clients[key] = client
+        return client
+
+
+async def close_shared_clients() -> None:
+    """
+    Closes the running event loop's async clients and their connection pools.
+
+    Call before the loop ends (e.g. at the end of the coroutine passed to
+    asyncio.run()), or before configure_clients() / reset_clients() when the
+    loop is not running (those can only close clients of a running loop);
+    later lookups on the same loop build fresh clients.
+    """
+    loop = asyncio.get_running_loop()
+    with _lock:
+        clients = _async_clients.pop(loop, {})
+    for client in clients.values():
+        close = getattr(client, "close", None)
+        if close is not None:
+            await close()
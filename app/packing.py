@@ -0,0 +1,137 @@
+"""
+Token-aware packing of section bodies into LLM requests.
+
+Short sections are bin-packed together so several of them share one system
+prompt and one request; sections too large for the model context are split
+into chunks that each fit. Token counts are estimates (see estimate_tokens()).
+"""
+
+from typing import Sequence
+
+# Sections at or below this estimate are candidates for sharing a request.
+PACKABLE_SECTION_TOKENS = 200
+
+# Input budget for one packed request (section bodies only, excluding the prompt).
+PACK_TOKEN_BUDGET = 1500
+
+# Largest section body sent in one request before it is split into chunks.
+MAX_SECTION_TOKENS = 3000
+
+# Chunks shorter than this (the analyzer's too-short cutoff) are merged into a
+# neighbouring chunk rather than sent, and skipped, on their own.
+MIN_CHUNK_CHARS = 20
+
+# Completion tokens reserved per packed section, and the cap for one request;
+# a pack never holds more sections than the cap leaves room for.
+PACK_COMPLETION_TOKENS = 400
+MAX_PACK_COMPLETION_TOKENS = 4000
+MAX_PACK_SECTIONS = MAX_PACK_COMPLETION_TOKENS // PACK_COMPLETION_TOKENS
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Cheap token estimate (~4 characters per token for English text), used for
+    request packing without pulling in a tokenizer.
+    """
+    return max(1, len(text) // 4)
+
+
+def pack_sections(
+    bodies: Sequence[str],
+    token_budget: int = PACK_TOKEN_BUDGET,
+    packable_tokens: int = PACKABLE_SECTION_TOKENS,
+    max_sections: int = MAX_PACK_SECTIONS,
+) -> list[list[int]]:
+    """
+    Groups section indexes into requests.
+
+    Sections estimated at or below `packable_tokens` are bin-packed (first-fit
+    decreasing) into groups of at most `max_sections` whose combined estimate
+    stays within `token_budget`. Larger sections get a group of their own.
+
+    Args:
+        bodies (Sequence[str]): Section body texts.
+        token_budget (int): Maximum estimated tokens per packed group.
+        packable_tokens (int): Size limit for a section to be packed with others.
+        max_sections (int): Maximum sections per group, so every section's
+            answer fits in the request's completion budget.
+
+    Returns:
+        list[list[int]]: Groups of indexes into `bodies`; every index appears
+        exactly once, and each group lists its indexes in ascending order.
+    """
+    sizes = [estimate_tokens(body) for body in bodies]
+    singles = [[i] for i, size in enumerate(sizes) if size > packable_tokens]
+    small = sorted(
+        (i for i, size in enumerate(sizes) if size <= packable_tokens),
+        key=lambda i: -sizes[i],
+    )
+
+    bins: list[list[int]] = []
+    loads: list[int] = []
+    for index in small:
+        for b, load in enumerate(loads):
+            if load + sizes[index] <= token_budget and len(bins[b]) < max_sections:
+                bins[b].append(index)
+                loads[b] += sizes[index]
+                break
+        else:
+            bins.append([index])
+            loads.append(sizes[index])
+
+    groups = [sorted(b) for b in bins] + singles
+    return sorted(groups, key=lambda group: group[0])
+
+
+def split_oversized(text: str, max_tokens: int = MAX_SECTION_TOKENS) -> list[str]:
+    """
+    Splits a section body into chunks that each fit within `max_tokens`.
+
+    Splits prefer paragraph breaks, then line breaks, and only cut inside a
+    line when a single line is itself too long. A chunk under MIN_CHUNK_CHARS
+    is merged into its neighbour, so it may exceed `max_tokens` by that much.
+
+    Args:
+        text (str): Section body text.
+        max_tokens (int): Maximum estimated tokens per chunk.
+
+    Returns:
+        list[str]: The chunks, in order. Text that already fits is returned as
+        a single chunk.
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return [text]
+
+    max_chars = max_tokens * 4
+    chunks: list[str] = []
+    current = ""
+
+    def flush():
+        nonlocal current
+        if current.strip():
+            chunks.append(current.strip())
+        current = ""
+
+    for paragraph in text.split("\n\n"):
+        # Each piece carries the separator that joined it to the previous one
+        lines = [paragraph] if len(paragraph) <= max_chars else paragraph.split("\n")
+        pieces = [("\n\n", lines[0])] + [("\n", line) for line in lines[1:]]
+        for separator, piece in pieces:
+            while len(piece) > max_chars:
+                flush()
+                chunks.append(piece[:max_chars])
+                piece = piece[max_chars:]
+            joiner = separator if current else ""
+            if len(current) + len(joiner) + len(piece) > max_chars:
+                flush()
+                joiner = ""
+            current += joiner + piece
+    flush()
+
+    merged: list[str] = []
+    for chunk in chunks:
+        if merged and (len(chunk) < MIN_CHUNK_CHARS or len(merged[-1]) < MIN_CHUNK_CHARS):
+            merged[-1] += "\n" + chunk
+        else:
+            merged.append(chunk)
+    return merged
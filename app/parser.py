@@ -4,19 +4,24 @@ Parser module for SpecSense.
 Public functions:
 - extract_sections(text): returns list of section titles
 - parse_sections_with_bodies(text): returns list of dicts {title, body}
+- iter_sections(source): streams the same dicts from text, a file or lines
+- parse_sections_parallel(text): same result, parsed in a process pool
+- parse_document(document): sections of an upload read by app.ingestion
 """
 
-import re
+from typing import Iterator
 
 from app.header_rules import (
     is_markdown_header,
     is_numbered_header,
     is_all_caps_header,
-    is_fallback_header,
-    extract_id_and_title,
-    is_toc_line,
-    is_isolated_all_caps_header,
+    classify_line,
+    TOC_LINE,
 )
+from app.requirement_ids import get_requirement_id_registry
+
+# TOC-style lines are only skipped within this many lines of the document start
+TOC_WINDOW_LINES = 40
 
 
 def extract_sections(text):
@@ -125,95 +130,240 @@ def parse_sections_with_bodies(text):
     Returns:
         List[dict]: A list of dictionaries with 'title' and 'body' keys.
     """
-    sections = []
+    return list(iter_sections(text))
+
+
+def _iter_lines(source) -> Iterator[str]:
+    """
+    Yields the lines of a string, text file object or iterable of strings,
+    split exactly as str.splitlines() would split the whole text.
+    """
+    if isinstance(source, str):
+        yield from source.splitlines()
+        return
+    for chunk in source:
+        # Newline characters other than \n/\r (e.g. form feeds) also end a line
+        yield from chunk.splitlines() or [""]
+
+
+def _skip_title_block(lines: Iterator[tuple]) -> Iterator[tuple]:
+    """
+    Streaming counterpart of strip_title_block() over (line, token) pairs.
+    """
+    for pair in lines:
+        if is_title_block_line(pair[0]) or not pair[0].strip():
+            continue
+        yield pair
+        break
+    yield from lines
+
+
+def _scan_sections(
+    lines: Iterator[tuple], start_index: int = 0, strip_title: bool = True
+) -> Iterator[tuple[dict, list, list]]:
+    """
+    Core section scanner shared by iter_sections(), parse_sections_parallel()
+    and app.sections.
+
+    Consumes (raw_line, token) pairs, where the token is any caller-defined
+    locator for the line (e.g. its offsets in the source), and yields
+    (header, body_lines, body_tokens) once per section, with the stripped body
+    lines and the tokens of those same lines.
+
+    `start_index` is the position of the first line within the whole document
+    (after the title block), which decides whether the TOC window still applies;
+    `strip_title` is False for chunks that do not start the document.
+    """
+    if strip_title:
+        lines = _skip_title_block(lines)
+    lines = iter(lines)
     current_section = None
     current_body = []
+    current_tokens = []
+
+    prev_raw = ""
+    pair = next(lines, None)
+    i = start_index
+    while pair is not None:
+        raw, token = pair
+        pair = next(lines, None)
+        line = raw.strip()
+
+        # Previous and next lines are only inspected to confirm ALL-CAPS isolation
+        kind, section_id, section_title = classify_line(
+            line,
+            prev_raw,
+            pair[0] if pair is not None else "",
+            allow_toc=i < TOC_WINDOW_LINES,
+        )
+        prev_raw = raw
+        i += 1
 
-    lines = text.splitlines()
-    lines = strip_title_block(lines)
-    for i, line in enumerate(lines):
-        line = line.strip()
-
-        if i < 40 and is_toc_line(line):
+        if kind == TOC_LINE:
             continue  # skip TOC-style line
 
-        # Look at previous and next lines to confirm isolation
-        prev_line = lines[i - 1].strip() if i > 0 else ""
-        next_line = lines[i + 1].strip() if i + 1 < len(lines) else ""
-
-        # Check for any valid section header
-        if is_markdown_header(line):
-            section_id, section_title = extract_id_and_title(line[2:].strip())
-        elif is_numbered_header(line) or is_isolated_all_caps_header(
-            line, prev_line, next_line
-        ):
-            section_id, section_title = extract_id_and_title(line.strip())
-        elif is_fallback_header(line):
-            section_id, section_title = None, line.strip()
-        else:
+        if kind is None:
             # ──────────────────────────────────────────────────────
             # Graceful fallback: if we haven't started a section yet
             # and this is the first meaningful line, create
             # "Unknown Header" so content isn't lost.
             # ──────────────────────────────────────────────────────
-            if current_section is None and line.strip():
+            if current_section is None and line:
                 current_section = {"id": None, "title": "Unknown Header"}
+            if current_section:
                 current_body.append(line)
-            elif current_section:
-                current_body.append(line)
+                current_tokens.append(token)
             continue
 
-        # Save previous section before starting a new one
-        if current_section or current_body:
-            section_body = "\n".join(current_body).strip()
-            sections.append(
-                {
-                    "id": current_section["id"] if current_section else None,
-                    "title": current_section["title"] if current_section else "",
-                    "body": section_body,
-                    "requirements": extract_requirement_statements(section_body),
-                }
-            )
+        # Emit the previous section before starting a new one
+        if current_section:
+            yield current_section, current_body, current_tokens
             current_body = []
+            current_tokens = []
 
         current_section = {"id": section_id, "title": section_title}
 
-    # Add the final section after loop ends
+    # Emit the final section after the input ends
     if current_section:
-        section_body = "\n".join(current_body).strip()
-        sections.append(
-            {
-                "id": current_section["id"],
-                "title": current_section["title"],
-                "body": section_body,
-                "requirements": extract_requirement_statements(section_body),
-            }
+        yield current_section, current_body, current_tokens
+
+
+def iter_sections(source) -> Iterator[dict]:
+    """
+    Streams sections from an SRS document, yielding each one as soon as the
+    next header closes it.
+
+    Lines are read one at a time with a single line of lookahead (for the
+    ALL-CAPS isolation rule), so only the section currently being built is held
+    in memory. Results are identical to parse_sections_with_bodies().
+
+    Args:
+        source (str | TextIO | Iterable[str]): Document text, a text-mode file
+            object, or any iterable of lines.
+
+    Yields:
+        dict: Sections with 'id', 'title', 'body' and 'requirements' keys.
+    """
+    pairs = ((line, None) for line in _iter_lines(source))
+    for section, body_lines, _ in _scan_sections(pairs):
+        yield _build_section(section, body_lines)
+
+
+def parse_document(document) -> list[dict]:
+    """
+    Parses the body text of an IngestedDocument (see app.ingestion), so the
+    upload read for the structure check is not read again for analysis.
+
+    Returns:
+        List[dict]: Same as parse_sections_with_bodies(document.text).
+    """
+    return list(iter_sections(document.text))
+
+
+def _build_section(header: dict, body_lines: list[str]) -> dict:
+    section_body = "\n".join(body_lines).strip()
+    return {
+        "id": header["id"],
+        "title": header["title"],
+        "body": section_body,
+        "requirements": extract_requirement_statements(section_body),
+    }
+
+
+def _chunk_boundaries(lines: list[str], target_lines: int) -> list[int]:
+    """
+    Picks indexes where `lines` can be cut without changing the parse.
+
+    A cut is safe at line k when line k-1 is blank and line k is a section
+    header outside the TOC window: the serial parser closes a section there no
+    matter what came before, and neither line's classification depends on the
+    other side of the cut. Every chunk after the first therefore starts with a
+    header, so no section straddles a boundary.
+    """
+    boundaries = [0]
+    k = max(target_lines, TOC_WINDOW_LINES)
+    last = len(lines) - 1
+    while k <= last:
+        if not lines[k - 1].strip():
+            kind = classify_line(
+                lines[k].strip(),
+                lines[k - 1],
+                lines[k + 1] if k < last else "",
+                allow_toc=False,
+            )[0]
+            if kind is not None:
+                boundaries.append(k)
+                k += target_lines
+                continue
+        k += 1
+    return boundaries
+
+
+def _parse_chunk(chunk: tuple[list[str], int]) -> list[dict]:
+    # Runs in a worker process; chunk lines are already past the title block
+    lines, start_index = chunk
+    pairs = ((line, None) for line in lines)
+    return [
+        _build_section(section, body_lines)
+        for section, body_lines, _ in _scan_sections(
+            pairs, start_index=start_index, strip_title=False
         )
+    ]
 
+
+def parse_sections_parallel(
+    text: str, workers: int | None = None, chunk_lines: int = 50_000
+) -> list[dict]:
+    """
+    Parses a large document on several processes.
+
+    The title block is stripped once, the remaining lines are cut at safe
+    boundaries (a blank line followed by a section header) roughly every
+    `chunk_lines` lines, and the chunks are parsed in a process pool. Output is
+    identical to parse_sections_with_bodies(text); documents that yield a
+    single chunk are parsed serially.
+
+    Args:
+        text (str): Raw SRS-style text input.
+        workers (int | None): Worker processes (defaults to the CPU count; with
+            one worker the document is parsed serially).
+        chunk_lines (int): Approximate number of lines per chunk.
+
+    Returns:
+        List[dict]: Sections in document order.
+    """
+    import os
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = workers or os.cpu_count() or 1
+    lines = strip_title_block(text.splitlines())
+    boundaries = _chunk_boundaries(lines, chunk_lines)
+    if len(boundaries) == 1 or workers == 1:
+        return _parse_chunk((lines, 0))
+
+    chunks = [
+        (lines[start:end], start)
+        for start, end in zip(boundaries, boundaries[1:] + [len(lines)])
+    ]
+    sections = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for chunk_sections in executor.map(_parse_chunk, chunks):
+            sections.extend(chunk_sections)
     return sections
 
 
 def extract_requirement_statements(text: str) -> list[dict]:
     """
-    Scans body text line-by-line and returns a list of
-    {'id': ..., 'text': ...} mappings for each line containing a requirement ID.
+    Scans body text and returns a list of {'id': ..., 'text': ...} mappings for
+    each line containing a requirement ID.
+
+    IDs are recognized by the patterns in app.requirement_ids; the whole body is
+    scanned in one pass and each match is mapped back to its line.
     """
     if not text:
         return []
 
-    patterns = [
-        r"\bREQ-\d+\b",  # REQ-001
-        r"\bID:\s*[A-Z0-9\-]{2,}\b",  # ID: ABC-45
+    return [
+        {"id": match.group().strip(), "text": text[start:end].strip()}
+        for start, end, match in get_requirement_id_registry().scan(text)
     ]
-
-    results = []
-    lines = text.splitlines()
-
-    for line in lines:
-        for pattern in patterns:
-            match = re.search(pattern, line)
-            if match:
-                results.append({"id": match.group().strip(), "text": line.strip()})
-                break  # Stop at first match per line
-
-    return results
@@ -0,0 +1,288 @@
+"""
+Client-side rate limiting and retry policy for LLM calls.
+
+Each model gets two token buckets — requests per minute (RPM) and tokens per
+minute (TPM) — shared by every thread and by the async engine. Calls reserve
+capacity before they are sent, so bursts from the concurrent engine are spread
+out instead of bouncing off provider 429s. Retryable failures are retried with
+exponential backoff and full jitter, honouring `Retry-After` when present.
+"""
+
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+from typing import Awaitable, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+DEFAULT_RPM = 500
+DEFAULT_TPM = 200_000
+DEFAULT_MAX_RETRIES = int(os.getenv("SPECSENSE_LLM_MAX_RETRIES", "5"))
+BACKOFF_BASE_SECONDS = 0.5
+BACKOFF_MAX_SECONDS = 30.0
+
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket that refills continuously at `rate` tokens/second.
+
+    reserve() takes capacity immediately (letting the balance go negative) and
+    returns how long the caller must wait, so concurrent callers queue up in the
+    order they asked instead of racing each other.
+    """
+
+    def __init__(
+        self,
+        capacity: float,
+        rate: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.capacity = capacity
+        self.rate = rate
+        self._clock = clock
+        self._tokens = capacity
+        self._last = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float = 1.0) -> float:
+        """
+        Reserves `amount` tokens and returns the seconds to wait before using them.
+        """
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._last) * self.rate
+            )
+            self._last = now
+            self._tokens -= amount
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+
+class ModelLimiter:
+    """
+    RPM + TPM buckets for one model, plus a pause window set by Retry-After.
+    """
+
+    def __init__(self, rpm: int, tpm: int, clock: Callable[[], float] = time.monotonic):
+        self.requests = TokenBucket(rpm, rpm / 60.0, clock)
+        self.tokens = TokenBucket(tpm, tpm / 60.0, clock)
+        self._clock = clock
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: int) -> float:
+        """
+        Reserves one request and `tokens` tokens; returns the seconds to wait.
+        """
+        wait = max(self.requests.reserve(1), self.tokens.reserve(tokens))
+        with self._lock:
+            pause = self._paused_until - self._clock()
+        return max(wait, pause, 0.0)
+
+    def pause(self, seconds: float) -> None:
+        """
+        Holds back every caller for this model for at least `seconds`.
+        """
+        with self._lock:
+            self._paused_until = max(self._paused_until, self._clock() + seconds)
+
+
+class RateLimiter:
+    """
+    Registry of per-model limiters with retry helpers and throttle metrics.
+
+    Limits come from `limits` ({model: {"rpm": int, "tpm": int}}), falling back to
+    DEFAULT_RPM / DEFAULT_TPM. The SPECSENSE_RATE_LIMITS environment variable can
+    hold the same mapping as JSON.
+    """
+
+    def __init__(
+        self,
+        limits: Optional[dict] = None,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        async_sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ):
+        self.limits = dict(limits or {})
+        self.max_retries = max_retries
+        self._clock = clock
+        self._sleep = sleep
+        self._async_sleep = async_sleep
+        self._models: dict[str, ModelLimiter] = {}
+        self._metrics: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def _limiter(self, model: str) -> ModelLimiter:
+        with self._lock:
+            limiter = self._models.get(model)
+            if limiter is None:
+                config = self.limits.get(model, {})
+                limiter = ModelLimiter(
+                    config.get("rpm", DEFAULT_RPM),
+                    config.get("tpm", DEFAULT_TPM),
+                    self._clock,
+                )
+                self._models[model] = limiter
+            return limiter
+
+    def _record(self, model: str, **increments: float) -> None:
+        with self._lock:
+            metrics = self._metrics.setdefault(
+                model,
+                {
+                    "requests": 0,
+                    "retries": 0,
+                    "rate_limited": 0,
+                    "throttle_wait_seconds": 0.0,
+                },
+            )
+            for name, value in increments.items():
+                metrics[name] += value
+
+    def metrics(self) -> dict:
+        """
+        Returns a snapshot of per-model counters: requests, retries,
+        rate_limited (429s seen) and throttle_wait_seconds (time spent waiting
+        on buckets, pauses and backoff).
+        """
+        with self._lock:
+            return {model: dict(values) for model, values in self._metrics.items()}
+
+    def acquire(self, model: str, tokens: int) -> float:
+        """
+        Blocks until one request of `tokens` tokens may be sent; returns the wait.
+        """
+        wait = self._limiter(model).reserve(tokens)
+        if wait > 0:
+            self._sleep(wait)
+        self._record(model, requests=1, throttle_wait_seconds=wait)
+        return wait
+
+    async def acquire_async(self, model: str, tokens: int) -> float:
+        """
+        Async counterpart of acquire(); yields to the event loop while waiting.
+        """
+        wait = self._limiter(model).reserve(tokens)
+        if wait > 0:
+            await self._async_sleep(wait)
+        self._record(model, requests=1, throttle_wait_seconds=wait)
+        return wait
+
+    def _backoff(self, model: str, attempt: int, error: Exception) -> float:
+        delay = retry_after_seconds(error)
+        if delay is None:
+            # Full jitter: uniform in [0, base * 2^attempt], capped
+            delay = random.uniform(
+                0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2**attempt)
+            )
+        if getattr(error, "status_code", None) == 429:
+            self._limiter(model).pause(delay)
+            self._record(model, rate_limited=1)
+        self._record(model, retries=1, throttle_wait_seconds=delay)
+        return delay
+
+    def call(self, model: str, tokens: int, fn: Callable[[], T]) -> T:
+        """
+        Calls `fn` under the model's limits, retrying retryable errors.
+
+        Non-retryable errors, and the last error once retries are exhausted,
+        propagate to the caller.
+        """
+        attempt = 0
+        while True:
+            self.acquire(model, tokens)
+            try:
+                return fn()
+            except Exception as e:
+                if attempt >= self.max_retries or not is_retryable(e):
+                    raise
+                self._sleep(self._backoff(model, attempt, e))
+                attempt += 1
+
+    async def call_async(
+        self, model: str, tokens: int, fn: Callable[[], Awaitable[T]]
+    ) -> T:
+        """
+        Async counterpart of call().
+        """
+        attempt = 0
+        while True:
+            await self.acquire_async(model, tokens)
+            try:
+                return await fn()
+            except Exception as e:
+                if attempt >= self.max_retries or not is_retryable(e):
+                    raise
+                await self._async_sleep(self._backoff(model, attempt, e))
+                attempt += 1
+
+
+def is_retryable(error: Exception) -> bool:
+    """
+    Returns True for transient failures: rate limits, timeouts, connection
+    errors and 5xx responses.
+    """
+    import openai
+
+    if isinstance(
+        error,
+        (
+            openai.RateLimitError,
+            openai.APITimeoutError,
+            openai.APIConnectionError,
+            openai.InternalServerError,
+        ),
+    ):
+        return True
+    return getattr(error, "status_code", None) in RETRYABLE_STATUS_CODES
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """
+    Reads the server's requested delay from `retry-after-ms` / `retry-after`
+    response headers, if the error carries a response.
+    """
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+    for name, scale in (("retry-after-ms", 0.001), ("retry-after", 1.0)):
+        value = headers.get(name)
+        if value is None:
+            continue
+        try:
+            return max(0.0, float(value) * scale)
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+_limiter: Optional[RateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """
+    Returns the process-wide rate limiter shared by all LLM entry points.
+    """
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = RateLimiter(json.loads(os.getenv("SPECSENSE_RATE_LIMITS", "{}")))
+        return _limiter
+
+
+def set_rate_limiter(limiter: Optional[RateLimiter]) -> None:
+    """
+    Replaces the shared limiter (None re-reads configuration on next use).
+    """
+    global _limiter
+    with _limiter_lock:
+        _limiter = limiter
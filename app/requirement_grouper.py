@@ -1,77 +1,63 @@
 """Requirement grouping logic for SpecSense based on keyword themes."""
 
-from typing import List, Dict
+from typing import List, Dict, Optional
 
+from app.taxonomy import get_taxonomy
 
-def get_requirement_categories() -> dict:
+
+def get_requirement_categories(taxonomy_path: Optional[str] = None) -> dict:
     """
     Returns a dictionary with requirement categories and their associated keywords.
     This is the single source of truth for both grouping and expected categories.
+
+    Args:
+        taxonomy_path (str | None): Taxonomy file to use instead of the default
+            ($SPECSENSE_TAXONOMY, else the built-in categories).
     """
-    return {
-        "Authentication": [
-            "login",
-            "authenticate",
-            "password",
-            "credentials",
-            "access",
-        ],
-        "Error Handling": ["fail", "error", "retry", "invalid", "exception"],
-        "Security": [
-            "encrypt",
-            "encryption",
-            "access control",
-            "confidentiality",
-            "authorization",
-        ],
-        "Data Handling": [
-            "save",
-            "load",
-            "store",
-            "record",
-            "retrieve",
-            "transmit",
-            "data",
-            "backup",
-        ],
-    }
+    categories = get_taxonomy(taxonomy_path).categories
+    return {category: list(keywords) for category, keywords in categories.items()}
 
 
-def group_requirements(requirements: List[Dict]) -> Dict[str, List[Dict]]:
+def group_requirements(
+    requirements: List[Dict],
+    word_boundary: bool = False,
+    stem: bool = False,
+    taxonomy_path: Optional[str] = None,
+) -> Dict[str, List[Dict]]:
     """
     Group requirements by scanning for keyword matches in the text.
     Requirements may be added to multiple groups if multiple keywords match.
 
+    Each taxonomy is compiled once into a KeywordMatcher, which tags each
+    requirement with all of its categories in a single pass over its text.
+
     Args:
         requirements (List[Dict]): List of requirement dictionaries.
+        word_boundary (bool): Only match whole words ("data" not in "metadata").
+        stem (bool): Match inflected forms ("encrypted" for "encryption").
+        taxonomy_path (str | None): Taxonomy file (see get_requirement_categories()).
 
     Returns:
         dict: Grouped requirements by category.
     """
-    categories = get_requirement_categories()  # Get both categories and their keywords
-    grouped: Dict[str, List[Dict]] = {category: [] for category in categories}
-
-    for req in requirements:
-        text = req.get("text", "").lower()
-        for category, keywords in categories.items():
-            if any(keyword in text for keyword in keywords):
-                grouped[category].append(req)
-
-    return grouped
+    matcher = get_taxonomy(taxonomy_path).matcher(word_boundary=word_boundary, stem=stem)
+    return matcher.group(requirements)
 
 
-def detect_gaps(grouped_requirements: dict) -> list:
+def detect_gaps(
+    grouped_requirements: dict, taxonomy_path: Optional[str] = None
+) -> list:
     """
     Detects missing requirement categories based on the grouped requirements.
 
     Args:
         grouped_requirements (dict): The current grouped requirements.
+        taxonomy_path (str | None): Taxonomy file (see get_requirement_categories()).
 
     Returns:
         list: A list of missing requirement categories.
     """
-    categories = get_requirement_categories()
-    expected = list(categories.keys())
+    expected = list(get_taxonomy(taxonomy_path).categories)
 
     return [
         cat
@@ -0,0 +1,201 @@
+"""
+Registry of requirement-ID patterns (e.g. `REQ-001`, `ID: NFR-7`).
+
+Patterns are tried in priority order: on each line, the first pattern that
+matches anywhere wins. The registry compiles all of them into one alternation,
+so a body is scanned with a single regex pass that jumps straight to lines
+containing an ID; the per-pattern priority rule is only re-checked on those
+lines.
+
+Extra patterns can be registered in code or through the
+SPECSENSE_REQUIREMENT_ID_PATTERNS environment variable (a JSON object of
+{name: regex}, appended after the defaults). Patterns are compiled with
+re.MULTILINE and must not use numbered backreferences.
+"""
+
+import json
+import os
+import re
+import threading
+from bisect import bisect_right
+from typing import Iterator, Optional
+
+DEFAULT_REQUIREMENT_ID_PATTERNS = [
+    ("req", r"\bREQ-\d+\b"),  # REQ-001
+    ("id_label", r"\bID:\s*[A-Z0-9\-]{2,}\b"),  # ID: ABC-45
+]
+
+# Line boundaries as understood by str.splitlines()
+_LINE_BREAK = re.compile(r"\r\n|[\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]")
+_OTHER_LINE_BREAK = re.compile(r"[\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]")
+
+
+def _literal_first(pattern: str) -> str:
+    """
+    Rewrites a leading `\\b` before a literal word character (as in `\\bREQ-`) into
+    an equivalent lookbehind placed after that character, so the pattern starts
+    with a literal the regex engine can scan for quickly.
+    """
+    if (
+        pattern.startswith(r"\b")
+        and len(pattern) > 2
+        and (pattern[2].isascii() and (pattern[2].isalnum() or pattern[2] == "_"))
+        and pattern[3:4] not in ("*", "+", "?", "{")
+    ):
+        char = pattern[2]
+        return f"(?:{char}(?<!\\w{char}){pattern[3:]})"
+    return f"(?:{pattern})"
+
+
+class RequirementIdRegistry:
+    """
+    Ordered, named requirement-ID patterns with a cached combined matcher.
+    """
+
+    def __init__(self, patterns: Optional[list[tuple[str, str]]] = None):
+        self._patterns: list[tuple[str, str]] = []
+        self._lock = threading.Lock()
+        self._compiled: Optional[tuple[re.Pattern, list[re.Pattern]]] = None
+        for name, pattern in (
+            DEFAULT_REQUIREMENT_ID_PATTERNS if patterns is None else patterns
+        ):
+            self.register(name, pattern)
+
+    @property
+    def patterns(self) -> list[tuple[str, str]]:
+        """
+        The registered (name, regex) pairs, highest priority first.
+        """
+        return list(self._patterns)
+
+    def register(self, name: str, pattern: str, index: Optional[int] = None) -> None:
+        """
+        Adds a pattern at `index` in the priority order (default: last).
+
+        Raises:
+            ValueError: If the name is already registered or the regex is invalid.
+        """
+        try:
+            # Validated as it will be embedded in the combined alternation
+            re.compile(f"(?:{_literal_first(pattern)})|x", re.MULTILINE)
+        except re.error as e:
+            raise ValueError(f"Invalid requirement ID pattern {name!r}: {e}") from e
+        with self._lock:
+            if any(existing == name for existing, _ in self._patterns):
+                raise ValueError(f"Requirement ID pattern already registered: {name}")
+            position = len(self._patterns) if index is None else index
+            self._patterns.insert(position, (name, pattern))
+            self._compiled = None
+
+    def unregister(self, name: str) -> None:
+        """
+        Removes a pattern by name (KeyError if it is not registered).
+        """
+        with self._lock:
+            remaining = [(n, p) for n, p in self._patterns if n != name]
+            if len(remaining) == len(self._patterns):
+                raise KeyError(name)
+            self._patterns = remaining
+            self._compiled = None
+
+    def _matchers(self) -> tuple[re.Pattern, list[re.Pattern]]:
+        with self._lock:
+            if self._compiled is None:
+                singles = [re.compile(p, re.MULTILINE) for _, p in self._patterns]
+                # No capturing groups around the branches: that keeps the regex
+                # engine's first-character scan, which makes the pass fast
+                combined = re.compile(
+                    "|".join(_literal_first(p) for _, p in self._patterns) or r"(?!)",
+                    re.MULTILINE,
+                )
+                self._compiled = (combined, singles)
+            return self._compiled
+
+    def search_line(
+        self, text: str, pos: int = 0, endpos: Optional[int] = None
+    ) -> Optional[re.Match]:
+        """
+        Returns the requirement ID match for one line (text[pos:endpos]):
+        the leftmost match of the highest-priority pattern that matches, or None.
+        """
+        _, singles = self._matchers()
+        endpos = len(text) if endpos is None else endpos
+        for single in singles:
+            match = single.search(text, pos, endpos)
+            if match is not None:
+                return match
+        return None
+
+    def scan(
+        self, text: str, pos: int = 0, endpos: Optional[int] = None
+    ) -> Iterator[tuple[int, int, re.Match]]:
+        """
+        Finds the requirement ID on every line of text[pos:endpos].
+
+        Yields:
+            tuple: (line_start, line_end, match) for each line holding an ID, in
+            order; line_end excludes the line break.
+        """
+        combined, _ = self._matchers()
+        endpos = len(text) if endpos is None else endpos
+        match = combined.search(text, pos, endpos)
+        if match is None:
+            return
+
+        if _OTHER_LINE_BREAK.search(text, pos, endpos) is None:
+            # Only "\n" separators (e.g. parser bodies): locate lines with find/rfind
+            def bounds(index: int) -> tuple[int, int, int]:
+                start = text.rfind("\n", pos, index) + 1 or pos
+                end = text.find("\n", index, endpos)
+                return (start, endpos, endpos) if end < 0 else (start, end, end + 1)
+
+        else:
+            starts, ends = [pos], []
+            for brk in _LINE_BREAK.finditer(text, pos, endpos):
+                ends.append(brk.start())
+                starts.append(brk.end())
+            ends.append(endpos)
+            starts.append(endpos)
+
+            def bounds(index: int) -> tuple[int, int, int]:
+                line = bisect_right(starts, index, hi=len(ends)) - 1
+                return starts[line], ends[line], starts[line + 1]
+
+        while match is not None:
+            # The combined match only locates a candidate line; the priority
+            # rule (and matches that ran past the line end) are settled per line
+            line_start, line_end, next_start = bounds(match.start())
+            found = self.search_line(text, line_start, line_end)
+            if found is not None:
+                yield line_start, line_end, found
+            if next_start >= endpos:
+                break
+            match = combined.search(text, next_start, endpos)
+
+
+_registry: Optional[RequirementIdRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_requirement_id_registry() -> RequirementIdRegistry:
+    """
+    Returns the process-wide registry used by the parser.
+    """
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            registry = RequirementIdRegistry()
+            extra = json.loads(os.getenv("SPECSENSE_REQUIREMENT_ID_PATTERNS", "{}"))
+            for name, pattern in extra.items():
+                registry.register(name, pattern)
+            _registry = registry
+        return _registry
+
+
+def set_requirement_id_registry(registry: Optional[RequirementIdRegistry]) -> None:
+    """
+    Replaces the shared registry (None re-reads configuration on next use).
+    """
+    global _registry
+    with _registry_lock:
+        _registry = registry
@@ -0,0 +1,215 @@
+"""
+Compact, zero-copy section representation for large documents.
+
+parse_sections_with_bodies() returns plain dicts whose bodies and requirement
+lines are fresh string copies of the input. parse_sections_compact() parses the
+same document into Section / Requirement objects that only hold offsets into
+the original text; bodies and requirement text are sliced out on access.
+
+Both classes are mappings with the same keys as the dicts, so existing callers
+(build_traceability_index, the Flask templates, `section["title"]`,
+`section.get("requirements", [])`) keep working unchanged.
+"""
+
+from collections.abc import Mapping, MutableMapping
+from typing import Iterator, Optional
+
+from app.parser import _scan_sections
+from app.requirement_ids import get_requirement_id_registry
+
+# Characters str.splitlines() treats as line boundaries ("\r\n" counts as one)
+_LINE_BREAKS = "\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029"
+
+_SECTION_FIELDS = ("id", "title", "body", "requirements")
+_REQUIREMENT_FIELDS = ("id", "text")
+
+
+class Requirement(Mapping):
+    """
+    A requirement line, stored as offsets into the source text.
+
+    Behaves like the {"id": ..., "text": ...} dicts produced by
+    extract_requirement_statements().
+    """
+
+    __slots__ = ("_source", "_start", "_end", "_id_start", "_id_end")
+
+    def __init__(self, source: str, start: int, end: int, id_start: int, id_end: int):
+        self._source = source
+        self._start = start
+        self._end = end
+        self._id_start = id_start
+        self._id_end = id_end
+
+    @property
+    def id(self) -> str:
+        return self._source[self._id_start : self._id_end].strip()
+
+    @property
+    def text(self) -> str:
+        return self._source[self._start : self._end].strip()
+
+    def __getitem__(self, key):
+        if key in _REQUIREMENT_FIELDS:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(_REQUIREMENT_FIELDS)
+
+    def __len__(self) -> int:
+        return len(_REQUIREMENT_FIELDS)
+
+    def __repr__(self) -> str:
+        return f"Requirement(id={self.id!r}, text={self.text!r})"
+
+    def to_dict(self) -> dict:
+        return {"id": self.id, "text": self.text}
+
+
+class Section(MutableMapping):
+    """
+    A parsed section whose body is a tuple of line ranges in the source text.
+
+    `body` is rebuilt from the source on every access and `requirements` are
+    located on first access, so a section costs a few integers until its text
+    is actually needed. Extra keys (e.g. "analysis") can be assigned like on a
+    dict; assigning "body" or "requirements" replaces the lazy value.
+    """
+
+    __slots__ = ("_source", "_spans", "id", "title", "_body", "_requirements", "_extra")
+
+    def __init__(
+        self,
+        source: str,
+        spans: tuple[tuple[int, int], ...],
+        id: Optional[str],
+        title: str,
+    ):
+        self._source = source
+        self._spans = spans
+        self.id = id
+        self.title = title
+        self._body: Optional[str] = None
+        self._requirements: Optional[list] = None
+        self._extra: Optional[dict] = None
+
+    def _lines(self) -> Iterator[tuple[int, int]]:
+        # (start, end) offsets of each body line, excluding its line break
+        source = self._source
+        for start, end in self._spans:
+            pos = start
+            for line in source[start:end].splitlines(keepends=True):
+                stop = pos + len(line)
+                yield pos, stop - (len(line) - len(line.rstrip(_LINE_BREAKS)))
+                pos = stop
+
+    @property
+    def body(self) -> str:
+        if self._body is not None:
+            return self._body
+        source = self._source
+        return "\n".join(
+            source[start:end].strip() for start, end in self._lines()
+        ).strip()
+
+    @property
+    def requirements(self) -> list:
+        if self._requirements is None:
+            source = self._source
+            registry = get_requirement_id_registry()
+            self._requirements = [
+                Requirement(source, line_start, line_end, match.start(), match.end())
+                for start, stop in self._spans
+                for line_start, line_end, match in registry.scan(source, start, stop)
+            ]
+        return self._requirements
+
+    def __getitem__(self, key):
+        if key in _SECTION_FIELDS:
+            return getattr(self, key)
+        if self._extra is None:
+            raise KeyError(key)
+        return self._extra[key]
+
+    def __setitem__(self, key, value) -> None:
+        if key == "body":
+            self._body = value
+        elif key == "requirements":
+            self._requirements = value
+        elif key in _SECTION_FIELDS:
+            setattr(self, key, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key) -> None:
+        if key in _SECTION_FIELDS:
+            raise KeyError(f"{key!r} cannot be removed from a Section")
+        if self._extra is None:
+            raise KeyError(key)
+        del self._extra[key]
+
+    def __iter__(self):
+        yield from _SECTION_FIELDS
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        return len(_SECTION_FIELDS) + len(self._extra or ())
+
+    def __repr__(self) -> str:
+        return f"Section(id={self.id!r}, title={self.title!r})"
+
+    def to_dict(self) -> dict:
+        """
+        Materializes the section as the plain dict parse_sections_with_bodies()
+        would return (plus any extra keys), e.g. for JSON serialization.
+        """
+        data = dict(self)
+        data["requirements"] = [
+            r.to_dict() if isinstance(r, Requirement) else r
+            for r in data["requirements"]
+        ]
+        return data
+
+
+def _iter_line_offsets(text: str) -> Iterator[tuple[str, tuple[int, int]]]:
+    # Yields (line, (start, next_start)) for every line of `text`
+    pos = 0
+    for chunk in text.splitlines(keepends=True):
+        stop = pos + len(chunk)
+        yield chunk.rstrip(_LINE_BREAKS), (pos, stop)
+        pos = stop
+
+
+def _merge_spans(tokens: list[tuple[int, int]]) -> tuple[tuple[int, int], ...]:
+    # Collapses consecutive body lines (line breaks included) into one range
+    spans: list[list[int]] = []
+    for start, stop in tokens:
+        if spans and spans[-1][1] == start:
+            spans[-1][1] = stop
+        else:
+            spans.append([start, stop])
+    return tuple((start, stop) for start, stop in spans)
+
+
+def parse_sections_compact(text: str) -> list[Section]:
+    """
+    Parses an SRS document into offset-backed Section objects.
+
+    Section boundaries, ids, titles, bodies and requirements are identical to
+    parse_sections_with_bodies(text); only the representation differs.
+
+    Args:
+        text (str): Raw SRS-style text. It is kept (not copied) as the shared
+            buffer every section and requirement points into.
+
+    Returns:
+        list[Section]: Dict-compatible sections in document order.
+    """
+    return [
+        Section(text, _merge_spans(tokens), header["id"], header["title"])
+        for header, _, tokens in _scan_sections(_iter_line_offsets(text))
+    ]
@@ -1,3 +1,24 @@
+"""
+Standard TOC templates that documents are checked against.
+
+Each template has an id, a display name and its section list. Templates are
+kept in a registry: built-in outlines for IEEE 830 and ISO/IEC/IEEE 29148,
+SpecSense's own default outline (STANDARD_TOC), and any internal templates
+registered in code or listed in the JSON file named by SPECSENSE_TOC_TEMPLATES
+({id: {"name": ..., "sections": [...]}}).
+
+select_toc_template() picks the template that best fits a document's TOC in
+one pass over its entries, through an index of normalized titles shared by
+all templates.
+"""
+
+import json
+import os
+import threading
+from typing import NamedTuple, Optional
+
+from app.toc_matcher import TocIndex, normalize_toc_entry
+
 STANDARD_TOC = [
     "1. Introduction",
     "1.1 Purpose",
@@ -10,3 +31,196 @@ STANDARD_TOC = [
     "6. Other Requirements",
     "7. Appendices",
 ]
+
+IEEE_830_TOC = [
+    "1. Introduction",
+    "1.1 Purpose",
+    "1.2 Scope",
+    "1.3 Definitions, Acronyms, and Abbreviations",
+    "1.4 References",
+    "1.5 Overview",
+    "2. Overall Description",
+    "2.1 Product Perspective",
+    "2.2 Product Functions",
+    "2.3 User Characteristics",
+    "2.4 Constraints",
+    "2.5 Assumptions and Dependencies",
+    "3. Specific Requirements",
+    "3.1 External Interfaces",
+    "3.2 Functions",
+    "3.3 Performance Requirements",
+    "3.4 Logical Database Requirements",
+    "3.5 Design Constraints",
+    "3.6 Software System Attributes",
+    "Appendixes",
+    "Index",
+]
+
+ISO_29148_TOC = [
+    "1. Introduction",
+    "1.1 Purpose",
+    "1.2 Scope",
+    "1.3 Product Perspective",
+    "1.4 Product Functions",
+    "1.5 User Characteristics",
+    "1.6 Limitations",
+    "1.7 Definitions",
+    "2. References",
+    "3. Requirements",
+    "3.1 Functions",
+    "3.2 Performance Requirements",
+    "3.3 Usability Requirements",
+    "3.4 Interface Requirements",
+    "3.5 Logical Database Requirements",
+    "3.6 Design Constraints",
+    "3.7 Software System Attributes",
+    "3.8 Supporting Information",
+    "4. Verification",
+    "5. Appendices",
+    "5.1 Assumptions and Dependencies",
+    "5.2 Acronyms and Abbreviations",
+]
+
+DEFAULT_TEMPLATE_ID = "specsense"
+
+
+class TocTemplate(NamedTuple):
+    """
+    A registered standard TOC.
+    """
+
+    id: str
+    name: str
+    sections: tuple[str, ...]
+
+    @property
+    def toc_index(self) -> TocIndex:
+        """
+        Normalized lookup index over the sections, built once at registration
+        and kept by the registry (built on demand for unregistered templates).
+        """
+        return _indexes.get(self) or TocIndex(list(self.sections))
+
+
+_templates: dict[str, TocTemplate] = {}
+# Each registered template's index, for as long as it stays registered
+_indexes: dict[TocTemplate, TocIndex] = {}
+# Normalized title -> ids of the templates containing it, for select_toc_template()
+_title_index: dict[tuple[str, ...], set[str]] = {}
+_env_loaded = False
+_lock = threading.Lock()
+
+
+def _rebuild_title_index() -> None:
+    _title_index.clear()
+    for template in _templates.values():
+        for entry in template.toc_index.entries:
+            _title_index.setdefault(entry.tokens, set()).add(template.id)
+
+
+def register_toc_template(
+    template_id: str, name: str, sections: list[str], replace: bool = False
+) -> TocTemplate:
+    """
+    Adds a template to the registry and precomputes its lookup index.
+
+    Raises:
+        ValueError: If the id is taken (unless `replace`) or there are no sections.
+    """
+    if not sections:
+        raise ValueError(f"TOC template {template_id!r} has no sections")
+    template = TocTemplate(template_id, name, tuple(sections))
+    # Built up front, outside request handling
+    index = TocIndex(list(template.sections))
+    with _lock:
+        if template_id in _templates and not replace:
+            raise ValueError(f"TOC template already registered: {template_id}")
+        previous = _templates.get(template_id)
+        if previous is not None:
+            _indexes.pop(previous, None)
+        _templates[template_id] = template
+        _indexes[template] = index
+        _rebuild_title_index()
+    return template
+
+
+def _load_env_templates() -> None:
+    global _env_loaded
+    if _env_loaded:
+        return
+    _env_loaded = True
+    path = os.getenv("SPECSENSE_TOC_TEMPLATES")
+    if path:
+        with open(path, encoding="utf-8") as f:
+            for template_id, spec in json.load(f).items():
+                register_toc_template(
+                    template_id,
+                    spec.get("name", template_id),
+                    spec["sections"],
+                    replace=True,
+                )
+
+
+def list_toc_templates() -> list[TocTemplate]:
+    """
+    Returns every registered template, in registration order.
+    """
+    _load_env_templates()
+    return list(_templates.values())
+
+
+def get_toc_template(template_id: Optional[str] = None) -> TocTemplate:
+    """
+    Returns a template by id (default: DEFAULT_TEMPLATE_ID).
+
+    Raises:
+        KeyError: If no template has that id.
+    """
+    _load_env_templates()
+    template_id = template_id or DEFAULT_TEMPLATE_ID
+    if template_id not in _templates:
+        raise KeyError(f"Unknown TOC template: {template_id}")
+    return _templates[template_id]
+
+
+def score_toc_templates(toc_lines: list[str]) -> dict[str, float]:
+    """
+    Scores how well each template fits a document TOC: the F1 of the
+    document entries and template sections sharing a normalized title.
+    """
+    _load_env_templates()
+    hits = dict.fromkeys(_templates, 0)
+    seen: set[tuple[str, ...]] = set()
+    for line in toc_lines:
+        tokens = normalize_toc_entry(line).tokens
+        if tokens in seen:
+            continue
+        seen.add(tokens)
+        for template_id in _title_index.get(tokens, ()):
+            hits[template_id] += 1
+
+    scores = {}
+    for template_id, template in _templates.items():
+        matched = hits[template_id]
+        precision = matched / len(toc_lines) if toc_lines else 0.0
+        recall = matched / len(template.sections)
+        total = precision + recall
+        scores[template_id] = round(2 * precision * recall / total, 3) if total else 0.0
+    return scores
+
+
+def select_toc_template(toc_lines: list[str]) -> TocTemplate:
+    """
+    Returns the best-fitting template for a document TOC (the default
+    template when nothing matches or on ties with it).
+    """
+    scores = score_toc_templates(toc_lines)
+    best = max(
+        scores, key=lambda template_id: (scores[template_id], template_id == DEFAULT_TEMPLATE_ID)
+    )
+    return get_toc_template(best if scores[best] > 0 else None)
+
+
+register_toc_template(DEFAULT_TEMPLATE_ID, "SpecSense default", STANDARD_TOC)
+register_toc_template("ieee-830", "IEEE 830-1998 SRS", IEEE_830_TOC)
+register_toc_template("iso-29148", "ISO/IEC/IEEE 29148:2018 SRS", ISO_29148_TOC)
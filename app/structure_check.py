@@ -1,28 +1,43 @@
-from app.toc_extractor import extract_toc_lines_from_text, extract_toc_lines_from_docx
-from app.standard_toc import STANDARD_TOC
+from app.ingestion import ingest_upload
+from app.standard_toc import get_toc_template, select_toc_template
 from app.toc_comparator import compare_toc
-from app.header_rules import clean_toc_line
 
 
-def run_structure_check(uploaded_file, is_docx: bool, use_llm=False) -> dict:
+def run_structure_check(
+    uploaded_file, is_docx: bool, use_llm=False, template_id=None
+) -> dict:
     """
     Orchestrates structure conformance check.
 
     Args:
-        file_text (str): Text content of the uploaded file.
+        uploaded_file: The uploaded file, or an IngestedDocument already
+            read from it (see app.ingestion).
         is_docx (bool): True if source is .docx, False if .txt.
+        use_llm (bool): Run the fuzzy comparison, asking the LLM about unresolved sections.
+        template_id (str | None): Standard TOC template to check against
+            (see app.standard_toc); "auto" picks the best-fitting one, None the default.
 
     Returns:
-        dict: Comparison result from compare_toc()
+        dict: Comparison result from compare_toc(), plus "template" (the id used)
     """
-    if is_docx:
-        raw_toc_lines = extract_toc_lines_from_docx(uploaded_file)
-        toc_lines = [clean_toc_line(line) for line in raw_toc_lines]
-    else:
-        text = uploaded_file.read().decode("utf-8")
-        toc_lines = extract_toc_lines_from_text(text)
+    document = ingest_upload(uploaded_file, is_docx=is_docx)
+    if document is None:
+        raise ValueError("No uploaded file to check.")
+    toc_lines = list(document.toc_lines)
 
-    return compare_toc(actual=toc_lines, expected=STANDARD_TOC, use_llm=use_llm)
+    if template_id == "auto":
+        template = select_toc_template(toc_lines)
+    else:
+        template = get_toc_template(template_id)
+
+    result = compare_toc(
+        actual=toc_lines,
+        expected=list(template.sections),
+        use_llm=use_llm,
+        index=template.toc_index,
+    )
+    result["template"] = template.id
+    return result
 
 
 def compare_toc_to_parsed_sections(
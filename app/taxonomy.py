@@ -0,0 +1,210 @@
+"""
+Requirement category taxonomies: the built-in default or per-project files.
+
+A taxonomy file maps category names to keyword lists, in JSON, TOML or YAML
+(YAML needs PyYAML). The mapping can sit at the top level or under a
+"categories" key, next to an optional "name":
+
+    name = "Payments"
+
+    [categories]
+    Authentication = ["login", "password", "2fa"]
+    Compliance = ["pci", "audit trail"]
+
+get_taxonomy() loads a file once, precompiles its keyword matcher, and
+re-checks the file's modification time on every call, so an edited taxonomy
+is picked up by running Flask / Streamlit processes without a restart. The
+SPECSENSE_TAXONOMY environment variable selects the file used by default.
+"""
+
+import json
+import os
+import sys
+import threading
+import warnings
+from typing import Optional
+
+from app.keyword_matcher import KeywordMatcher
+
+DEFAULT_CATEGORIES: dict[str, list[str]] = {
+    "Authentication": [
+        "login",
+        "authenticate",
+        "password",
+        "credentials",
+        "access",
+    ],
+    "Error Handling": ["fail", "error", "retry", "invalid", "exception"],
+    "Security": [
+        "encrypt",
+        "encryption",
+        "access control",
+        "confidentiality",
+        "authorization",
+    ],
+    "Data Handling": [
+        "save",
+        "load",
+        "store",
+        "record",
+        "retrieve",
+        "transmit",
+        "data",
+        "backup",
+    ],
+}
+
+
+class Taxonomy:
+    """
+    A named set of categories with lazily compiled, per-mode keyword matchers
+    (the default substring matcher is compiled up front).
+
+    Args:
+        categories (dict[str, list[str]]): Category name -> keywords.
+        name (str): Display name.
+        path (str | None): File the taxonomy was loaded from.
+        mtime_ns (int | None): Modification time of that file when loaded.
+    """
+
+    def __init__(
+        self,
+        categories: dict[str, list[str]],
+        name: str = "default",
+        path: Optional[str] = None,
+        mtime_ns: Optional[int] = None,
+    ):
+        self.categories = {c: list(words) for c, words in categories.items()}
+        self.name = name
+        self.path = path
+        self.mtime_ns = mtime_ns
+        self._matchers: dict[tuple[bool, bool], KeywordMatcher] = {}
+        self._lock = threading.Lock()
+        self.matcher()
+
+    def matcher(self, word_boundary: bool = False, stem: bool = False) -> KeywordMatcher:
+        """
+        Returns the compiled matcher for this taxonomy and matching mode.
+        """
+        key = (word_boundary, stem)
+        with self._lock:
+            if key not in self._matchers:
+                self._matchers[key] = KeywordMatcher(
+                    self.categories, word_boundary=word_boundary, stem=stem
+                )
+            return self._matchers[key]
+
+    def __repr__(self) -> str:
+        return f"Taxonomy(name={self.name!r}, categories={list(self.categories)!r})"
+
+
+def _read_mapping(path: str) -> dict:
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".json":
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    if extension == ".toml":
+        if sys.version_info >= (3, 11):
+            import tomllib
+        else:
+            import tomli as tomllib
+        with open(path, "rb") as f:
+            return tomllib.load(f)
+    if extension in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError as e:
+            raise ValueError("PyYAML is required to load YAML taxonomies") from e
+        with open(path, encoding="utf-8") as f:
+            return yaml.safe_load(f) or {}
+    raise ValueError(f"Unsupported taxonomy format: {path}")
+
+
+def load_taxonomy(path: str) -> Taxonomy:
+    """
+    Reads and validates a taxonomy file (no caching; see get_taxonomy()).
+
+    Raises:
+        ValueError: If the file cannot be parsed or is not a mapping of
+            category names to lists of keyword strings.
+    """
+    mtime_ns = os.stat(path).st_mtime_ns
+    try:
+        data = _read_mapping(path)
+    except Exception as e:
+        raise ValueError(f"Could not load taxonomy {path}: {e}") from e
+
+    if not isinstance(data, dict):
+        raise ValueError(f"Taxonomy {path} must be a mapping of categories")
+    if "categories" in data:
+        categories = data["categories"]
+    else:
+        categories = {k: v for k, v in data.items() if k != "name"}
+    if not isinstance(categories, dict) or not categories:
+        raise ValueError(f"Taxonomy {path} defines no categories")
+    for category, keywords in categories.items():
+        if not isinstance(keywords, list) or not all(
+            isinstance(k, str) and k.strip() for k in keywords
+        ):
+            raise ValueError(
+                f"Taxonomy {path}: keywords for {category!r} must be a list of strings"
+            )
+    name = data.get("name") if isinstance(data.get("name"), str) else None
+    return Taxonomy(
+        {str(c): k for c, k in categories.items()},
+        name=name or os.path.splitext(os.path.basename(path))[0],
+        path=path,
+        mtime_ns=mtime_ns,
+    )
+
+
+_default: Optional[Taxonomy] = None
+_loaded: dict[str, Taxonomy] = {}
+_cache_lock = threading.Lock()
+
+
+def get_taxonomy(path: Optional[str] = None) -> Taxonomy:
+    """
+    Returns the taxonomy for `path` (default: $SPECSENSE_TAXONOMY, else the
+    built-in categories), reloading the file if it changed since last use.
+
+    If a changed file fails to load (e.g. it is mid-edit), the previously
+    loaded version is kept and a warning is issued; a file that never loaded
+    raises ValueError.
+    """
+    global _default
+    path = path or os.getenv("SPECSENSE_TAXONOMY") or None
+    with _cache_lock:
+        if path is None:
+            if _default is None:
+                _default = Taxonomy(DEFAULT_CATEGORIES)
+            return _default
+
+        key = os.path.abspath(path)
+        cached = _loaded.get(key)
+        try:
+            mtime_ns = os.stat(key).st_mtime_ns
+        except OSError:
+            if cached is None:
+                raise ValueError(f"Taxonomy file not found: {path}")
+            return cached
+        if cached is not None and cached.mtime_ns == mtime_ns:
+            return cached
+        try:
+            taxonomy = load_taxonomy(key)
+        except ValueError as e:
+            if cached is None:
+                raise
+            warnings.warn(f"Keeping previous taxonomy: {e}")
+            cached.mtime_ns = mtime_ns  # retry once the file changes again
+            return cached
+        _loaded[key] = taxonomy
+        return taxonomy
+
+
+def clear_taxonomy_cache() -> None:
+    """
+    Forgets every loaded taxonomy file.
+    """
+    with _cache_lock:
+        _loaded.clear()
@@ -0,0 +1,190 @@
+"""
+Incrementally decoded text ingestion.
+
+Text is decoded chunk by chunk from a byte view of its source instead of
+reading the whole file into bytes and decoding it in one go:
+
+- files on disk are memory-mapped, so their bytes are paged in by the OS
+  rather than copied into Python;
+- in-memory uploads (Streamlit's UploadedFile, BytesIO) are viewed through
+  their buffer without copying;
+- other streams (e.g. a Flask upload) are spooled to a temporary file, which
+  stays in memory when small and is memory-mapped once it rolls to disk.
+
+The encoding comes from a byte order mark when there is one, else UTF-8 when
+the leading bytes are valid UTF-8, else charset-normalizer's best guess
+(Windows-1252 on ties); bytes that do not decode are replaced rather than
+failing the upload.
+iter_text_file() yields lines that app.parser.iter_sections() consumes
+directly, so large exports are parsed without ever holding the whole text.
+"""
+
+import codecs
+import mmap
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from typing import Iterator, Optional, Union
+
+from charset_normalizer import from_bytes
+
+# Bytes decoded per step
+CHUNK_SIZE = 1 << 20
+# Leading bytes examined to detect the encoding
+SNIFF_BYTES = 64 * 1024
+# Uploads larger than this are spooled to disk rather than kept in memory
+SPOOL_MAX_MEMORY = 8 << 20
+
+# Preferred among equally good charset-normalizer guesses
+_WESTERN_FALLBACK = "cp1252"
+
+ByteSource = Union[bytes, bytearray, memoryview, mmap.mmap]
+
+# UTF-32 marks first: the UTF-32-LE mark starts with the UTF-16-LE one
+_BOMS = (
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+
+def detect_encoding(sample: bytes) -> str:
+    """
+    Picks the encoding of a text from its leading bytes.
+
+    Returns:
+        str: A codec name (e.g. "utf-8", "cp1252"); BOM-aware codecs
+        ("utf-8-sig", "utf-16", "utf-32") when a byte order mark is present,
+        so the mark is not decoded as text.
+    """
+    for bom, encoding in _BOMS:
+        if sample.startswith(bom):
+            return encoding
+    try:
+        # final=False: the sample may end inside a multi-byte character
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+        return "utf-8"
+    except UnicodeDecodeError:
+        pass
+    results = from_bytes(sample)
+    best = results.best()
+    if best is None:
+        return "utf-8"
+    # Short Western samples often fit several code pages equally well; ties go
+    # to Windows-1252, the usual encoding of exports from Western Windows tools
+    for match in results:
+        if match.encoding == _WESTERN_FALLBACK and match.chaos <= best.chaos:
+            return _WESTERN_FALLBACK
+    return best.encoding
+
+
+def iter_text_chunks(
+    data: ByteSource, encoding: Optional[str] = None, chunk_size: int = CHUNK_SIZE
+) -> Iterator[str]:
+    """
+    Decodes a byte view chunk by chunk.
+
+    Args:
+        data (bytes | memoryview | mmap): The encoded text.
+        encoding (str | None): Codec to use (detected with detect_encoding() if None).
+        chunk_size (int): Bytes decoded per step.
+
+    Yields:
+        str: Decoded text chunks; undecodable bytes become U+FFFD.
+    """
+    with memoryview(data) as view:
+        encoding = encoding or detect_encoding(bytes(view[:SNIFF_BYTES]))
+        decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        for start in range(0, len(view), chunk_size):
+            text = decoder.decode(view[start : start + chunk_size])
+            if text:
+                yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def iter_text_lines(chunks: Iterator[str]) -> Iterator[str]:
+    """
+    Regroups text chunks into lines (line endings kept), splitting exactly
+    where str.splitlines() would split the joined text.
+    """
+    pending = ""
+    for chunk in chunks:
+        lines = (pending + chunk).splitlines(keepends=True)
+        # The last piece may continue in the next chunk (or be half of a "\r\n")
+        pending = lines.pop() if lines else ""
+        yield from lines
+    if pending:
+        yield pending
+
+
+def decode_text(data: ByteSource, encoding: Optional[str] = None) -> str:
+    """
+    Decodes a whole byte view, detecting its encoding if not given.
+    """
+    return "".join(iter_text_chunks(data, encoding))
+
+
+@contextmanager
+def byte_view(source) -> Iterator[ByteSource]:
+    """
+    Gives read access to the bytes of a file path, an in-memory upload or a
+    binary stream without loading them into a bytes object where avoidable.
+
+    Args:
+        source (str | os.PathLike | BinaryIO): Path or binary file object.
+
+    Yields:
+        bytes | memoryview | mmap: Valid until the context exits.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                yield b""
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                yield mapped
+        return
+
+    if hasattr(source, "getbuffer"):
+        # BytesIO and Streamlit uploads: view the existing buffer in place
+        with source.getbuffer() as view:
+            yield view
+        return
+
+    if hasattr(source, "seek"):
+        source.seek(0)
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY) as spool:
+        shutil.copyfileobj(source, spool, CHUNK_SIZE)
+        if hasattr(source, "seek"):
+            source.seek(0)
+        if spool.tell() > SPOOL_MAX_MEMORY:
+            spool.flush()
+            with mmap.mmap(spool.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                yield mapped
+        else:
+            spool.seek(0)
+            yield spool.read()
+
+
+def read_text(source, encoding: Optional[str] = None) -> str:
+    """
+    Reads and decodes a text file or upload (see byte_view() and detect_encoding()).
+    """
+    with byte_view(source) as data:
+        return decode_text(data, encoding)
+
+
+def iter_text_file(source, encoding: Optional[str] = None) -> Iterator[str]:
+    """
+    Streams the lines of a text file or upload, decoding as it goes.
+
+    Example:
+        sections = iter_sections(iter_text_file("export.txt"))
+    """
+    with byte_view(source) as data:
+        yield from iter_text_lines(iter_text_chunks(data, encoding))
@@ -0,0 +1,136 @@
+"""
+Order-aware alignment of a document's TOC against a standard TOC.
+
+Entries are paired through a hash of their normalized titles (numbering,
+dot leaders and case ignored), so pairing is linear. The longest run of pairs
+that keeps the standard's order is the longest increasing subsequence of
+their standard positions, found in O(n log n). The alignment is equivalent to
+an LCS over the normalized titles, without the quadratic table. Pairs outside
+that run are reported as moved; when several runs are equally long, entries
+later in the document are the ones kept in order.
+"""
+
+from bisect import bisect_left
+from typing import Callable, Hashable, Optional
+
+from app.toc_matcher import FUZZY_MATCH_THRESHOLD, TocIndex, fuzzy_match_toc, normalize_toc_entry
+
+
+def toc_title_key(line: str) -> tuple[str, ...]:
+    """
+    Default alignment key: the normalized title words, ignoring numbering.
+    """
+    return normalize_toc_entry(line).tokens
+
+
+def _longest_increasing(values: list[int]) -> set[int]:
+    # Positions (into `values`) of one longest strictly increasing subsequence
+    tails: list[int] = []
+    tail_positions: list[int] = []
+    parents = [-1] * len(values)
+    for position, value in enumerate(values):
+        slot = bisect_left(tails, value)
+        if slot == len(tails):
+            tails.append(value)
+            tail_positions.append(position)
+        else:
+            tails[slot] = value
+            tail_positions[slot] = position
+        parents[position] = tail_positions[slot - 1] if slot else -1
+    chain = set()
+    position = tail_positions[-1] if tail_positions else -1
+    while position >= 0:
+        chain.add(position)
+        position = parents[position]
+    return chain
+
+
+def align_toc(
+    actual: list[str],
+    expected: list[str],
+    key: Optional[Callable[[str], Hashable]] = None,
+    fuzzy: bool = False,
+) -> dict:
+    """
+    Aligns a document TOC with a standard TOC, taking order into account.
+
+    Args:
+        actual (list[str]): TOC lines from the document, in document order.
+        expected (list[str]): Standard TOC sections, in standard order.
+        key (callable | None): Maps a line to its comparison key
+            (default: toc_title_key, i.e. normalized title words).
+        fuzzy (bool): Also pair entries left over after exact pairing when
+            fuzzy_match_toc() finds them similar (score >= FUZZY_MATCH_THRESHOLD).
+
+    Returns:
+        dict with lists of dicts (positions are 0-based list indexes):
+            - matched: {"section", "line", "expected_position", "actual_position"}
+              for pairs that appear in standard order
+            - moved: same shape, for pairs found out of order
+            - missing: {"section", "expected_position"}
+            - extra: {"line", "actual_position"}
+    """
+    key = key or toc_title_key
+
+    # Hashed lookup; repeated keys pair up in order of appearance
+    positions: dict[Hashable, list[int]] = {}
+    for index in range(len(expected) - 1, -1, -1):
+        positions.setdefault(key(expected[index]), []).append(index)
+    pairs = []  # (actual_position, expected_position), by actual position
+    for index, line in enumerate(actual):
+        queue = positions.get(key(line))
+        if queue:
+            pairs.append((index, queue.pop()))
+
+    if fuzzy:
+        paired_actual = {a for a, _ in pairs}
+        paired_expected = {e for _, e in pairs}
+        rest_actual = [i for i in range(len(actual)) if i not in paired_actual]
+        rest_expected = [i for i in range(len(expected)) if i not in paired_expected]
+        if rest_actual and rest_expected:
+            rest = [expected[i] for i in rest_expected]
+            # The unpaired subset differs per document: index it without caching
+            result = fuzzy_match_toc(
+                [actual[i] for i in rest_actual], rest, index=TocIndex(rest)
+            )
+            line_to_actual: dict[str, list[int]] = {}
+            for i in rest_actual:
+                line_to_actual.setdefault(actual[i], []).append(i)
+            section_to_expected: dict[str, list[int]] = {}
+            for i in rest_expected:
+                section_to_expected.setdefault(expected[i], []).append(i)
+            for item in result["matched"] + result["fuzzy_matched"]:
+                if item["score"] >= FUZZY_MATCH_THRESHOLD:
+                    pairs.append(
+                        (
+                            line_to_actual[item["match"]].pop(0),
+                            section_to_expected[item["section"]].pop(0),
+                        )
+                    )
+            pairs.sort()
+
+    in_order = _longest_increasing([e for _, e in pairs])
+    alignment: dict[str, list] = {"matched": [], "moved": [], "missing": [], "extra": []}
+    for position, (actual_index, expected_index) in enumerate(pairs):
+        alignment["matched" if position in in_order else "moved"].append(
+            {
+                "section": expected[expected_index],
+                "line": actual[actual_index],
+                "expected_position": expected_index,
+                "actual_position": actual_index,
+            }
+        )
+
+    paired_expected = {e for _, e in pairs}
+    paired_actual = {a for a, _ in pairs}
+    alignment["missing"] = [
+        {"section": section, "expected_position": index}
+        for index, section in enumerate(expected)
+        if index not in paired_expected
+    ]
+    alignment["extra"] = [
+        {"line": line, "actual_position": index}
+        for index, line in enumerate(actual)
+        if index not in paired_actual
+    ]
+    return alignment
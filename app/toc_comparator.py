@@ -1,30 +1,68 @@
-def compare_toc(actual: list[str], expected: list[str], use_llm: bool = False) -> dict:
+from typing import Optional
+
+from app.toc_alignment import align_toc
+from app.toc_matcher import TocIndex, fuzzy_match_toc
+
+
+def compare_toc(
+    actual: list[str],
+    expected: list[str],
+    use_llm: bool = False,
+    fuzzy: bool = False,
+    index: Optional[TocIndex] = None,
+) -> dict:
     """
     Compares an actual TOC list against a standard expected list.
 
+    With `fuzzy` (implied by `use_llm`), the local fuzzy matcher classifies
+    each standard section as matched / fuzzy matched / missing with scores.
+    The LLM is then only consulted for the sections it leaves unresolved.
+    `index` is a prebuilt TocIndex over `expected` (e.g. a template's).
+
     Returns:
         dict with keys:
             - matched: list[str]
             - missing: list[str] (expected but not in actual)
             - extra: list[str] (in actual but not in expected)
+            - moved: list[str] (matched, but out of the standard's order)
+        or, in fuzzy mode, {"strict_comparison": <that dict>,
+        "fuzzy_comparison": fuzzy_match_toc() result, "alignment":
+        align_toc(fuzzy=True) result} plus
+        "llm_fuzzy_comparison" (Markdown) when the LLM was consulted.
     """
-    matched = [item for item in actual if item in expected]
-    missing = [item for item in expected if item not in actual]
-    extra = [item for item in actual if item not in expected]
+    expected_set = set(expected)
+    actual_set = set(actual)
+    matched = [item for item in actual if item in expected_set]
+    missing = [item for item in expected if item not in actual_set]
+    extra = [item for item in actual if item not in expected_set]
+    alignment = align_toc(actual, expected, key=str)
 
     result = {
         "matched": matched,
         "missing": missing,
         "extra": extra,
+        "moved": [item["line"] for item in alignment["moved"]],
     }
 
-    if use_llm:
-        from app.llm import compare_toc_sections_with_llm
-
-        llm_result = compare_toc_sections_with_llm(expected, actual)
-        return {
+    if use_llm or fuzzy:
+        fuzzy_result = fuzzy_match_toc(actual, expected, index=index)
+        comparison: dict = {
             "strict_comparison": result,
-            "llm_fuzzy_comparison": llm_result,
+            "fuzzy_comparison": fuzzy_result,
+            "alignment": align_toc(actual, expected, fuzzy=True),
         }
+        if use_llm and fuzzy_result["unresolved"]:
+            from app.llm import compare_toc_sections_with_llm
+
+            # Only the borderline sections and the document lines not yet
+            # paired with a standard section are sent
+            unresolved = [item["section"] for item in fuzzy_result["unresolved"]]
+            candidates = [
+                item["match"] for item in fuzzy_result["unresolved"]
+            ] + fuzzy_result["extra"]
+            comparison["llm_fuzzy_comparison"] = compare_toc_sections_with_llm(
+                unresolved, candidates
+            )
+        return comparison
 
     return result
@@ -1,5 +1,5 @@
-from app.header_rules import is_toc_line, clean_toc_line, is_docx_toc_paragraph
-from docx import Document
+from app.header_rules import is_toc_line, clean_toc_line, is_toc_style
+from app.docx_stream import iter_docx_paragraphs
 
 
 def extract_toc_lines_from_text(text: str) -> list[str]:
@@ -32,24 +32,33 @@ def extract_toc_lines_from_docx(docx_file) -> list[str]:
     Extracts TOC-style lines from a .docx file.
     Uses paragraph styles (preferred), but falls back to text pattern detection
     for documents where TOC styles are not preserved.
+    Paragraphs are streamed from the file (see app.docx_stream) rather than
+    loaded into python-docx's document model.
+    """
+    return extract_toc_lines_from_paragraphs(iter_docx_paragraphs(docx_file))
+
+
+def extract_toc_lines_from_paragraphs(paragraphs) -> list[str]:
+    """
+    Extracts TOC-style lines from (text, style name) pairs of .docx paragraphs,
+    as extract_toc_lines_from_docx() does for an opened document.
     """
-    doc = Document(docx_file)
     toc_lines = []
     toc_started = False
 
-    for para in doc.paragraphs:
-        text = para.text.strip()
+    for text, style in paragraphs:
+        text = text.strip()
         if not text:
             continue
 
         # Start collecting once we hit a TOC-style paragraph
         if not toc_started:
-            if is_docx_toc_paragraph(para) or is_toc_line(text):
+            if is_toc_style(style) or is_toc_line(text):
                 toc_started = True
                 toc_lines.append(text)
             continue
 
-        if is_docx_toc_paragraph(para) or is_toc_line(text):
+        if is_toc_style(style) or is_toc_line(text):
             toc_lines.append(text)
 
     return toc_lines
@@ -0,0 +1,315 @@
+"""
+Local fuzzy matching of a document's TOC against a standard TOC.
+
+Each entry is normalized (section number split off, dot leaders and page
+numbers removed, lowercased word tokens without stopwords), then scored
+against candidates from a character-trigram index with a token-level edit
+distance in which two words count as close when they are close in spelling
+("Pupose" / "Purpose") or one abbreviates the other ("Intro" / "Introduction"),
+or by how much of one title the other contains. Standard sections are
+classified the way the LLM prompt in compare_toc_sections_with_llm() asks
+for — Matched, Fuzzy Matched or Missing — plus an Unresolved band of
+borderline scores that is worth a second opinion.
+"""
+
+import re
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+from app.header_rules import clean_toc_line
+
+# Scores at or above this are Fuzzy Matched
+FUZZY_MATCH_THRESHOLD = 0.8
+# Scores in [REVIEW_THRESHOLD, FUZZY_MATCH_THRESHOLD) are Unresolved, lower is Missing
+REVIEW_THRESHOLD = 0.5
+# Multiplier applied when titles agree but both entries carry different numbers
+NUMBERING_PENALTY = 0.95
+# Candidates scored per document entry, taken from the trigram index
+MAX_CANDIDATES = 8
+
+_NUMBER = re.compile(r"\s*(\d+(?:\.\d+)*)[.)]?\s+")
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+# Similarity below which two words are treated as unrelated
+_WORD_SIMILARITY_FLOOR = 0.6
+# Similarity credited when one word abbreviates the other: a prefix ("intro")
+# or an in-order subset of its letters with the same first letter ("refs")
+_PREFIX_SIMILARITY = 0.75
+_SUBSEQUENCE_SIMILARITY = 0.7
+# Weight of the word-containment score ("Definitions" in "Definitions and Acronyms")
+_CONTAINMENT_WEIGHT = 0.85
+_STOPWORDS = frozenset({"a", "an", "and", "for", "in", "of", "on", "the", "to"})
+
+
+class TocEntry(NamedTuple):
+    """
+    A normalized TOC line: `number` is e.g. "1.2" (or None), `tokens` the
+    lowercased title words, `key` the canonical "number title" string.
+    """
+
+    text: str
+    number: Optional[str]
+    tokens: tuple[str, ...]
+    key: str
+
+
+def normalize_toc_entry(line: str) -> TocEntry:
+    """
+    Normalizes a TOC line or section title for comparison.
+
+    Example:
+        '1.2. Pupose ....... 3' → TocEntry(number='1.2', tokens=('pupose',), ...)
+    """
+    cleaned = clean_toc_line(line)
+    match = _NUMBER.match(cleaned + " ")
+    number = None
+    if match:
+        number = match.group(1)
+        cleaned = cleaned[match.end() :] if match.end() <= len(cleaned) else ""
+    tokens = tuple(t for t in _TOKEN.findall(cleaned.lower()) if t not in _STOPWORDS)
+    title = " ".join(tokens)
+    return TocEntry(line, number, tokens, f"{number} {title}" if number else title)
+
+
+@lru_cache(maxsize=65536)
+def word_similarity(a: str, b: str) -> float:
+    """
+    Similarity of two words in [0, 1]: 1 - Levenshtein distance / longer length,
+    with abbreviations of at least 3 letters scored as close.
+    """
+    if a == b:
+        return 1.0
+    if len(a) > len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(
+                min(
+                    previous[j] + 1,
+                    current[j - 1] + 1,
+                    previous[j - 1] + (char_a != char_b),
+                )
+            )
+        previous = current
+    similarity = 1.0 - previous[-1] / len(b)
+    if len(a) >= 3 and a[0] == b[0]:
+        if b.startswith(a):
+            return max(similarity, _PREFIX_SIMILARITY)
+        remaining = iter(b)
+        if all(char in remaining for char in a):
+            return max(similarity, _SUBSEQUENCE_SIMILARITY)
+    return similarity
+
+
+def _word_match(a: str, b: str) -> float:
+    similarity = word_similarity(a, b)
+    return similarity if similarity >= _WORD_SIMILARITY_FLOOR else 0.0
+
+
+def title_similarity(a: tuple[str, ...], b: tuple[str, ...]) -> float:
+    """
+    Similarity of two titles in [0, 1]: the better of
+
+    - a token-level edit similarity, where inserting or deleting a word costs
+      1 and substituting costs 1 - word_similarity() (1 for unrelated words);
+    - a containment score, the share of the shorter title's words found in the
+      longer one (in any order), weighted by 0.85.
+    """
+    if a == b:
+        return 1.0
+    if not a or not b:
+        return 0.0
+    shorter, longer = (a, b) if len(a) <= len(b) else (b, a)
+    containment = _CONTAINMENT_WEIGHT * sum(
+        max(_word_match(word, other) for other in longer) for word in shorter
+    ) / len(shorter)
+    previous = [float(j) for j in range(len(b) + 1)]
+    for i, word_a in enumerate(a, 1):
+        current = [float(i)]
+        for j, word_b in enumerate(b, 1):
+            cost = 1.0 - _word_match(word_a, word_b)
+            current.append(
+                min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            )
+        previous = current
+    return max(containment, 1.0 - previous[-1] / max(len(a), len(b)))
+
+
+def entry_similarity(a: TocEntry, b: TocEntry) -> float:
+    """
+    Title similarity, reduced by NUMBERING_PENALTY when both entries are
+    numbered differently.
+    """
+    score = title_similarity(a.tokens, b.tokens)
+    if a.number and b.number and a.number != b.number:
+        score *= NUMBERING_PENALTY
+    return score
+
+
+def _trigrams(entry: TocEntry) -> set[str]:
+    text = f" {' '.join(entry.tokens)} "
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+class TocIndex:
+    """
+    Normalized lookup structures over a standard TOC, built once and reused
+    for every document checked against it: exact keys, exact titles and a
+    character-trigram inverted index for candidate retrieval.
+    """
+
+    def __init__(self, sections: list[str]):
+        self.sections = list(sections)
+        self.entries = [normalize_toc_entry(s) for s in self.sections]
+        self.by_key: dict[str, list[int]] = {}
+        self.by_title: dict[tuple[str, ...], list[int]] = {}
+        self.by_trigram: dict[str, list[int]] = {}
+        for index, entry in enumerate(self.entries):
+            self.by_key.setdefault(entry.key, []).append(index)
+            self.by_title.setdefault(entry.tokens, []).append(index)
+            for gram in _trigrams(entry):
+                self.by_trigram.setdefault(gram, []).append(index)
+
+    def candidates(self, entry: TocEntry, limit: int = MAX_CANDIDATES) -> list[int]:
+        """
+        Indexes of the standard sections sharing the most trigrams with `entry`.
+        """
+        shared: dict[int, int] = {}
+        for gram in _trigrams(entry):
+            for index in self.by_trigram.get(gram, ()):
+                shared[index] = shared.get(index, 0) + 1
+        for index in self.by_title.get(entry.tokens, ()):
+            shared[index] = shared.get(index, 0) + len(entry.key) + 3
+        ranked = sorted(shared, key=lambda i: (-shared[i], i))
+        return ranked[:limit]
+
+
+@lru_cache(maxsize=32)
+def get_toc_index(sections: tuple[str, ...]) -> TocIndex:
+    """
+    Returns a cached TocIndex for a standard TOC. Registered templates keep
+    their own index (TocTemplate.toc_index), and per-document subsets should
+    build an uncached TocIndex, so neither competes for these slots.
+    """
+    return TocIndex(list(sections))
+
+
+def fuzzy_match_toc(
+    actual: list[str],
+    expected: list[str],
+    match_threshold: float = FUZZY_MATCH_THRESHOLD,
+    review_threshold: float = REVIEW_THRESHOLD,
+    index: Optional[TocIndex] = None,
+) -> dict:
+    """
+    Classifies each expected (standard) section against the document's TOC.
+
+    Every document entry is paired with at most one standard section: exact
+    matches are taken first, then candidate pairs in order of decreasing score.
+
+    Args:
+        actual (list[str]): TOC lines from the document.
+        expected (list[str]): Standard TOC sections.
+        match_threshold (float): Minimum score for Fuzzy Matched.
+        review_threshold (float): Minimum score for Unresolved (else Missing).
+        index (TocIndex | None): Prebuilt index over `expected` (default:
+            get_toc_index()).
+
+    Returns:
+        dict with keys, each a list of {"section", "match", "score"} dicts in
+        standard order ("match" is the paired document line, or the closest
+        candidate / None for missing sections):
+            - matched: identical after normalization (score 1.0)
+            - fuzzy_matched: score >= match_threshold
+            - unresolved: review_threshold <= score < match_threshold
+            - missing: everything else
+        and "extra": document lines not paired with any standard section.
+    """
+    index = index or get_toc_index(tuple(expected))
+    entries = [normalize_toc_entry(line) for line in actual]
+
+    exact: dict[int, int] = {}
+    used: set[int] = set()
+    for doc_index, entry in enumerate(entries):
+        for std_index in index.by_key.get(entry.key, ()):
+            if std_index not in exact:
+                exact[std_index] = doc_index
+                used.add(doc_index)
+                break
+
+    pairs = []
+    for doc_index, entry in enumerate(entries):
+        if doc_index in used:
+            continue
+        for std_index in index.candidates(entry):
+            if std_index not in exact:
+                score = entry_similarity(index.entries[std_index], entry)
+                if score > 0:
+                    pairs.append((score, std_index, doc_index))
+    pairs.sort(key=lambda p: (-p[0], p[1], p[2]))
+
+    best: dict[int, tuple[float, int]] = {}
+    assigned: dict[int, tuple[float, int]] = {}
+    for score, std_index, doc_index in pairs:
+        best.setdefault(std_index, (score, doc_index))
+        if std_index not in assigned and doc_index not in used and score >= review_threshold:
+            assigned[std_index] = (score, doc_index)
+            used.add(doc_index)
+
+    result: dict[str, list] = {
+        "matched": [],
+        "fuzzy_matched": [],
+        "unresolved": [],
+        "missing": [],
+    }
+    for std_index, section in enumerate(index.sections):
+        if std_index in exact:
+            result["matched"].append(
+                {"section": section, "match": actual[exact[std_index]], "score": 1.0}
+            )
+            continue
+        score, doc_index = assigned.get(std_index) or best.get(std_index, (0.0, -1))
+        item = {
+            "section": section,
+            "match": actual[doc_index] if doc_index >= 0 else None,
+            "score": round(score, 3),
+        }
+        if std_index in assigned and score >= match_threshold:
+            result["fuzzy_matched"].append(item)
+        elif std_index in assigned:
+            result["unresolved"].append(item)
+        else:
+            result["missing"].append(item)
+    result["extra"] = [line for i, line in enumerate(actual) if i not in used]
+    return result
+
+
+def format_fuzzy_toc_result(result: dict) -> str:
+    """
+    Renders a fuzzy_match_toc() result in the Markdown layout the LLM
+    comparison uses.
+    """
+
+    def block(title: str, items: list[str]) -> list[str]:
+        return [f"{title}:", *(items or ["- None"]), ""]
+
+    lines = block("Matched Sections", [f"- {i['section']}" for i in result["matched"]])
+    lines += block(
+        "Fuzzy Matched Sections",
+        [
+            f"- {i['section']} (Fuzzy match to: '{i['match']}', score {i['score']:.2f})"
+            for i in result["fuzzy_matched"]
+        ],
+    )
+    if result["unresolved"]:
+        lines += block(
+            "Unresolved Sections",
+            [
+                f"- {i['section']} (Closest: '{i['match']}', score {i['score']:.2f})"
+                for i in result["unresolved"]
+            ],
+        )
+    lines += block("Missing Sections", [f"- {i['section']}" for i in result["missing"]])
+    return "\n".join(lines).strip()
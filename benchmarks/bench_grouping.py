@@ -0,0 +1,140 @@
+"""
+Measures keyword grouping speed on synthetic requirements.
+
+Compares the compiled KeywordMatcher behind group_requirements() with the
+original per-keyword substring scan, on the default taxonomy and on a large
+generated one, and checks both produce identical groups. Also times corpus
+statistics (category and per-section counts, co-occurrence, gaps) computed
+with Python loops over grouped requirements against CategoryMatrix.
+
+Example:
+    python benchmarks/bench_grouping.py --requirements 100000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.category_matrix import CategoryMatrix  # noqa: E402
+from app.keyword_matcher import KeywordMatcher  # noqa: E402
+from app.requirement_grouper import detect_gaps, group_requirements  # noqa: E402
+from app.requirement_grouper import get_requirement_categories  # noqa: E402
+
+WORDS = (
+    "the system shall must allow users operator report export within seconds "
+    "after before each every account session request response interface module "
+    "invalid login password data record backup encryption access control error "
+    "retry store retrieve metadata transmit confidentiality audit display"
+).split()
+
+
+def synthetic_requirements(count: int, seed: int = 42) -> list[dict]:
+    rng = random.Random(seed)
+    return [
+        {
+            "id": f"REQ-{n}",
+            "section": f"Section {n // 50}",
+            "text": " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 20)))
+            + ".",
+        }
+        for n in range(count)
+    ]
+
+
+def large_taxonomy(categories: int, keywords: int, seed: int = 7) -> dict:
+    rng = random.Random(seed)
+    taxonomy = get_requirement_categories()
+    for c in range(categories):
+        taxonomy[f"Category {c}"] = [
+            "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(4, 9)))
+            for _ in range(keywords)
+        ]
+    return taxonomy
+
+
+def substring_group(requirements: list[dict], taxonomy: dict) -> dict:
+    # The original group_requirements() loop
+    grouped: dict = {category: [] for category in taxonomy}
+    for req in requirements:
+        text = req.get("text", "").lower()
+        for category, keywords in taxonomy.items():
+            if any(keyword in text for keyword in keywords):
+                grouped[category].append(req)
+    return grouped
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def report(label: str, requirements: list[dict], taxonomy: dict) -> None:
+    count = len(requirements)
+    keywords = sum(len(words) for words in taxonomy.values())
+    build_time, matcher = timed(KeywordMatcher, taxonomy)
+    legacy_time, legacy = timed(substring_group, requirements, taxonomy)
+    compiled_time, compiled = timed(matcher.group, requirements)
+    print(f"{label} ({len(taxonomy)} categories, {keywords} keywords)")
+    print(f"  matcher build:       {build_time * 1000:.1f} ms")
+    print(f"  substring scan:      {count / legacy_time:,.0f} reqs/s")
+    print(f"  KeywordMatcher:      {count / compiled_time:,.0f} reqs/s")
+    print(f"  speedup:             {legacy_time / compiled_time:.2f}x")
+    print(f"  identical groups:    {legacy == compiled}")
+
+
+def loop_statistics(requirements: list[dict]) -> tuple:
+    # Statistics as a caller would assemble them from group_requirements()
+    grouped = group_requirements(requirements)
+    categories = list(grouped)
+    counts = {c: len(reqs) for c, reqs in grouped.items()}
+    members = {c: {id(r) for r in reqs} for c, reqs in grouped.items()}
+    co = [[len(members[a] & members[b]) for b in categories] for a in categories]
+    sections: dict = {}
+    for category, reqs in grouped.items():
+        for req in reqs:
+            row = sections.setdefault(req["section"], dict.fromkeys(categories, 0))
+            row[category] += 1
+    return counts, co, sections, detect_gaps(grouped)
+
+
+def matrix_statistics(matrix: CategoryMatrix) -> tuple:
+    return (
+        matrix.category_counts(),
+        matrix.co_occurrence().tolist(),
+        matrix.section_counts(),
+        matrix.gaps(),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requirements", type=int, default=100_000)
+    args = parser.parse_args()
+
+    requirements = synthetic_requirements(args.requirements)
+    print(f"requirements:          {len(requirements)}")
+    report("default taxonomy", requirements, get_requirement_categories())
+    report("large taxonomy", requirements, large_taxonomy(40, 25))
+
+    taxonomy = get_requirement_categories()
+    for label, options in (("word_boundary", {"word_boundary": True}), ("stem", {"stem": True})):
+        matcher = KeywordMatcher(taxonomy, **options)
+        elapsed, _ = timed(matcher.group, requirements)
+        print(f"{label + ' mode:':<22} {len(requirements) / elapsed:,.0f} reqs/s")
+
+    loop_time, loop = timed(loop_statistics, requirements)
+    build_time, category_matrix = timed(CategoryMatrix, requirements)
+    matrix_time, matrix = timed(matrix_statistics, category_matrix)
+    print("corpus statistics (counts, co-occurrence, per-section counts, gaps)")
+    print(f"  Python loops:        {loop_time:.3f} s")
+    print(f"  CategoryMatrix:      {build_time:.3f} s build + {matrix_time:.3f} s stats")
+    print(f"  identical counts:    {loop[0] == matrix[0] and loop[1] == matrix[1]}")
+
+
+if __name__ == "__main__":
+    main()
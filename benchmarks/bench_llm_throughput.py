@@ -0,0 +1,88 @@
+"""
+Measures analysis throughput of the app/llm.py engine against the fake LLM.
+
+Runs entirely offline: by default the shared OpenAI clients are routed through
+an in-process FakeLLM; pass --base-url to target a separately started
+`python -m app.fake_llm` server instead.
+
+Example:
+    python benchmarks/bench_llm_throughput.py --sections 400 --concurrency 16 --latency-ms 300
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.fake_llm import FakeLLM, install_fake_llm  # noqa: E402
+from app.llm import analyze_sections  # noqa: E402
+from app.llm_client import configure_clients  # noqa: E402
+from app.rate_limiter import get_rate_limiter  # noqa: E402
+
+
+def synthetic_bodies(count: int) -> list[str]:
+    templates = [
+        "REQ-{n} The system shall lock the account after 5 failed login attempts.",
+        "REQ-{n} The system should respond quickly to user input and be user-friendly.",
+        "REQ-{n} The system shall encrypt stored records with AES-256 and retry failed backups.",
+    ]
+    return [templates[n % len(templates)].format(n=n) for n in range(count)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sections", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency", default="lognormal")
+    parser.add_argument("--latency-ms", type=float, default=250.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--separate", action="store_true", help="two calls per section")
+    parser.add_argument(
+        "--no-pack", action="store_true", help="disable section packing"
+    )
+    parser.add_argument("--base-url", help="use an external fake server instead")
+    args = parser.parse_args()
+
+    os.environ["SPECSENSE_LLM_CACHE"] = "off"
+    fake = None
+    if args.base_url:
+        os.environ.setdefault("OPENAI_API_KEY", "fake-key")
+        configure_clients(base_url=args.base_url)
+    else:
+        fake = install_fake_llm(
+            FakeLLM(
+                latency=args.latency,
+                latency_ms=args.latency_ms,
+                error_rate=args.error_rate,
+                rate_limit_rate=args.rate_limit_rate,
+                retry_after=0.2,
+                seed=42,
+            )
+        )
+
+    bodies = synthetic_bodies(args.sections)
+    start = time.perf_counter()
+    results = analyze_sections(
+        bodies,
+        max_concurrency=args.concurrency,
+        combined=not args.separate,
+        pack=not args.no_pack,
+    )
+    elapsed = time.perf_counter() - start
+
+    errors = sum(1 for r in results if r["analysis"].startswith("OpenAI error"))
+    print(f"sections:        {len(bodies)}")
+    print(f"concurrency:     {args.concurrency}")
+    print(f"elapsed:         {elapsed:.2f}s")
+    print(f"throughput:      {len(bodies) / elapsed:.1f} sections/s")
+    print(f"failed sections: {errors}")
+    if fake is not None:
+        print(f"fake server:     {fake.stats}")
+    print(f"rate limiter:    {get_rate_limiter().metrics()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Measures header classification and section parsing speed on a synthetic SRS.
+
+Compares the single-pass classify_line() with the original chain of
+header_rules predicates, checks that both classify every line identically, and
+reports lines/s for the full parse_sections_with_bodies() run and for
+parse_sections_parallel().
+
+Example:
+    python benchmarks/bench_parser.py --lines 1000000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.header_rules import (  # noqa: E402
+    TOC_LINE,
+    classify_line,
+    extract_id_and_title,
+    is_fallback_header,
+    is_isolated_all_caps_header,
+    is_markdown_header,
+    is_numbered_header,
+    is_toc_line,
+)
+from app.parser import parse_sections_parallel, parse_sections_with_bodies  # noqa: E402
+
+BODY_LINES = [
+    "REQ-{n} The system shall lock the account after 5 failed login attempts.",
+    "The operator should be able to export reports in CSV format.",
+    "ID: NFR-{n} Response time shall stay below 200 ms for 95% of requests.",
+    "Users: registered customers and administrators.",
+    "",
+]
+
+
+def synthetic_srs(line_count: int, seed: int = 42) -> str:
+    rng = random.Random(seed)
+    lines = [
+        "Software Requirements Specification",
+        "Project: Benchmark",
+        "",
+        "1. Introduction ........ 1",
+        "2. Overall Description ........ 3",
+        "",
+    ]
+    n = 0
+    while len(lines) < line_count:
+        n += 1
+        style = n % 4
+        if style == 0:
+            lines.append(f"# {n}. Section {n}")
+        elif style == 1:
+            lines.append(f"{n // 10}.{n % 10} Functional Area")
+        elif style == 2:
+            lines += ["", "SYSTEM FEATURES", ""]
+        else:
+            lines.append("Scope")
+        for _ in range(rng.randint(3, 12)):
+            lines.append(rng.choice(BODY_LINES).format(n=n))
+    return "\n".join(lines[:line_count])
+
+
+def legacy_classify(lines: list[str], i: int, line: str):
+    if i < 40 and is_toc_line(line):
+        return TOC_LINE, None, None
+    prev_line = lines[i - 1].strip() if i > 0 else ""
+    next_line = lines[i + 1].strip() if i + 1 < len(lines) else ""
+    if is_markdown_header(line):
+        return ("header", *extract_id_and_title(line[2:].strip()))
+    if is_numbered_header(line) or is_isolated_all_caps_header(
+        line, prev_line, next_line
+    ):
+        return ("header", *extract_id_and_title(line.strip()))
+    if is_fallback_header(line):
+        return "header", None, line.strip()
+    return None, None, None
+
+
+def compiled_classify(lines: list[str], i: int, line: str):
+    return classify_line(
+        line,
+        lines[i - 1] if i > 0 else "",
+        lines[i + 1] if i + 1 < len(lines) else "",
+        allow_toc=i < 40,
+    )
+
+
+def run(classifier, lines: list[str]) -> tuple[float, list]:
+    start = time.perf_counter()
+    results = [classifier(lines, i, line.strip()) for i, line in enumerate(lines)]
+    return time.perf_counter() - start, results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--lines", type=int, default=1_000_000)
+    parser.add_argument(
+        "--workers", type=int, default=None, help="processes for the parallel parse"
+    )
+    args = parser.parse_args()
+
+    text = synthetic_srs(args.lines)
+    lines = text.splitlines()
+    count = len(lines)
+
+    legacy_time, legacy = run(legacy_classify, lines)
+    compiled_time, compiled = run(compiled_classify, lines)
+    mismatches = sum(
+        1
+        for old, new in zip(legacy, compiled)
+        if (old[0] is None) != (new[0] is None) or old[1:] != new[1:]
+    )
+
+    start = time.perf_counter()
+    sections = parse_sections_with_bodies(text)
+    parse_time = time.perf_counter() - start
+
+    print(f"lines:                 {count}")
+    print(f"predicate chain:       {count / legacy_time:,.0f} lines/s")
+    print(f"classify_line:         {count / compiled_time:,.0f} lines/s")
+    print(f"speedup:               {legacy_time / compiled_time:.2f}x")
+    print(f"classification diffs:  {mismatches}")
+    print(f"parse_sections_with_bodies: {count / parse_time:,.0f} lines/s")
+    print(f"sections parsed:       {len(sections)}")
+
+    start = time.perf_counter()
+    parallel = parse_sections_parallel(text, workers=args.workers)
+    parallel_time = time.perf_counter() - start
+    print(f"parse_sections_parallel:    {count / parallel_time:,.0f} lines/s")
+    print(f"parallel output identical:  {parallel == sections}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Measures .txt ingestion of a large export: time and peak memory.
+
+Compares the original path (read all bytes, decode them as UTF-8, parse the
+whole string) with the streaming path (memory-mapped file, incremental
+decoding with encoding detection, sections parsed line by line by
+iter_sections()). The export is written as UTF-8 and as Windows-1252, which
+the original path cannot decode.
+
+Example:
+    python benchmarks/bench_text.py --lines 200000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from bench_parser import synthetic_srs  # noqa: E402
+
+from app.parser import iter_sections, parse_sections_with_bodies  # noqa: E402
+from app.text_stream import iter_text_file  # noqa: E402
+
+
+def read_whole(path: str) -> int:
+    # The original read_uploaded_file() .txt path, followed by parsing
+    with open(path, "rb") as f:
+        text = f.read().decode("utf-8")
+    return len(parse_sections_with_bodies(text))
+
+
+def read_streaming(path: str) -> int:
+    return sum(1 for _ in iter_sections(iter_text_file(path)))
+
+
+def measured(func, path: str):
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        result = func(path)
+    except UnicodeDecodeError:
+        result = "decode error"
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--lines", type=int, default=200_000)
+    args = parser.parse_args()
+
+    # Accented body text, so the two encodings differ
+    text = synthetic_srs(args.lines).replace("shall", "doit être") + "\n"
+    with tempfile.TemporaryDirectory() as tmp:
+        for encoding in ("utf-8", "cp1252"):
+            path = os.path.join(tmp, f"export-{encoding}.txt")
+            with open(path, "w", encoding=encoding, newline="") as f:
+                f.write(text)
+            print(f"{encoding}: {os.path.getsize(path) / 1e6:.1f} MB, {args.lines} lines")
+            for label, func in (("read + decode", read_whole), ("streaming", read_streaming)):
+                elapsed, peak, sections = measured(func, path)
+                print(
+                    f"  {label:14s} {elapsed:6.2f} s, peak {peak / 1e6:7.1f} MB, "
+                    f"sections: {sections}"
+                )
+
+
+if __name__ == "__main__":
+    main()
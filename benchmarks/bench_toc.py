@@ -0,0 +1,102 @@
+"""
+Measures TOC comparison speed on a large synthetic TOC.
+
+Times the original list-membership comparison against the set-based
+compare_toc(), the order-aware align_toc() and the local fuzzy matcher, for a
+document TOC derived from a standard one with typos, renumbering, dropped
+and shuffled entries.
+
+Example:
+    python benchmarks/bench_toc.py --entries 5000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.toc_alignment import align_toc  # noqa: E402
+from app.toc_comparator import compare_toc  # noqa: E402
+from app.toc_matcher import fuzzy_match_toc  # noqa: E402
+
+WORDS = (
+    "system interface requirements data security performance user account "
+    "report export audit backup storage network design constraints overview "
+    "scope purpose references appendix glossary operations logging alerts"
+).split()
+
+
+def synthetic_tocs(count: int, seed: int = 42) -> tuple[list[str], list[str]]:
+    rng = random.Random(seed)
+    standard = [
+        f"{i // 10 + 1}.{i % 10 + 1} "
+        + " ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 4))).title()
+        + f" {i}"
+        for i in range(count)
+    ]
+    document = []
+    for line in standard:
+        roll = rng.random()
+        if roll < 0.05:
+            continue  # dropped
+        if roll < 0.10:
+            chars = list(line)
+            chars.pop(rng.randrange(len(line) // 2, len(line)))  # typo
+            line = "".join(chars)
+        elif roll < 0.15:
+            line = "9.9 " + line.split(" ", 1)[1]  # renumbered
+        document.append(line)
+    for _ in range(count // 50):
+        document.insert(rng.randrange(len(document)), document.pop(rng.randrange(len(document))))
+    return document, standard
+
+
+def legacy_compare(actual: list[str], expected: list[str]) -> dict:
+    # The original compare_toc() body
+    return {
+        "matched": [item for item in actual if item in expected],
+        "missing": [item for item in expected if item not in actual],
+        "extra": [item for item in actual if item not in expected],
+    }
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entries", type=int, default=5000)
+    args = parser.parse_args()
+
+    document, standard = synthetic_tocs(args.entries)
+    legacy_time, legacy = timed(legacy_compare, document, standard)
+    strict_time, strict = timed(compare_toc, document, standard)
+    align_time, alignment = timed(align_toc, document, standard)
+    fuzzy_time, fuzzy = timed(fuzzy_match_toc, document, standard)
+
+    print(f"standard / document entries: {len(standard)} / {len(document)}")
+    print(f"list comparison:       {legacy_time * 1000:.1f} ms")
+    print(f"compare_toc:           {strict_time * 1000:.1f} ms")
+    print(f"identical strict lists: {all(legacy[k] == strict[k] for k in legacy)}")
+    print(f"align_toc:             {align_time * 1000:.1f} ms")
+    print(
+        "  matched / moved / missing / extra: "
+        + " / ".join(str(len(alignment[k])) for k in ("matched", "moved", "missing", "extra"))
+    )
+    print(f"fuzzy_match_toc:       {fuzzy_time * 1000:.1f} ms")
+    print(
+        "  matched / fuzzy / unresolved / missing: "
+        + " / ".join(
+            str(len(fuzzy[k])) for k in ("matched", "fuzzy_matched", "unresolved", "missing")
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
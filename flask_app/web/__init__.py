@@ -11,6 +11,9 @@ def create_app():
 
     # Explicitly tell Flask where to find templates
     app = Flask(__name__, template_folder=template_dir)
+    # Signs the session cookie that scopes revision history to one user; set it
+    # when running several workers, so they all accept the same cookies
+    app.secret_key = os.getenv("FLASK_SECRET_KEY") or os.urandom(32)
 
     # Import and register route blueprints
     from .routes import main
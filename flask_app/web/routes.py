@@ -1,20 +1,31 @@
 # Standard library imports (always first)
 import sys
 import os
-from flask import Blueprint, render_template, request, Response
+import secrets
+from flask import Blueprint, render_template, request, Response, session
 
 # Add project root to sys.path for outer app/ imports
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
 
 # Internal imports (after sys.path fix)
-from app.parser import parse_sections_with_bodies  # noqa: E402
-from app.llm import analyze_requirement, suggest_tests  # noqa: E402
+from app.sections import parse_sections_compact  # noqa: E402
+from app.incremental import get_incremental_analyzer  # noqa: E402
 from app.export import format_traceability_as_markdown  # noqa:E402
 from app.utils import validate_and_read_upload  # noqa:E402
 
 main = Blueprint("main", __name__)
 
 
+def _client_id() -> str:
+    """
+    Returns this browser session's id, so revision history is per user.
+    """
+    client_id = session.get("client_id")
+    if client_id is None:
+        client_id = session["client_id"] = secrets.token_hex(16)
+    return client_id
+
+
 @main.route("/")
 def index():
     """
@@ -34,13 +45,14 @@ def upload_file():
     except ValueError as e:
         return f"Error: {e}", 400
 
-    # Parse the raw text into structured sections
-    parsed_sections = parse_sections_with_bodies(file_text)
-
-    for section in parsed_sections:
-        body_text = section.get("body", "").strip()
-        section["analysis"] = analyze_requirement(body_text)
-        section["test_suggestions"] = suggest_tests(body_text)
+    # Parse the raw text into structured sections and run analysis + test
+    # suggestions concurrently, reusing results from the previous revision of
+    # this file (uploaded in this session) for sections whose body is unchanged
+    analyzer = get_incremental_analyzer(filename, owner=_client_id())
+    parsed_sections, results, reuse_report = analyzer.update(file_text)
+    for section, result in zip(parsed_sections, results):
+        section["analysis"] = result["analysis"]
+        section["test_suggestions"] = result["tests"]
 
     # Pass the parsed results into the parsed.html template
     return render_template(
@@ -48,6 +60,7 @@ def upload_file():
         sections=parsed_sections,
         filename=filename,
         file_text=file_text,  # 🆕  pass raw contents
+        reuse_report=reuse_report,
     )
 
 
@@ -58,7 +71,8 @@ def generate_traceability():
     except ValueError as e:
         return f"Error: {e}", 400
 
-    parsed_sections = parse_sections_with_bodies(file_text)
+    # Only ids, titles and requirement lines are needed; bodies stay unsliced
+    parsed_sections = parse_sections_compact(file_text)
     trace_md = format_traceability_as_markdown(parsed_sections)
 
     return Response(
@@ -0,0 +1,38 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def disable_llm_cache(monkeypatch):
+    # Keep tests hermetic: no reads from or writes to the on-disk LLM response cache
+    monkeypatch.setenv("SPECSENSE_LLM_CACHE", "off")
+
+
+@pytest.fixture(autouse=True)
+def reset_incremental_state():
+    # Uploads in one test must not reuse analysis results from another
+    from app.incremental import reset_incremental_analyzers
+
+    reset_incremental_analyzers()
+    yield
+    reset_incremental_analyzers()
+
+
+@pytest.fixture(autouse=True)
+def default_taxonomy(monkeypatch):
+    # Group against the built-in categories regardless of the caller's environment
+    from app.taxonomy import clear_taxonomy_cache
+
+    monkeypatch.delenv("SPECSENSE_TAXONOMY", raising=False)
+    clear_taxonomy_cache()
+    yield
+    clear_taxonomy_cache()
+
+
+@pytest.fixture(autouse=True)
+def reset_ingestion_cache():
+    # Uploads are cached by content; tests reuse the same bytes with different fakes
+    from app.ingestion import clear_ingestion_cache
+
+    clear_ingestion_cache()
+    yield
+    clear_ingestion_cache()
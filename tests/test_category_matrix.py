@@ -0,0 +1,78 @@
+"""
+Tests for the NumPy-backed category statistics.
+"""
+
+import numpy as np
+
+from app.category_matrix import CategoryMatrix
+from app.requirement_grouper import detect_gaps, group_requirements
+
+REQUIREMENTS = [
+    {"id": "REQ-1", "text": "Users shall login with a password.", "section": "Access"},
+    {"id": "REQ-2", "text": "Enforce access control and encryption.", "section": "Access"},
+    {"id": "REQ-3", "text": "Retry on error and store the data.", "section": "Storage"},
+    {"id": "REQ-4", "text": "Nothing to classify here.", "section": "Storage"},
+]
+
+
+# ✅ Test membership matches group_requirements() and gaps match detect_gaps()
+def test_matrix_agrees_with_grouping():
+    matrix = CategoryMatrix(REQUIREMENTS)
+    grouped = group_requirements(REQUIREMENTS)
+
+    assert matrix.groups() == grouped
+    assert matrix.gaps() == detect_gaps(grouped)
+    assert matrix.category_counts() == {c: len(r) for c, r in grouped.items()}
+
+
+# ✅ Test the incidence matrix records each matching keyword once per requirement
+def test_keyword_incidence():
+    matrix = CategoryMatrix(REQUIREMENTS)
+    counts = matrix.keyword_counts()
+
+    assert counts["access"] == 1
+    assert counts["access control"] == 1
+    assert counts["password"] == 1
+    assert matrix.indptr.tolist()[-1] == len(matrix.indices)
+
+
+# ✅ Test per-section counts, section gaps and co-occurrence
+def test_section_counts_and_co_occurrence():
+    matrix = CategoryMatrix(REQUIREMENTS)
+    auth, errors, security, data = (
+        matrix.categories.index(c)
+        for c in ("Authentication", "Error Handling", "Security", "Data Handling")
+    )
+
+    counts = matrix.section_counts()
+    assert matrix.sections == ["Access", "Storage"]
+    assert counts[0, auth] == 2 and counts[0, security] == 1
+    assert counts[1, errors] == 1 and counts[1, data] == 1
+    assert matrix.section_gaps()["Storage"] == ["Authentication", "Security"]
+
+    co = matrix.co_occurrence()
+    assert co[auth, security] == co[security, auth] == 1
+    assert co[errors, data] == 1
+    assert np.array_equal(np.diag(co), counts.sum(axis=0))
+
+
+# ✅ Test an empty corpus yields empty statistics
+def test_empty_matrix():
+    matrix = CategoryMatrix([])
+    assert matrix.membership.shape == (0, len(matrix.categories))
+    assert matrix.gaps() == matrix.categories
+
+
+# ✅ Test building from parsed sections labels requirements by section title
+def test_from_sections():
+    sections = [
+        {"title": "Login", "body": "REQ-1 The user shall login."},
+        {"title": "Backup", "body": "REQ-2 Data shall be saved nightly."},
+    ]
+    matrix = CategoryMatrix.from_sections(sections)
+    assert matrix.sections == ["Login", "Backup"]
+    assert matrix.section_gaps()["Login"] == [
+        "Error Handling",
+        "Security",
+        "Data Handling",
+    ]
@@ -0,0 +1,108 @@
+import asyncio
+import io
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import app.cli as cli
+from app.cli import build_records, expand_inputs, main, process_file, run_batch
+
+SPEC = (
+    "1. Introduction\n"
+    "REQ-1 The system shall encrypt stored passwords.\n"
+    "\n"
+    "2. Scope\n"
+    "REQ-2 The user shall log in within 2 seconds.\n"
+)
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "a.txt").write_text(SPEC, encoding="utf-8")
+    (tmp_path / "sub" / "b.txt").write_text(SPEC.replace("REQ-2", "REQ-3"), encoding="cp1252")
+    (tmp_path / "notes.md").write_text("ignored")
+    return tmp_path
+
+
+def read_records(path) -> list[dict]:
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+# ✅ Test directories, globs and files resolve to supported files without duplicates
+def test_expand_inputs(corpus):
+    files, unmatched = expand_inputs(
+        [str(corpus), str(corpus / "**" / "*.txt"), str(corpus / "missing.txt")]
+    )
+
+    assert files == [str(corpus / "a.txt"), str(corpus / "sub" / "b.txt")]
+    assert unmatched == [str(corpus / "missing.txt")]
+
+
+# ✅ Test a file becomes section and requirement records with categories
+def test_process_file_and_records(corpus):
+    result = process_file(str(corpus / "a.txt"))
+    records = build_records(result, None, "all")
+
+    assert [r["type"] for r in records] == ["section", "requirement"] * 2
+    assert records[0]["requirements"] == ["REQ-1"]
+    assert "Security" in records[1]["categories"]
+    assert [r["type"] for r in build_records(result, None, "requirements")] == ["requirement"] * 2
+
+
+# ✅ Test the CLI writes JSONL over a process pool and summarizes throughput
+def test_main_writes_jsonl(corpus, tmp_path, capsys):
+    output = tmp_path / "out.jsonl"
+
+    code = main([str(corpus), "-o", str(output), "--workers", "2"])
+
+    records = read_records(output)
+    assert code == 0
+    assert {r["file"] for r in records} == {str(corpus / "a.txt"), str(corpus / "sub" / "b.txt")}
+    assert sorted(r["id"] for r in records if r["type"] == "requirement") == ["REQ-1", "REQ-1", "REQ-2", "REQ-3"]
+    assert "Processed 2 of 2 files (0 failed)" in capsys.readouterr().err
+
+
+# ✅ Test failures become error records and a non-zero exit code
+def test_main_reports_failures(corpus, tmp_path):
+    (corpus / "broken.docx").write_bytes(b"not a zip")
+    output = tmp_path / "out.jsonl"
+
+    code = main([str(corpus), "-o", str(output), "--workers", "0", "-q"])
+
+    errors = [r for r in read_records(output) if r["type"] == "error"]
+    assert code == 1
+    assert [(e["file"], e["stage"]) for e in errors] == [(str(corpus / "broken.docx"), "parse")]
+
+
+# ✅ Test LLM analysis is attached to sections under one limit shared by all files
+def test_run_batch_shares_llm_limit(corpus, monkeypatch):
+    in_flight = 0
+    peak = 0
+
+    async def fake_analyze(bodies, semaphore=None, **kwargs):
+        async def one(body):
+            nonlocal in_flight, peak
+            async with semaphore:
+                in_flight += 1
+                peak = max(peak, in_flight)
+                await asyncio.sleep(0.01)
+                in_flight -= 1
+            return {"analysis": f"ok: {body[:5]}", "tests": "t"}
+
+        return list(await asyncio.gather(*(one(body) for body in bodies)))
+
+    monkeypatch.setattr(cli, "analyze_sections_async", fake_analyze)
+    files = [str(corpus / "a.txt"), str(corpus / "sub" / "b.txt")] * 3
+    out = io.StringIO()
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        stats = asyncio.run(
+            run_batch(files, out, executor, use_llm=True, llm_concurrency=2, record_types="sections")
+        )
+
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert stats.files == 6 and stats.sections == 12
+    assert all(r["analysis"].startswith("ok: ") for r in records)
+    assert peak == 2
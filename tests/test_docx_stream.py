@@ -0,0 +1,181 @@
+import zipfile
+from io import BytesIO
+
+from docx import Document
+from docx.enum.text import WD_BREAK
+
+from app.docx_stream import (
+    DocParagraph,
+    DocTableRow,
+    iter_docx_blocks,
+    iter_docx_lines,
+    iter_docx_paragraphs,
+    table_row_line,
+)
+from app.export import extract_requirement_lines
+from app.ingestion import ingest_upload
+from app.parser import extract_requirement_statements, parse_document
+from app.toc_extractor import extract_toc_lines_from_docx
+
+
+def build_docx() -> bytes:
+    doc = Document()
+    doc.styles.add_style("TOC 1", 1)
+    doc.add_paragraph("1. Introduction .......... 1", style="TOC 1")
+    doc.add_heading("1. Introduction", level=1)
+    para = doc.add_paragraph("Tabbed\tand ")
+    para.add_run("broken").add_break()
+    para.add_run("lines").add_break(WD_BREAK.PAGE)
+    doc.add_table(rows=1, cols=1).cell(0, 0).text = "Table text"
+    doc.add_paragraph("")
+    doc.add_paragraph("The system shall log off after 10 minutes.", style="List Bullet")
+    out = BytesIO()
+    doc.save(out)
+    return out.getvalue()
+
+
+def with_toc_content_control(data: bytes) -> bytes:
+    # Wrap the first body paragraph in a w:sdt, as Word does for generated TOCs
+    source = zipfile.ZipFile(BytesIO(data))
+    out = BytesIO()
+    with zipfile.ZipFile(out, "w") as target:
+        for item in source.infolist():
+            content = source.read(item.filename)
+            if item.filename == "word/document.xml":
+                xml = content.decode("utf-8")
+                start = xml.index("<w:p>", xml.index("<w:body>"))
+                end = xml.index("</w:p>", start) + len("</w:p>")
+                xml = (
+                    xml[:start]
+                    + "<w:sdt><w:sdtContent>"
+                    + xml[start:end]
+                    + "</w:sdtContent></w:sdt>"
+                    + xml[end:]
+                )
+                content = xml.encode("utf-8")
+            target.writestr(item, content)
+    return out.getvalue()
+
+
+# ✅ Test streamed paragraphs match python-docx text and style names
+def test_iter_docx_paragraphs_matches_python_docx():
+    data = build_docx()
+    expected = [
+        DocParagraph(p.text, p.style.name) for p in Document(BytesIO(data)).paragraphs
+    ]
+
+    assert list(iter_docx_paragraphs(data)) == expected
+    assert expected[2].text == "Tabbed\tand broken\nlines"
+    assert "Table text" not in [p.text for p in expected]
+
+
+# ✅ Test paths and file objects are accepted as well as bytes
+def test_iter_docx_paragraphs_sources(tmp_path):
+    data = build_docx()
+    path = tmp_path / "spec.docx"
+    path.write_bytes(data)
+
+    assert list(iter_docx_paragraphs(str(path))) == list(iter_docx_paragraphs(BytesIO(data)))
+
+
+# ✅ Test TOC paragraphs inside a content control are read
+def test_iter_docx_paragraphs_reads_content_controls():
+    data = with_toc_content_control(build_docx())
+
+    paragraphs = list(iter_docx_paragraphs(data))
+
+    assert paragraphs[0] == DocParagraph("1. Introduction .......... 1", "TOC 1")
+    assert extract_toc_lines_from_docx(BytesIO(data)) == ["1. Introduction .......... 1"]
+
+
+def build_requirements_table_docx() -> bytes:
+    doc = Document()
+    doc.add_paragraph("3. Requirements")
+    table = doc.add_table(rows=4, cols=3)
+    rows = [
+        ("Requirement ID", "Text", "Priority"),
+        ("REQ-101", "The system shall export reports.", "High"),
+        ("FR-7", "The system shall\nsend alerts.", ""),
+        ("", "Rationale row without an ID", "Low"),
+    ]
+    for row, values in zip(table.rows, rows):
+        for cell, value in zip(row.cells, values):
+            cell.text = value
+    doc.add_table(rows=1, cols=2).rows[0].cells[0].text = "Free-form"
+    doc.add_paragraph("4. Appendices")
+    out = BytesIO()
+    doc.save(out)
+    return out.getvalue()
+
+
+# ✅ Test table rows stream in document order with python-docx cell texts
+def test_iter_docx_blocks_streams_table_rows():
+    data = build_requirements_table_docx()
+    tables = Document(BytesIO(data)).tables
+
+    blocks = list(iter_docx_blocks(data))
+
+    assert blocks[0] == DocParagraph("3. Requirements", "Normal")
+    assert blocks[-1] == DocParagraph("4. Appendices", "Normal")
+    rows = [b for b in blocks if isinstance(b, DocTableRow)]
+    assert [(r.table, r.row) for r in rows] == [(0, 0), (0, 1), (0, 2), (0, 3), (1, 0)]
+    assert [r.cells for r in rows] == [
+        tuple(cell.text for cell in row.cells) for table in tables for row in table.rows
+    ]
+
+
+# ✅ Test requirement tables become lines extract_requirement_statements() picks up
+def test_iter_docx_lines_renders_requirement_rows():
+    lines = [p.text for p in iter_docx_lines(build_requirements_table_docx())]
+
+    assert lines == [
+        "3. Requirements",
+        "REQ-101 The system shall export reports. (Priority: High)",
+        "ID: FR-7 The system shall send alerts.",
+        "Rationale row without an ID (Priority: Low)",
+        "Free-form",
+        "4. Appendices",
+    ]
+    statements = extract_requirement_statements("\n".join(lines))
+    assert [s["id"] for s in statements] == ["REQ-101", "ID: FR-7"]
+
+
+# ✅ Test rows without a recognizable header are joined cell by cell
+def test_table_row_line_without_header():
+    assert table_row_line(("REQ-1", " Log  in ", "")) == "REQ-1 | Log in"
+    assert table_row_line(("A", "B"), header=("Owner", "Notes")) == "A | B"
+
+
+# ✅ Test table requirements reach the parsed sections of an upload
+def test_ingested_docx_tables_reach_parser():
+    upload = BytesIO(build_requirements_table_docx())
+    upload.name = "spec.docx"
+
+    sections = parse_document(ingest_upload(upload))
+
+    assert [r["id"] for r in sections[0]["requirements"]] == ["REQ-101", "ID: FR-7"]
+
+
+# ✅ Test table requirements survive extract_requirement_lines() for grouping and summaries
+def test_table_requirements_reach_requirement_lines():
+    doc = Document()
+    doc.add_paragraph("3. Requirements")
+    table = doc.add_table(rows=3, cols=2)
+    for row, values in zip(
+        table.rows,
+        [("ID", "Requirement"), ("REQ-7", "The system shall encrypt data."), ("FR-2", "Log in.")],
+    ):
+        for cell, value in zip(row.cells, values):
+            cell.text = value
+    doc.add_paragraph("REQ-9 The system shall log out idle users.")
+    upload = BytesIO()
+    doc.save(upload)
+    upload.name = "spec.docx"
+
+    reqs = extract_requirement_lines(parse_document(ingest_upload(upload)))
+
+    assert reqs == [
+        {"id": "REQ-7", "text": "The system shall encrypt data."},
+        {"id": "ID: FR-2", "text": "Log in."},
+        {"id": "REQ-9", "text": "The system shall log out idle users."},
+    ]
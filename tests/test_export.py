@@ -1,8 +1,10 @@
+from unittest.mock import patch
 from app.export import (
     format_analysis_as_markdown,
     generate_requirement_summary,
     extract_requirement_lines,
     generate_requirement_summary_from_sections,
+    group_requirements_with_llm,
 )
 
 # tests/test_export.py  (append)
@@ -168,3 +170,43 @@ def test_format_traceability_as_markdown_basic():
     md = format_traceability_as_markdown(sections)
     assert "| REQ-1 | Login |" in md
     assert "| REQ-2 | Logout |" in md
+
+
+# ✅ Test that LLM grouping classifies all REQ lines through one batched call
+def test_group_requirements_with_llm_uses_batch():
+    sections = [
+        {"body": "REQ-1 The system shall authenticate.\nREQ-2 The system shall retry."}
+    ]
+    with patch(
+        "app.export.llm_group_requirements_batch",
+        return_value=[["Authentication"], ["Error Handling"]],
+    ) as mock_batch:
+        result = group_requirements_with_llm(sections)
+
+    mock_batch.assert_called_once_with(
+        ["The system shall authenticate.", "The system shall retry."]
+    )
+    assert result[1] == {
+        "id": "REQ-2",
+        "text": "The system shall retry.",
+        "llm_group": ["Error Handling"],
+    }
+
+
+# ✅ Test parsed requirements are reused instead of re-scanning the body
+def test_extract_requirement_lines_reuses_parsed_requirements():
+    sections = [
+        {
+            "body": "",
+            "requirements": [
+                {"id": "REQ-1", "text": "REQ-1 The system shall authenticate."},
+                {"id": "REQ-2", "text": "See REQ-2 for retries."},
+                {"id": "ID: NFR-3", "text": "ID: NFR-3 Uptime shall exceed 99%."},
+            ],
+        }
+    ]
+
+    assert extract_requirement_lines(sections) == [
+        {"id": "REQ-1", "text": "The system shall authenticate."},
+        {"id": "ID: NFR-3", "text": "Uptime shall exceed 99%."},
+    ]
@@ -0,0 +1,120 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+import pytest
+from app.fake_llm import FakeLLM, canned_response, classify_prompt, make_server
+from app.llm import (
+    build_analysis_messages,
+    build_batch_grouping_prompt,
+    build_combined_messages,
+    build_grouping_prompt,
+    build_packed_messages,
+    build_test_messages,
+    parse_combined_response,
+    parse_packed_response,
+)
+
+REQ = "The system shall respond quickly to every login request."
+
+
+# ✅ Test that every SpecSense prompt builder is recognised
+def test_classify_prompt_covers_all_prompt_types():
+    categories = ["Authentication", "Security"]
+    grouping = [
+        {"role": "system", "content": build_grouping_prompt(categories)},
+        {"role": "user", "content": REQ},
+    ]
+    batch = [
+        {"role": "system", "content": build_batch_grouping_prompt(categories)},
+        {"role": "user", "content": f"1. {REQ}"},
+    ]
+
+    assert classify_prompt(build_analysis_messages(REQ)) == "analysis"
+    assert classify_prompt(build_test_messages(REQ)) == "tests"
+    assert classify_prompt(build_combined_messages(REQ)) == "combined"
+    assert classify_prompt(build_packed_messages([REQ, REQ])) == "packed"
+    assert classify_prompt(grouping) == "grouping"
+    assert classify_prompt(batch) == "grouping_batch"
+
+
+# ✅ Test that canned outputs satisfy the parsers used by app.llm
+def test_canned_responses_are_well_formed():
+    combined = parse_combined_response(canned_response(build_combined_messages(REQ)))
+    packed = parse_packed_response(
+        canned_response(build_packed_messages([REQ, "The system shall log off."])), 2
+    )
+    batch = json.loads(
+        canned_response(
+            [
+                {
+                    "role": "system",
+                    "content": build_batch_grouping_prompt(["Authentication"]),
+                },
+                {"role": "user", "content": f"1. {REQ}"},
+            ]
+        )
+    )
+
+    assert combined is not None and "Vagueness" in combined["analysis"]
+    assert set(packed) == {0, 1}
+    assert batch == {"1": ["Authentication"]}
+
+
+# ✅ Test that outputs are deterministic per prompt
+def test_canned_responses_are_deterministic():
+    messages = build_test_messages(REQ)
+    assert canned_response(messages) == canned_response(messages)
+
+
+# ✅ Test 429 and 500 injection
+def test_fake_llm_fault_injection():
+    limited = FakeLLM(rate_limit_rate=1.0, retry_after=2.5)
+    status, headers, payload = limited.respond({"messages": build_test_messages(REQ)})
+    assert status == 429
+    assert headers["retry-after"] == "2.5"
+
+    failing = FakeLLM(error_rate=1.0)
+    assert failing.respond({"messages": build_test_messages(REQ)})[0] == 500
+
+    healthy = FakeLLM(seed=1)
+    status, _, payload = healthy.respond({"messages": build_test_messages(REQ)})
+    assert status == 200
+    assert payload["choices"][0]["message"]["content"].startswith("- Verify")
+
+
+# ✅ Test latency distributions
+def test_fake_llm_latency_distributions():
+    assert FakeLLM(latency="fixed", latency_ms=50).sample_latency() == 0.05
+    uniform = FakeLLM(latency="uniform", latency_ms=100, seed=3)
+    assert all(0 <= uniform.sample_latency() <= 0.1 for _ in range(50))
+    lognormal = FakeLLM(latency="lognormal", latency_ms=100, seed=3)
+    samples = [lognormal.sample_latency() for _ in range(2000)]
+    assert 0.08 < sum(samples) / len(samples) < 0.12
+
+    with pytest.raises(ValueError):
+        FakeLLM(latency="gamma")
+
+
+# ✅ Test the HTTP server speaks the chat completions API
+def test_fake_llm_http_server_roundtrip():
+    server = make_server(FakeLLM(), port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/v1/chat/completions"
+        request = urllib.request.Request(
+            url,
+            data=json.dumps(
+                {"model": "gpt-4", "messages": build_analysis_messages(REQ)}
+            ).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+        )
+        with urllib.request.urlopen(request) as response:
+            payload = json.loads(response.read())
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert payload["object"] == "chat.completion"
+    assert "Vagueness" in payload["choices"][0]["message"]["content"]
@@ -61,3 +61,12 @@ def test_read_uploaded_txt_file_flask_style():
     fake_txt.filename = "example.txt"  # simulate Flask-style upload
     result = read_uploaded_file(fake_txt)
     assert "shut down securely" in result
+
+
+# Test non-UTF-8 and BOM-marked .txt uploads are decoded instead of failing
+def test_read_uploaded_txt_file_other_encodings():
+    for encoding in ("cp1252", "utf-16"):
+        fake_txt = BytesIO("The système shall démarrer quickly.".encode(encoding))
+        fake_txt.name = "example.txt"
+
+        assert read_uploaded_file(fake_txt) == "The système shall démarrer quickly."
@@ -3,6 +3,15 @@ from app.header_rules import (
     is_numbered_header,
     is_all_caps_header,
     is_isolated_all_caps_header,
+    is_fallback_header,
+    is_toc_line,
+    extract_id_and_title,
+    classify_line,
+    TOC_LINE,
+    MARKDOWN_HEADER,
+    NUMBERED_HEADER,
+    ALL_CAPS_HEADER,
+    FALLBACK_HEADER,
 )
 
 
@@ -29,3 +38,68 @@ def test_isolated_all_caps():
     assert is_isolated_all_caps_header("LOGIN", "Body", "")
     # Not isolated (text above and below)
     assert not is_isolated_all_caps_header("LOGIN", "Prev", "Next")
+
+
+def test_classify_line_kinds():
+    assert classify_line("# 2.1 Scope") == (MARKDOWN_HEADER, "2.1", "Scope")
+    assert classify_line("3.1.2) Login Flow") == (NUMBERED_HEADER, "3.1.2", "Login Flow")
+    assert classify_line("SYSTEM OVERVIEW", "", "Body") == (
+        ALL_CAPS_HEADER,
+        None,
+        "SYSTEM OVERVIEW",
+    )
+    assert classify_line("Scope") == (FALLBACK_HEADER, None, "Scope")
+    assert classify_line("1. Introduction ..... 2") == (TOC_LINE, None, None)
+    assert classify_line("The system shall log in users.") == (None, None, None)
+    assert classify_line("") == (None, None, None)
+
+
+def test_classify_line_respects_isolation_and_toc_window():
+    assert classify_line("LOGIN", "Prev", "Next")[0] is None
+    # Outside the TOC window a dotted line falls through to the other rules
+    assert classify_line("1. Introduction ..... 2", allow_toc=False)[0] == NUMBERED_HEADER
+
+
+def _legacy_classify(line, prev_line, next_line):
+    if is_toc_line(line):
+        return TOC_LINE, None, None
+    if is_markdown_header(line):
+        return (MARKDOWN_HEADER, *extract_id_and_title(line[2:].strip()))
+    if is_numbered_header(line) or is_isolated_all_caps_header(
+        line, prev_line, next_line
+    ):
+        return ("header", *extract_id_and_title(line.strip()))
+    if is_fallback_header(line):
+        return FALLBACK_HEADER, None, line.strip()
+    return None, None, None
+
+
+def test_classify_line_matches_individual_rules():
+    samples = [
+        "# Introduction",
+        "#NoSpace",
+        "1 Scope",
+        "1.Intro",
+        "10 Things",
+        "2024 was a good year",
+        "4.2) Error Handling",
+        "LOGIN",
+        "LOGIN PAGE FLOW AND MORE WORDS",
+        "NFR 2",
+        "Scope",
+        "System Overview",
+        "A Very Long Title Case Line",
+        "lowercase words",
+        "REQ-001 The system shall log in users.",
+        "Contents ... 12",
+        "Appendix .... A",
+        "Ünïcode Heading",
+        "",
+    ]
+    for line in samples:
+        for prev_line, next_line in [("", ""), ("Prev", "Next"), ("Prev", "  ")]:
+            kind, section_id, title = classify_line(line, prev_line, next_line)
+            expected = _legacy_classify(line, prev_line, next_line)
+            if kind in (NUMBERED_HEADER, ALL_CAPS_HEADER):
+                kind = "header"
+            assert (kind, section_id, title) == expected, line
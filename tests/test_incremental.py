@@ -0,0 +1,116 @@
+import threading
+from unittest.mock import patch
+
+from app.incremental import (
+    IncrementalAnalyzer,
+    body_hash,
+    get_incremental_analyzer,
+)
+from app.parser import parse_sections_with_bodies
+
+REVISION_1 = """# Login
+REQ-001 The system shall lock accounts after 5 failed attempts.
+
+# Reports
+REQ-002 The system shall export reports as CSV.
+
+# Audit
+REQ-003 The system shall log every admin action.
+"""
+
+REVISION_2 = """# Login
+REQ-001 The system shall lock accounts after 5 failed attempts.
+
+# Reports
+REQ-002 The system shall export reports as CSV and PDF.
+
+# Backup
+REQ-004 The system shall back up data nightly.
+"""
+
+
+def _fake_analyze(bodies, **kwargs):
+    return [{"analysis": f"A:{body[:7]}", "tests": f"T:{body[:7]}"} for body in bodies]
+
+
+# ✅ Test a new revision only re-analyzes changed and new sections
+def test_update_reuses_unchanged_sections():
+    analyzer = IncrementalAnalyzer()
+    with patch("app.incremental.analyze_sections", side_effect=_fake_analyze) as mock:
+        analyzer.update(REVISION_1)
+        sections, results, report = analyzer.update(REVISION_2)
+
+    assert sections == parse_sections_with_bodies(REVISION_2)
+    assert [r["analysis"] for r in results] == ["A:REQ-001", "A:REQ-002", "A:REQ-004"]
+
+    # Second call only received the edited and the added bodies
+    second_bodies = mock.call_args_list[1].args[0]
+    assert second_bodies == [sections[1]["body"], sections[2]["body"]]
+
+    assert report["unchanged"] == ["Login"]
+    assert report["changed"] == ["Reports"]
+    assert report["added"] == ["Backup"]
+    assert report["removed"] == ["Audit"]
+    assert report["reused_sections"] == 1
+    assert report["reused_analyses"] == 1
+    assert report["new_analyses"] == 2
+
+
+# ✅ Test whitespace-only edits keep the same content hash
+def test_body_hash_ignores_whitespace_noise():
+    assert body_hash("REQ-1 Shall log in.  \r\n") == body_hash("REQ-1 Shall log in.")
+    assert body_hash("REQ-1 Shall log in.") != body_hash("REQ-1 Shall log out.")
+
+
+# ✅ Test failed LLM results are retried on the next revision
+def test_errors_are_not_reused():
+    analyzer = IncrementalAnalyzer()
+    failing = [{"analysis": "OpenAI error: timeout", "tests": "OpenAI error: timeout"}]
+    with patch("app.incremental.analyze_sections", return_value=failing) as mock:
+        analyzer.update("# Login\nREQ-001 The system shall lock accounts.")
+        _, _, report = analyzer.update("# Login\nREQ-001 The system shall lock accounts.")
+
+    assert mock.call_count == 2
+    assert report["new_analyses"] == 1
+
+
+# ✅ Test annotating returned sections does not leak into the next revision
+def test_callers_can_annotate_sections():
+    analyzer = get_incremental_analyzer("spec.txt")
+    with patch("app.incremental.analyze_sections", side_effect=_fake_analyze):
+        sections, _, _ = analyzer.update(REVISION_1)
+        sections[0]["analysis"] = "rendered"
+        again, _, _ = analyzer.update(REVISION_1)
+
+    assert "analysis" not in again[0]
+    assert get_incremental_analyzer("spec.txt") is analyzer
+
+
+# ✅ Test that owners with the same filename get separate analyzers
+def test_analyzers_are_scoped_by_owner():
+    first = get_incremental_analyzer("srs.txt", owner="session-a")
+
+    assert get_incremental_analyzer("srs.txt", owner="session-b") is not first
+    assert get_incremental_analyzer("srs.txt", owner="session-a") is first
+
+
+# ✅ Test that a revision can be parsed while another one waits on the LLM
+def test_lock_is_released_during_llm_calls():
+    analyzer = IncrementalAnalyzer()
+    started, release = threading.Event(), threading.Event()
+
+    def slow_analyze(bodies, **kwargs):
+        started.set()
+        release.wait(5)
+        return _fake_analyze(bodies)
+
+    with patch("app.incremental.analyze_sections", side_effect=slow_analyze):
+        worker = threading.Thread(target=analyzer.update, args=(REVISION_1,))
+        worker.start()
+        assert started.wait(5)
+        sections = analyzer.parse(REVISION_2)  # would block if the lock were held
+        release.set()
+        worker.join(5)
+
+    assert [s["title"] for s in sections] == ["Login", "Reports", "Backup"]
+    assert not worker.is_alive()
@@ -0,0 +1,120 @@
+from io import BytesIO
+
+import pytest
+from docx import Document
+
+import app.ingestion as ingestion
+from app.ingestion import clear_ingestion_cache, ingest_bytes, ingest_upload, parse_path
+from app.parser import parse_document, parse_sections_with_bodies
+from app.structure_check import run_structure_check
+
+SAMPLE_TXT = (
+    b"1. Introduction .......... 1\n"
+    b"1.2 Scope .......... 2\n"
+    b"\n"
+    b"1. Introduction\n"
+    b"The system shall start within 10 seconds.\n"
+)
+
+
+def make_docx() -> BytesIO:
+    doc = Document()
+    doc.add_paragraph("1. Introduction .......... 1", style=doc.styles.add_style("TOC 1", 1))
+    doc.add_heading("1. Introduction", level=1)
+    doc.add_paragraph("The system shall log off after 10 minutes.")
+    doc_io = BytesIO()
+    doc.save(doc_io)
+    doc_io.seek(0)
+    doc_io.name = "sample.docx"
+    return doc_io
+
+
+# ✅ Test a .txt upload exposes body text and cleaned TOC lines
+def test_ingest_txt_upload():
+    upload = BytesIO(SAMPLE_TXT)
+    upload.name = "Spec.TXT"
+
+    document = ingest_upload(upload)
+
+    assert document.filename == "spec.txt"
+    assert not document.is_docx
+    assert document.toc_lines == ("1. Introduction", "1.2 Scope")
+    assert "shall start within 10 seconds" in document.text
+    assert document.paragraphs == ()
+    assert upload.tell() == 0  # stream rewound for the caller
+
+
+# ✅ Test a .docx upload exposes paragraph styles and keeps the TOC out of the body
+def test_ingest_docx_upload():
+    document = ingest_upload(make_docx())
+
+    assert document.is_docx
+    assert document.toc_lines == ("1. Introduction",)
+    assert [p.style for p in document.paragraphs] == ["TOC 1", "Heading 1", "Normal"]
+    assert document.text == "1. Introduction\nThe system shall log off after 10 minutes."
+
+
+# ✅ Test identical uploads are parsed once
+def test_ingest_upload_cached_by_content(monkeypatch):
+    opened = []
+    real_reader = ingestion.iter_docx_lines
+    monkeypatch.setattr(
+        ingestion, "iter_docx_lines", lambda data: opened.append(data) or real_reader(data)
+    )
+
+    # Two uploads of the same bytes (separate saves may differ in their timestamps)
+    data = make_docx().getvalue()
+    uploads = [BytesIO(data), BytesIO(data)]
+    for upload in uploads:
+        upload.name = "sample.docx"
+    first = ingest_upload(uploads[0])
+    second = ingest_upload(uploads[1])
+
+    assert len(opened) == 1
+    assert first.digest == second.digest
+    assert ingest_bytes(b"other", "other.txt").digest != first.digest
+
+
+# ✅ Test missing and unsupported uploads return None
+@pytest.mark.parametrize("name", ["example.pdf", None])
+def test_ingest_upload_unsupported(name):
+    upload = BytesIO(b"%PDF-1.4")
+    if name:
+        upload.name = name
+    assert ingest_upload(upload) is None
+    assert ingest_upload(None) is None
+
+
+# ✅ Test the structure check and parser both work from one ingested upload
+def test_structure_check_and_parser_share_document():
+    upload = BytesIO(SAMPLE_TXT)
+    upload.name = "sample.txt"
+    document = ingest_upload(upload)
+
+    result = run_structure_check(document, is_docx=False)
+
+    assert "1.2 Scope" in result["matched"]
+    assert parse_document(document) == parse_sections_with_bodies(SAMPLE_TXT.decode("utf-8"))
+
+
+# ✅ Test .txt files are parsed by streaming, without decoding the whole text
+def test_parse_path_streams_text(tmp_path, monkeypatch):
+    path = tmp_path / "spec.txt"
+    path.write_bytes(SAMPLE_TXT.replace(b"start", b"d\xe9marrer"))  # cp1252
+    clear_ingestion_cache()
+    monkeypatch.setattr(ingestion, "decode_text", lambda *args: pytest.fail("decoded whole"))
+
+    sections = parse_path(str(path))
+
+    assert sections == parse_sections_with_bodies(path.read_bytes().decode("cp1252"))
+    assert parse_path(str(tmp_path / "spec.pdf")) is None
+
+
+# ✅ Test a cached document with the same content is reused
+def test_parse_path_reuses_cached_document(tmp_path, monkeypatch):
+    path = tmp_path / "spec.txt"
+    path.write_bytes(SAMPLE_TXT)
+    ingest_bytes(SAMPLE_TXT, "upload.txt")
+    monkeypatch.setattr(ingestion, "iter_text_chunks", lambda *args: pytest.fail("re-decoded"))
+
+    assert parse_path(str(path)) == parse_sections_with_bodies(SAMPLE_TXT.decode("utf-8"))
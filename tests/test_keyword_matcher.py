@@ -0,0 +1,94 @@
+"""
+Tests for the compiled multi-keyword matcher.
+"""
+
+import random
+
+import pytest
+
+import app.keyword_matcher as keyword_matcher
+from app.keyword_matcher import KeywordMatcher, stem
+
+TAXONOMY = {
+    "Authentication": ["login", "access"],
+    "Security": ["encryption", "access control"],
+    "Data Handling": ["data", "store"],
+}
+
+
+# ✅ Test every category with a keyword is reported, in taxonomy order
+def test_match_reports_all_categories():
+    matcher = KeywordMatcher(TAXONOMY)
+    assert matcher.match("Stored DATA needs LOGIN.") == ["Authentication", "Data Handling"]
+    assert matcher.match("Nothing relevant here.") == []
+
+
+# ✅ Test a keyword inside a longer match still counts ("access" in "access control")
+def test_match_overlapping_keywords():
+    matcher = KeywordMatcher(TAXONOMY)
+    assert matcher.match("Enforce access control.") == ["Authentication", "Security"]
+
+
+# ✅ Test word-boundary mode ignores keywords inside other words
+def test_word_boundary_mode():
+    substring = KeywordMatcher(TAXONOMY)
+    bounded = KeywordMatcher(TAXONOMY, word_boundary=True)
+    assert substring.match("Keep metadata.") == ["Data Handling"]
+    assert bounded.match("Keep metadata.") == []
+    assert bounded.match("Keep the data.") == ["Data Handling"]
+    assert bounded.match("See access controller.") == ["Authentication"]
+
+
+# ✅ Test stem mode matches inflected forms
+def test_stem_mode():
+    matcher = KeywordMatcher(TAXONOMY, stem=True)
+    assert matcher.match("Files are encrypted and stored.") == [
+        "Security",
+        "Data Handling",
+    ]
+    assert stem("encrypted") == stem("encryption")
+    assert stem("retries") == stem("retry")
+
+
+# ✅ Test the compiled scan agrees with a keyword-by-keyword check, including
+# keywords that overlap across match boundaries
+@pytest.mark.parametrize("word_boundary", [False, True])
+def test_compiled_scan_matches_brute_force(monkeypatch, word_boundary):
+    import re
+
+    monkeypatch.setattr(keyword_matcher, "SMALL_TAXONOMY_KEYWORDS", 0)
+    rng = random.Random(3)
+    for _ in range(300):
+        taxonomy = {
+            f"c{i}": [
+                "".join(rng.choice("ab -") for _ in range(rng.randint(1, 5))).strip()
+                or "a"
+                for _ in range(rng.randint(1, 3))
+            ]
+            for i in range(rng.randint(1, 4))
+        }
+        matcher = KeywordMatcher(taxonomy, word_boundary=word_boundary)
+        for _ in range(10):
+            text = "".join(rng.choice("ab -") for _ in range(rng.randint(0, 20)))
+            expected = [
+                category
+                for category, keywords in taxonomy.items()
+                if any(
+                    re.search(rf"\b{re.escape(k)}\b", text)
+                    if word_boundary
+                    else k in text
+                    for k in keywords
+                )
+            ]
+            assert matcher.match(text) == expected, (taxonomy, text)
+
+
+# ✅ Test group() returns every category and can place an item in several
+def test_group_buckets_items():
+    matcher = KeywordMatcher(TAXONOMY)
+    items = [{"text": "login and access control"}, {"text": "none"}]
+    grouped = matcher.group(items)
+    assert list(grouped) == list(TAXONOMY)
+    assert grouped["Authentication"] == [items[0]]
+    assert grouped["Security"] == [items[0]]
+    assert grouped["Data Handling"] == []
@@ -1,14 +1,25 @@
+import asyncio
+import json
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import AsyncMock, patch, MagicMock
 from app.llm import (
     analyze_requirement,
     suggest_tests,
     compare_toc_sections_with_llm,
     llm_group_requirement,
     summarize_analysis,
+    analyze_sections,
+    gather_bounded,
+    analyze_with_tests,
+    parse_combined_response,
+    llm_group_requirements_batch,
 )
 
 
+def _mock_response(content):
+    return MagicMock(choices=[MagicMock(message=MagicMock(content=content))])
+
+
 @pytest.fixture(autouse=True)
 def mock_all_llm(monkeypatch):
     import app.llm
@@ -328,3 +339,337 @@ def test_analyze_requirement_returns_clean_output(mock_get_client):
         "The system shall log off after 10 minutes of inactivity."
     )
     assert result.strip().startswith("✅")
+
+
+# ✅ Test that gather_bounded keeps input order and never exceeds the limit
+def test_gather_bounded_preserves_order_and_limit():
+    in_flight = 0
+    peak = 0
+
+    async def worker(n):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.001 * (5 - n % 5))
+        in_flight -= 1
+        return n * 2
+
+    result = asyncio.run(gather_bounded(list(range(20)), worker, max_concurrency=3))
+
+    assert result == [n * 2 for n in range(20)]
+    assert peak <= 3
+
+
+# ✅ Test that concurrent gather_bounded calls can share one limit
+def test_gather_bounded_shared_semaphore():
+    in_flight = 0
+    peak = 0
+
+    async def worker(n):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.001)
+        in_flight -= 1
+        return n
+
+    async def run_both():
+        shared = asyncio.Semaphore(2)
+        return await asyncio.gather(
+            gather_bounded(list(range(10)), worker, max_concurrency=8, semaphore=shared),
+            gather_bounded(list(range(10)), worker, max_concurrency=8, semaphore=shared),
+        )
+
+    first, second = asyncio.run(run_both())
+
+    assert first == second == list(range(10))
+    assert peak == 2
+
+
+# ✅ Test that analyze_sections runs analysis + tests and skips tests for short bodies
+def test_analyze_sections_skips_tests_for_short_bodies():
+    mock_client = MagicMock()
+    mock_client.chat.completions.create = AsyncMock(
+        side_effect=lambda **kwargs: _mock_response(
+            kwargs["messages"][-1]["content"][-10:]
+        )
+    )
+
+    with patch("app.llm.get_async_client", return_value=mock_client):
+        results = analyze_sections(
+            ["The system shall log off after 10 minutes.", "Too short."],
+            combined=False,
+        )
+
+    assert results[0]["analysis"] == "0 minutes."
+    assert results[0]["tests"] == "0 minutes."
+    assert results[1]["analysis"].startswith("Skipped analysis")
+    assert results[1]["tests"].startswith("⚠️ Skipped")
+    assert mock_client.chat.completions.create.await_count == 2
+
+
+# ✅ Test that the combined call returns analysis and tests from one request
+def test_analyze_with_tests_single_call():
+    mock_client = MagicMock()
+    mock_client.chat.completions.create.return_value = _mock_response(
+        '{"analysis": "✅ This requirement is well-defined and testable.", "tests": "- Wait 10 minutes"}'
+    )
+
+    with patch("app.llm.get_client", return_value=mock_client):
+        result = analyze_with_tests("The system shall log off after 10 minutes.")
+
+    assert result["analysis"].startswith("✅")
+    assert result["tests"] == "- Wait 10 minutes"
+    assert mock_client.chat.completions.create.call_count == 1
+    kwargs = mock_client.chat.completions.create.call_args.kwargs
+    assert kwargs["response_format"] == {"type": "json_object"}
+
+
+# ✅ Test that a schema-violating combined response falls back to two calls
+def test_analyze_with_tests_falls_back_on_invalid_json():
+    mock_client = MagicMock()
+    mock_client.chat.completions.create.return_value = _mock_response(
+        '{"analysis": "Only analysis"}'
+    )
+
+    with patch("app.llm.get_client", return_value=mock_client):
+        result = analyze_with_tests("The system shall log off after 10 minutes.")
+
+    # The two-call path is mocked by the autouse mock_all_llm fixture
+    assert result == {
+        "analysis": "🧪 Mocked analysis",
+        "tests": "🧪 Mocked test suggestion",
+    }
+    assert mock_client.chat.completions.create.call_count == 1
+
+
+# ✅ Test that short input is skipped without any call in combined mode
+def test_analyze_with_tests_skips_short_input():
+    with patch("app.llm.get_client") as mock_get_client:
+        result = analyze_with_tests("Too short.")
+
+    assert result["analysis"].startswith("Skipped analysis")
+    assert result["tests"].startswith("⚠️ Skipped")
+    mock_get_client.assert_not_called()
+
+
+# ✅ Test combined-response validation
+def test_parse_combined_response_validation():
+    assert parse_combined_response('{"analysis": " A ", "tests": "- T"}') == {
+        "analysis": "A",
+        "tests": "- T",
+    }
+    assert parse_combined_response("not json") is None
+    assert parse_combined_response('{"analysis": 1, "tests": "- T"}') is None
+    assert parse_combined_response('["analysis", "tests"]') is None
+
+
+# ✅ Test that the engine uses one request per section in combined mode
+def test_analyze_sections_combined_mode():
+    mock_client = MagicMock()
+    mock_client.chat.completions.create = AsyncMock(
+        return_value=_mock_response('{"analysis": "Vague timing.", "tests": "- T1"}')
+    )
+
+    with patch("app.llm.get_async_client", return_value=mock_client):
+        results = analyze_sections(
+            [
+                "The system shall respond quickly to user input.",
+                "The system shall log off after 10 minutes.",
+            ],
+            combined=True,
+            pack=False,
+        )
+
+    assert results == [{"analysis": "Vague timing.", "tests": "- T1"}] * 2
+    assert mock_client.chat.completions.create.await_count == 2
+
+
+# ✅ Test that many requirements are classified with a single batched call
+@patch("app.llm.get_client")
+def test_llm_group_requirements_batch_single_call(mock_get_client):
+    mock_client = MagicMock()
+    mock_client.chat.completions.create.return_value = _mock_response(
+        '{"1": ["Authentication"], "2": ["Error Handling", 7]}'
+    )
+    mock_get_client.return_value = mock_client
+
+    result = llm_group_requirements_batch(
+        [
+            "The system shall authenticate users with a password.",
+            "Short one.",
+            "The system shall retry failed uploads three times.",
+        ]
+    )
+
+    assert result == [["Authentication"], [], ["Error Handling"]]
+    assert mock_client.chat.completions.create.call_count == 1
+    user_message = mock_client.chat.completions.create.call_args.kwargs["messages"][1]
+    assert user_message["content"].startswith("1. The system shall authenticate")
+
+
+# ✅ Test that the token budget splits requirements into several batches
+@patch("app.llm.get_client")
+def test_llm_group_requirements_batch_respects_budget(mock_get_client):
+    mock_client = MagicMock()
+    mock_client.chat.completions.create.side_effect = lambda **kwargs: _mock_response(
+        '{"1": ["Security"], "2": ["Security"]}'
+    )
+    mock_get_client.return_value = mock_client
+
+    texts = [f"REQ-{i} The system shall encrypt stored record {i}." for i in range(6)]
+    result = llm_group_requirements_batch(texts, token_budget=30)
+
+    assert result == [["Security"]] * 6
+    assert mock_client.chat.completions.create.call_count == 3
+
+
+# ✅ Test that a malformed batch is split and retried down to single calls
+@patch("app.llm.get_client")
+def test_llm_group_requirements_batch_splits_failed_batch(mock_get_client):
+    responses = iter(
+        [
+            _mock_response("not json"),  # batch of 2 fails
+            _mock_response('["Authentication"]'),  # single retry 1
+            _mock_response('["Data Handling"]'),  # single retry 2
+        ]
+    )
+    mock_client = MagicMock()
+    mock_client.chat.completions.create.side_effect = lambda **kwargs: next(responses)
+    mock_get_client.return_value = mock_client
+
+    result = llm_group_requirements_batch(
+        [
+            "The system shall authenticate users with a password.",
+            "The system shall store every record in the database.",
+        ]
+    )
+
+    assert result == [["Authentication"], ["Data Handling"]]
+    assert mock_client.chat.completions.create.call_count == 3
+
+
+# ✅ Test that short sections share one packed request and are demultiplexed
+def test_analyze_sections_packs_short_sections():
+    packed = {
+        "1": {"analysis": "Vague timing.", "tests": "- T1"},
+        "2": {"analysis": "✅ Clear.", "tests": "- T2"},
+    }
+    mock_client = MagicMock()
+    mock_client.chat.completions.create = AsyncMock(
+        return_value=_mock_response(json.dumps(packed))
+    )
+
+    with patch("app.llm.get_async_client", return_value=mock_client):
+        results = analyze_sections(
+            [
+                "The system shall respond quickly to user input.",
+                "Tiny.",
+                "The system shall log off after 10 minutes.",
+            ],
+            combined=True,
+            pack=True,
+        )
+
+    assert results[0] == {"analysis": "Vague timing.", "tests": "- T1"}
+    assert results[1]["analysis"].startswith("Skipped analysis")
+    assert results[2] == {"analysis": "✅ Clear.", "tests": "- T2"}
+    assert mock_client.chat.completions.create.await_count == 1
+    content = mock_client.chat.completions.create.call_args.kwargs["messages"][1][
+        "content"
+    ]
+    assert "### Section 2\nThe system shall log off" in content
+
+
+# ✅ Test that sections missing from a packed answer are retried on their own
+def test_analyze_sections_pack_retries_missing_items():
+    responses = iter(
+        [
+            _mock_response('{"1": {"analysis": "A1", "tests": "- T1"}}'),
+            _mock_response('{"analysis": "A2", "tests": "- T2"}'),
+        ]
+    )
+    mock_client = MagicMock()
+    mock_client.chat.completions.create = AsyncMock(
+        side_effect=lambda **kwargs: next(responses)
+    )
+
+    with patch("app.llm.get_async_client", return_value=mock_client):
+        results = analyze_sections(
+            [
+                "The system shall respond quickly to user input.",
+                "The system shall log off after 10 minutes.",
+            ],
+            pack=True,
+        )
+
+    assert results == [
+        {"analysis": "A1", "tests": "- T1"},
+        {"analysis": "A2", "tests": "- T2"},
+    ]
+    assert mock_client.chat.completions.create.await_count == 2
+
+
+# ✅ Test that oversized sections are split into chunks and the answers joined
+def test_analyze_sections_splits_oversized_section():
+    mock_client = MagicMock()
+    mock_client.chat.completions.create = AsyncMock(
+        return_value=_mock_response('{"analysis": "Chunk ok.", "tests": "- T"}')
+    )
+    huge = "\n\n".join(["The system shall record every event. " * 300] * 3)
+
+    with patch("app.llm.get_async_client", return_value=mock_client):
+        [result] = analyze_sections([huge], pack=True)
+
+    calls = mock_client.chat.completions.create.await_count
+    assert calls > 1
+    assert result["analysis"].count("Chunk ok.") == calls
+    assert f"**Part {calls}/{calls}**" in result["tests"]
+
+
+def _tracking_client(responder):
+    # Async client mock that records the peak number of requests in flight
+    state = {"in_flight": 0, "peak": 0}
+
+    async def create(**kwargs):
+        state["in_flight"] += 1
+        state["peak"] = max(state["peak"], state["in_flight"])
+        await asyncio.sleep(0.005)
+        state["in_flight"] -= 1
+        return _mock_response(responder(kwargs))
+
+    client = MagicMock()
+    client.chat.completions.create = AsyncMock(side_effect=create)
+    return client, state
+
+
+# ✅ Test that packed retries run concurrently within the caller's limit
+def test_analyze_sections_pack_retries_respect_limit():
+    def respond(kwargs):
+        if kwargs["response_format"] and "### Section" in kwargs["messages"][1]["content"]:
+            return "{}"  # a truncated packed answer: every section is retried
+        return '{"analysis": "A", "tests": "- T"}'
+
+    client, state = _tracking_client(respond)
+    bodies = [f"The system shall record audit event {i}." for i in range(8)]
+
+    with patch("app.llm.get_async_client", return_value=client):
+        results = analyze_sections(bodies, max_concurrency=3, pack=True)
+
+    assert results == [{"analysis": "A", "tests": "- T"}] * 8
+    assert client.chat.completions.create.await_count == 1 + 8
+    assert 1 < state["peak"] <= 3
+
+
+# ✅ Test that an oversized section's chunks share the caller's limit
+def test_analyze_sections_oversized_chunks_respect_limit():
+    client, state = _tracking_client(lambda kwargs: '{"analysis": "A", "tests": "- T"}')
+    huge = "\n\n".join(["The system shall record every event. " * 300] * 6)
+
+    with patch("app.llm.get_async_client", return_value=client):
+        [result] = analyze_sections([huge], max_concurrency=2, pack=True)
+
+    calls = client.chat.completions.create.await_count
+    assert calls > 2
+    assert state["peak"] == 2
+    assert f"**Part {calls}/{calls}**" in result["analysis"]
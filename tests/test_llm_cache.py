@@ -0,0 +1,201 @@
+import multiprocessing
+import sqlite3
+from unittest.mock import MagicMock, patch
+from app.llm_cache import LLMCache, bypass_cache, get_cache, make_cache_key
+from app.llm import analyze_requirement
+
+
+def _messages(text):
+    return [{"role": "user", "content": text}]
+
+
+# ✅ Test that cosmetic whitespace does not change the key, but parameters do
+def test_make_cache_key_normalizes_input():
+    base = make_cache_key("gpt-4", "analysis:1", 0.2, _messages("Shall log in.\n"))
+
+    assert base == make_cache_key(
+        "gpt-4", "analysis:1", 0.2, _messages("  Shall log in.   \r\n")
+    )
+    assert base != make_cache_key(
+        "gpt-4", "analysis:2", 0.2, _messages("Shall log in.")
+    )
+    assert base != make_cache_key(
+        "gpt-4", "analysis:1", 0.4, _messages("Shall log in.")
+    )
+    assert base != make_cache_key(
+        "gpt-3.5", "analysis:1", 0.2, _messages("Shall log in.")
+    )
+
+
+# ✅ Test basic hit/miss accounting
+def test_cache_get_set_and_stats(tmp_path):
+    cache = LLMCache(str(tmp_path / "cache.sqlite3"))
+
+    assert cache.get("k") is None
+    cache.set("k", "value")
+    assert cache.get("k") == "value"
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["entries"] == 1
+
+
+# ✅ Test that expired entries are treated as misses
+def test_cache_ttl_expiry(tmp_path):
+    cache = LLMCache(str(tmp_path / "cache.sqlite3"), ttl_seconds=-1)
+    cache.set("k", "value")
+
+    assert cache.get("k") is None
+    assert cache.stats()["entries"] == 0
+
+
+# ✅ Test that least-recently-used entries are evicted first
+def test_cache_lru_eviction(tmp_path):
+    cache = LLMCache(str(tmp_path / "cache.sqlite3"), max_entries=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.get("a")  # "b" is now least recently used
+    cache.set("c", "3")
+
+    assert cache.get("a") == "1"
+    assert cache.get("b") is None
+    assert cache.get("c") == "3"
+
+
+# ✅ Test that the byte limit also triggers eviction
+def test_cache_size_eviction(tmp_path):
+    cache = LLMCache(str(tmp_path / "cache.sqlite3"), max_bytes=10)
+    cache.set("a", "x" * 6)
+    cache.set("b", "y" * 6)
+
+    assert cache.stats()["bytes"] <= 10
+    assert cache.get("b") == "y" * 6
+
+
+# ✅ Test that the running totals follow overwrites, evictions and expiry
+def test_cache_totals_match_table(tmp_path):
+    cache = LLMCache(str(tmp_path / "cache.sqlite3"), max_entries=3)
+    for i in range(5):
+        cache.set(f"k{i}", "x" * (i + 1))
+    cache.set("k4", "short")
+    cache.get("missing")
+
+    conn = cache._connect()
+    count, total = conn.execute(
+        "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+    ).fetchone()
+    stats = cache.stats()
+    assert (stats["entries"], stats["bytes"]) == (count, total) == (3, 3 + 4 + 5)
+
+    cache.clear()
+    assert (cache.stats()["entries"], cache.stats()["bytes"]) == (0, 0)
+
+
+# ✅ Test that totals are seeded from a cache file written before they existed
+def test_cache_totals_seeded_from_existing_file(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = LLMCache(path)
+    cache.set("a", "abc")
+    conn = cache._connect()
+    conn.execute("DELETE FROM counters WHERE name IN ('entries', 'bytes')")
+
+    assert LLMCache(path).stats()["entries"] == 1
+    assert LLMCache(path).stats()["bytes"] == 3
+
+
+# ✅ Test lookups never take the write lock, even for hits and expired entries
+def test_cache_get_is_read_only(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = LLMCache(path, flush_every=1000)
+    cache.set("fresh", "value")
+    writer = sqlite3.connect(path, isolation_level=None, timeout=0)
+    writer.execute("BEGIN IMMEDIATE")  # another process holds the writer lock
+    try:
+        cache._connect().execute("PRAGMA busy_timeout=0")
+        assert cache.get("fresh") == "value"
+        assert cache.get("missing") is None
+        cache.ttl_seconds = -1
+        assert cache.get("fresh") is None
+    finally:
+        writer.execute("ROLLBACK")
+
+    stats = cache.stats()  # flushes the pending batch
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 2, 0)
+
+
+# ✅ Test pending counts are written every `flush_every` lookups
+def test_cache_flushes_counters_in_batches(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = LLMCache(path, flush_every=3)
+    cache.set("k", "v")
+
+    def stored_hits():
+        conn = sqlite3.connect(path)
+        try:
+            return conn.execute("SELECT value FROM counters WHERE name = 'hits'").fetchone()[0]
+        finally:
+            conn.close()
+
+    cache.get("k")
+    cache.get("k")
+    assert stored_hits() == 0
+    cache.get("k")
+    assert stored_hits() == 3
+
+
+def _write_entries(path, prefix):
+    cache = LLMCache(path)
+    for i in range(50):
+        cache.set(f"{prefix}-{i}", str(i))
+
+
+# ✅ Test that several processes can write to the same cache file
+def test_cache_is_shared_across_processes(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    LLMCache(path)
+    ctx = multiprocessing.get_context("spawn")
+    procs = [ctx.Process(target=_write_entries, args=(path, p)) for p in "abc"]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+
+    assert all(p.exitcode == 0 for p in procs)
+    assert LLMCache(path).stats()["entries"] == 150
+
+
+# ✅ Test that a cached analysis is served without a second API call
+def test_analyze_requirement_uses_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("SPECSENSE_LLM_CACHE", "on")
+    monkeypatch.setenv("SPECSENSE_LLM_CACHE_PATH", str(tmp_path / "llm.sqlite3"))
+
+    mock_client = MagicMock()
+    mock_client.chat.completions.create.return_value = MagicMock(
+        choices=[MagicMock(message=MagicMock(content="Cached analysis"))]
+    )
+    text = "The system shall log off after 10 minutes of inactivity."
+
+    with patch("app.llm.get_client", return_value=mock_client):
+        assert analyze_requirement(text) == "Cached analysis"
+        assert analyze_requirement(text) == "Cached analysis"
+        with bypass_cache():
+            assert get_cache() is None
+            analyze_requirement(text)
+
+    assert mock_client.chat.completions.create.call_count == 2
+
+
+# ✅ Test that API errors are never written to the cache
+def test_errors_are_not_cached(tmp_path, monkeypatch):
+    monkeypatch.setenv("SPECSENSE_LLM_CACHE", "on")
+    monkeypatch.setenv("SPECSENSE_LLM_CACHE_PATH", str(tmp_path / "llm.sqlite3"))
+
+    mock_client = MagicMock()
+    mock_client.chat.completions.create.side_effect = Exception("Mock API failure")
+    text = "The system shall log off after 10 minutes of inactivity."
+
+    with patch("app.llm.get_client", return_value=mock_client):
+        assert analyze_requirement(text).startswith("OpenAI error")
+
+    assert get_cache().stats()["entries"] == 0
@@ -0,0 +1,177 @@
+import asyncio
+import gc
+import threading
+import pytest
+from app import llm_client
+
+
+@pytest.fixture(autouse=True)
+def fake_builder(monkeypatch):
+    built = []
+
+    def fake_build_client(api_key, is_async, settings):
+        client = {"api_key": api_key, "is_async": is_async, "settings": settings}
+        built.append(client)
+        return client
+
+    monkeypatch.setattr(llm_client, "_build_client", fake_build_client)
+    llm_client.reset_clients()
+    yield built
+    llm_client.reset_clients()
+
+
+# ✅ Test that repeated lookups reuse the same pooled client
+def test_shared_client_is_reused(fake_builder):
+    first = llm_client.get_shared_client("key-a")
+    second = llm_client.get_shared_client("key-a")
+
+    assert first is second
+    assert len(fake_builder) == 1
+
+
+# ✅ Test that different API keys get separate clients
+def test_shared_client_per_api_key(fake_builder):
+    assert llm_client.get_shared_client("key-a") is not llm_client.get_shared_client(
+        "key-b"
+    )
+    assert len(fake_builder) == 2
+
+
+# ✅ Test that concurrent first use still builds exactly one client
+def test_shared_client_thread_safe(fake_builder):
+    results = []
+
+    def grab():
+        results.append(llm_client.get_shared_client("key-a"))
+
+    threads = [threading.Thread(target=grab) for _ in range(16)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(fake_builder) == 1
+    assert all(r is results[0] for r in results)
+
+
+# ✅ Test that configure_clients swaps the base URL and drops cached clients
+def test_configure_clients_sets_base_url(fake_builder):
+    old = llm_client.get_shared_client("key-a")
+    settings = llm_client.configure_clients(
+        base_url="http://127.0.0.1:8089/v1", max_connections=5
+    )
+    new = llm_client.get_shared_client("key-a")
+
+    assert settings["base_url"] == "http://127.0.0.1:8089/v1"
+    assert new is not old
+    assert new["settings"]["max_connections"] == 5
+
+
+# ❌ Test that unknown settings are rejected
+def test_configure_clients_rejects_unknown_setting():
+    with pytest.raises(ValueError):
+        llm_client.configure_clients(pool_size=3)
+
+
+# ✅ Test that async clients are scoped to the running event loop
+def test_async_clients_are_per_loop(fake_builder):
+    async def grab():
+        return llm_client.get_shared_client("key-a", is_async=True)
+
+    loop = asyncio.new_event_loop()
+    try:
+        first = loop.run_until_complete(grab())
+        second = loop.run_until_complete(grab())
+    finally:
+        loop.close()
+    other = asyncio.run(grab())
+
+    assert first is second
+    assert other is not first
+    assert first["is_async"] is True
+
+
+# ✅ Test that a finished event loop's async clients are dropped with it
+def test_async_clients_released_with_loop(fake_builder):
+    async def grab():
+        return llm_client.get_shared_client("key-a", is_async=True)
+
+    asyncio.run(grab())
+    gc.collect()
+
+    assert len(llm_client._async_clients) == 0
+
+
+# ✅ Test that close_shared_clients closes and forgets the loop's clients
+def test_close_shared_clients(monkeypatch):
+    closed = []
+
+    class FakeAsyncClient:
+        async def close(self):
+            closed.append(self)
+
+    monkeypatch.setattr(llm_client, "_build_client", lambda *args: FakeAsyncClient())
+
+    async def run():
+        first = llm_client.get_shared_client("key-a", is_async=True)
+        await llm_client.close_shared_clients()
+        return first, llm_client.get_shared_client("key-a", is_async=True)
+
+    first, second = asyncio.run(run())
+
+    assert closed == [first]
+    assert second is not first
+
+
+# ✅ Test that HTTP/2 is off unless requested
+def test_http2_off_by_default(monkeypatch):
+    monkeypatch.delenv("SPECSENSE_HTTP2", raising=False)
+    llm_client.reset_clients()
+
+    assert llm_client.get_shared_client("key-a")["settings"]["http2"] is False
+
+
+class ClosableClient:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class AsyncClosableClient(ClosableClient):
+    async def close(self):
+        self.closed = True
+
+
+# ✅ Test reconfiguring closes the sync clients it drops
+def test_configure_clients_closes_dropped_clients(monkeypatch):
+    monkeypatch.setattr(llm_client, "_build_client", lambda *args: ClosableClient())
+    client = llm_client.get_shared_client("key-a")
+
+    llm_client.configure_clients(max_connections=5)
+
+    assert client.closed
+    assert llm_client.get_shared_client("key-a") is not client
+
+
+# ✅ Test async clients of a running loop are closed on that loop
+def test_reset_clients_closes_async_clients_on_their_loop(monkeypatch):
+    monkeypatch.setattr(llm_client, "_build_client", lambda *args: AsyncClosableClient())
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever)
+    thread.start()
+    try:
+
+        async def grab():
+            return llm_client.get_shared_client("key-a", is_async=True)
+
+        client = asyncio.run_coroutine_threadsafe(grab(), loop).result(5)
+        llm_client.reset_clients()
+        asyncio.run_coroutine_threadsafe(asyncio.sleep(0.01), loop).result(5)
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(5)
+        loop.close()
+
+    assert client.closed
@@ -0,0 +1,78 @@
+from app.packing import (
+    MAX_PACK_COMPLETION_TOKENS,
+    MAX_PACK_SECTIONS,
+    MIN_CHUNK_CHARS,
+    PACK_COMPLETION_TOKENS,
+    estimate_tokens,
+    pack_sections,
+    split_oversized,
+)
+
+
+# ✅ Test that short sections are packed together under the budget
+def test_pack_sections_groups_short_sections():
+    bodies = ["a" * 40, "b" * 2000, "c" * 40, "d" * 400]
+    groups = pack_sections(bodies, token_budget=120, packable_tokens=100)
+
+    assert sorted(i for group in groups for i in group) == [0, 1, 2, 3]
+    assert [0, 2, 3] in groups
+    assert [1] in groups  # too large to share a request
+
+
+# ✅ Test that the budget caps how many sections share one request
+def test_pack_sections_respects_budget():
+    bodies = ["x" * 200] * 5  # 50 tokens each
+    groups = pack_sections(bodies, token_budget=100, packable_tokens=100)
+
+    assert [len(g) for g in groups] == [2, 2, 1]
+    for group in groups:
+        assert sum(estimate_tokens(bodies[i]) for i in group) <= 100
+
+
+# ✅ Test that many tiny sections are split so each answer fits the completion cap
+def test_pack_sections_caps_sections_per_request():
+    bodies = ["The system shall log in."] * 35  # far under the token budget together
+    groups = pack_sections(bodies)
+
+    assert MAX_PACK_SECTIONS * PACK_COMPLETION_TOKENS <= MAX_PACK_COMPLETION_TOKENS
+    assert max(len(g) for g in groups) == MAX_PACK_SECTIONS
+    assert len(groups) == 4
+    assert sorted(i for group in groups for i in group) == list(range(35))
+
+
+# ✅ Test that an empty input produces no groups
+def test_pack_sections_empty():
+    assert pack_sections([]) == []
+
+
+# ✅ Test that text within the limit is not split
+def test_split_oversized_keeps_small_text():
+    assert split_oversized("Short body.", max_tokens=10) == ["Short body."]
+
+
+# ✅ Test that oversized text splits on paragraph and line boundaries
+def test_split_oversized_prefers_boundaries():
+    paragraph = "\n".join(["line of requirement text"] * 10)  # ~240 chars
+    text = "\n\n".join([paragraph] * 4)
+
+    chunks = split_oversized(text, max_tokens=70)
+
+    assert all(estimate_tokens(c) <= 70 for c in chunks)
+    assert all(not c.startswith("ine") for c in chunks)  # no mid-line cuts
+    assert "".join(chunks).replace("\n", "") == text.replace("\n", "")
+
+
+# ✅ Test that a single huge line is hard-cut as a last resort
+def test_split_oversized_hard_cuts_long_lines():
+    chunks = split_oversized("x" * 1000, max_tokens=100)
+
+    assert [len(c) for c in chunks] == [400, 400, 200]
+
+
+# ✅ Test that a short trailing paragraph joins the previous chunk instead of standing alone
+def test_split_oversized_merges_short_trailing_chunk():
+    body = "x" * 398
+    chunks = split_oversized(f"{body}\n\nEnd.", max_tokens=100)
+
+    assert chunks == [f"{body}\nEnd."]
+    assert all(len(c) >= MIN_CHUNK_CHARS for c in split_oversized("y" * 405, max_tokens=100))
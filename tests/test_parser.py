@@ -1,6 +1,19 @@
+import io
 import textwrap
-from app.parser import extract_sections, parse_sections_with_bodies, strip_title_block
-from app.header_rules import is_all_caps_header, is_markdown_header, is_numbered_header
+from app.parser import (
+    _chunk_boundaries,
+    extract_sections,
+    iter_sections,
+    parse_sections_parallel,
+    parse_sections_with_bodies,
+    strip_title_block,
+)
+from app.header_rules import (
+    classify_line,
+    is_all_caps_header,
+    is_markdown_header,
+    is_numbered_header,
+)
 
 
 # Test basic markdown headers are correctly extracted
@@ -303,3 +316,85 @@ Body under real header
     assert sections[0]["title"] == "Unknown Header"
     assert "First line with no header" in sections[0]["body"]
     assert sections[1]["title"] == "Real Header"
+
+
+STREAM_SAMPLE = (
+    "Software Requirements Specification\r\n"
+    "Version: 1.0\r\n"
+    "\r\n"
+    "1. Introduction ........ 1\r\n"
+    "Loose intro line\n"
+    "\n"
+    "SYSTEM FEATURES\n"
+    "REQ-001 The system shall log in users.\x0cID: NFR-7 Page break body\n"
+    "3.1 Login\n"
+    "body text\n"
+    "NOT A HEADER\n"
+    "body text\n"
+    "\n"
+    "Scope\n"
+    "LAST"
+)
+
+
+# Test the streaming parser yields exactly what the list API returns
+def test_iter_sections_matches_list_api():
+    expected = parse_sections_with_bodies(STREAM_SAMPLE)
+
+    assert list(iter_sections(STREAM_SAMPLE)) == expected
+    assert list(iter_sections(io.StringIO(STREAM_SAMPLE, newline=""))) == expected
+    assert list(iter_sections(STREAM_SAMPLE.splitlines())) == expected
+    assert [s["title"] for s in expected] == [
+        "Unknown Header",
+        "SYSTEM FEATURES",
+        "Login",
+        "Scope",
+        "LAST",
+    ]
+
+
+# Test sections are yielded as soon as the next header closes them
+def test_iter_sections_is_lazy():
+    consumed = []
+
+    def lines():
+        for line in ["# One", "Body one", "# Two", "Body two", "# Three"]:
+            consumed.append(line)
+            yield line
+
+    sections = iter_sections(lines())
+    first = next(sections)
+
+    assert first["title"] == "One"
+    assert consumed == ["# One", "Body one", "# Two", "Body two"]
+
+
+def _large_document():
+    lines = ["Software Requirements Specification", "Version: 2.0", ""]
+    lines += [f"{n}. Chapter {n} ........ {n}" for n in range(1, 6)]
+    for n in range(1, 120):
+        lines += ["", f"# {n} Section {n}", f"REQ-{n:03} The system shall do {n}."]
+        lines += ["", "Project: Alpha" if n % 7 == 0 else "LOGIN FLOW", ""]
+        lines += [f"{n}. Late TOC-like line ........ {n}", "body continues here"]
+    return "\n".join(lines)
+
+
+# Test parallel parsing returns exactly the serial result across many chunks
+def test_parse_sections_parallel_matches_serial():
+    text = _large_document()
+    expected = parse_sections_with_bodies(text)
+
+    assert parse_sections_parallel(text, workers=2, chunk_lines=25) == expected
+    assert parse_sections_parallel(text, workers=1, chunk_lines=25) == expected
+
+
+# Test chunks are only cut at a blank line followed by a header past the TOC window
+def test_chunk_boundaries_are_safe():
+    lines = strip_title_block(_large_document().splitlines())
+    boundaries = _chunk_boundaries(lines, 25)
+
+    assert boundaries[0] == 0 and len(boundaries) > 5
+    for k in boundaries[1:]:
+        assert k >= 40
+        assert not lines[k - 1].strip()
+        assert classify_line(lines[k].strip(), lines[k - 1], lines[k + 1])[0]
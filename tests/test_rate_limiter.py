@@ -0,0 +1,183 @@
+import asyncio
+from types import SimpleNamespace
+import pytest
+from app.rate_limiter import (
+    RateLimiter,
+    TokenBucket,
+    is_retryable,
+    retry_after_seconds,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class HTTPError(Exception):
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.response = SimpleNamespace(headers=headers or {})
+
+
+def make_limiter(limits=None, max_retries=3):
+    clock = FakeClock()
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        clock.sleep(seconds)
+
+    limiter = RateLimiter(limits, max_retries=max_retries, clock=clock, sleep=sleep)
+    return limiter, clock, sleeps
+
+
+# ✅ Test that a bucket hands out its capacity, then asks callers to wait
+def test_token_bucket_reserve_and_refill():
+    clock = FakeClock()
+    bucket = TokenBucket(capacity=2, rate=1.0, clock=clock)
+
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == pytest.approx(1.0)
+    assert bucket.reserve() == pytest.approx(2.0)  # queued behind the previous caller
+
+    clock.now = 10.0
+    assert bucket.reserve() == 0.0
+
+
+# ✅ Test that requests-per-minute limits throttle and are recorded in metrics
+def test_rate_limiter_enforces_rpm():
+    limiter, _, sleeps = make_limiter({"m": {"rpm": 60, "tpm": 1_000_000}})
+
+    for _ in range(62):
+        limiter.acquire("m", tokens=10)
+
+    assert sum(sleeps) == pytest.approx(2.0)
+    metrics = limiter.metrics()["m"]
+    assert metrics["requests"] == 62
+    assert metrics["throttle_wait_seconds"] == pytest.approx(2.0)
+
+
+# ✅ Test that tokens-per-minute limits throttle large prompts
+def test_rate_limiter_enforces_tpm():
+    limiter, _, sleeps = make_limiter({"m": {"rpm": 1000, "tpm": 600}})
+
+    limiter.acquire("m", tokens=600)
+    limiter.acquire("m", tokens=300)
+
+    assert sleeps == [pytest.approx(30.0)]
+
+
+# ✅ Test that a 429 is retried after the server's Retry-After delay
+def test_call_retries_with_retry_after():
+    limiter, _, sleeps = make_limiter()
+    attempts = iter([HTTPError(429, {"retry-after": "3"}), None])
+
+    def flaky():
+        error = next(attempts)
+        if error:
+            raise error
+        return "ok"
+
+    assert limiter.call("m", 10, flaky) == "ok"
+    assert sleeps == [3.0]
+    metrics = limiter.metrics()["m"]
+    assert metrics["rate_limited"] == 1
+    assert metrics["retries"] == 1
+
+
+# ✅ Test exponential backoff with jitter stays within its bounds
+def test_call_backoff_is_bounded_and_gives_up():
+    limiter, _, sleeps = make_limiter(max_retries=3)
+
+    def always_503():
+        raise HTTPError(503)
+
+    with pytest.raises(HTTPError):
+        limiter.call("m", 10, always_503)
+
+    assert len(sleeps) == 3
+    for attempt, delay in enumerate(sleeps):
+        assert 0 <= delay <= 0.5 * 2**attempt
+
+
+# ❌ Test that non-retryable errors propagate immediately
+def test_call_does_not_retry_non_retryable():
+    limiter, _, sleeps = make_limiter()
+    calls = []
+
+    def broken():
+        calls.append(1)
+        raise ValueError("bad request")
+
+    with pytest.raises(ValueError):
+        limiter.call("m", 10, broken)
+
+    assert len(calls) == 1
+    assert sleeps == []
+
+
+# ✅ Test the async retry path
+def test_call_async_retries():
+    clock = FakeClock()
+    waits = []
+
+    async def fake_async_sleep(seconds):
+        waits.append(seconds)
+        clock.sleep(seconds)
+
+    limiter = RateLimiter(clock=clock, async_sleep=fake_async_sleep)
+    attempts = iter([HTTPError(429, {"retry-after-ms": "250"}), None])
+
+    async def flaky():
+        error = next(attempts)
+        if error:
+            raise error
+        return "ok"
+
+    assert asyncio.run(limiter.call_async("m", 10, flaky)) == "ok"
+    assert waits == [0.25]
+
+
+# ✅ Test error classification helpers
+def test_retry_helpers():
+    assert is_retryable(HTTPError(429))
+    assert is_retryable(HTTPError(502))
+    assert not is_retryable(HTTPError(400))
+    assert not is_retryable(Exception("boom"))
+    assert retry_after_seconds(HTTPError(429, {"retry-after": "2"})) == 2.0
+    assert retry_after_seconds(HTTPError(429, {"retry-after": "soon"})) is None
+    assert retry_after_seconds(Exception("no response")) is None
+
+
+# ✅ Test that LLM entry points retry transient failures through the shared limiter
+def test_analyze_requirement_retries_rate_limit():
+    from unittest.mock import MagicMock, patch
+    from app.llm import analyze_requirement
+    from app.rate_limiter import set_rate_limiter
+
+    limiter, _, sleeps = make_limiter()
+    mock_client = MagicMock()
+    mock_client.chat.completions.create.side_effect = [
+        HTTPError(429, {"retry-after": "1"}),
+        MagicMock(choices=[MagicMock(message=MagicMock(content="Recovered"))]),
+    ]
+
+    set_rate_limiter(limiter)
+    try:
+        with patch("app.llm.get_client", return_value=mock_client):
+            result = analyze_requirement("The system shall log off after 10 minutes.")
+    finally:
+        set_rate_limiter(None)
+
+    assert result == "Recovered"
+    assert sleeps == [1.0]
+    assert limiter.metrics()["gpt-3.5-turbo-0125"]["requests"] == 2
@@ -73,3 +73,22 @@ def test_detect_gaps_no_missing_categories():
     }
     gaps = detect_gaps(grouped)
     assert gaps == []
+
+
+# Test the word-boundary and stemming modes of group_requirements
+def test_group_requirements_matching_modes():
+    requirements = [
+        {"id": "REQ-1", "text": "Metadata shall be indexed."},
+        {"id": "REQ-2", "text": "Passwords are encrypted at rest."},
+    ]
+
+    substring = group_requirements(requirements)
+    bounded = group_requirements(requirements, word_boundary=True)
+    stemmed = group_requirements(requirements, stem=True)
+
+    assert requirements[0] in substring["Data Handling"]
+    assert requirements[0] not in bounded["Data Handling"]
+    assert requirements[1] in substring["Security"]
+    assert requirements[1] not in bounded["Security"]
+    assert requirements[1] in stemmed["Security"]
+    assert requirements[1] in stemmed["Authentication"]
@@ -0,0 +1,66 @@
+import pytest
+
+from app.parser import extract_requirement_statements
+from app.requirement_ids import (
+    RequirementIdRegistry,
+    get_requirement_id_registry,
+    set_requirement_id_registry,
+)
+
+
+@pytest.fixture
+def fresh_registry():
+    set_requirement_id_registry(None)
+    yield
+    set_requirement_id_registry(None)
+
+
+# ✅ Test the first pattern in priority order wins, even when a later one matches earlier
+def test_priority_order_within_a_line():
+    text = "ID: AUTH-1 implements REQ-007\nID: AUTH-2 only\nno ids here"
+
+    assert extract_requirement_statements(text) == [
+        {"id": "REQ-007", "text": "ID: AUTH-1 implements REQ-007"},
+        {"id": "ID: AUTH-2", "text": "ID: AUTH-2 only"},
+    ]
+
+
+# ✅ Test matches are mapped back to their lines, whatever the line separator
+def test_scan_maps_matches_to_lines():
+    registry = RequirementIdRegistry()
+    text = "intro\r\n  REQ-1 first\x0cREQ-2 second\nID:\nAB-9 not a label"
+
+    found = [
+        (text[start:end], match.group()) for start, end, match in registry.scan(text)
+    ]
+
+    assert found == [("  REQ-1 first", "REQ-1"), ("REQ-2 second", "REQ-2")]
+
+
+# ✅ Test patterns can be registered, reordered and removed
+def test_registry_configuration():
+    registry = RequirementIdRegistry()
+    registry.register("story", r"\bUS-\d+\b", index=0)
+
+    assert [name for name, _ in registry.patterns] == ["story", "req", "id_label"]
+    assert registry.search_line("REQ-1 covers US-4").group() == "US-4"
+
+    registry.unregister("story")
+    assert registry.search_line("REQ-1 covers US-4").group() == "REQ-1"
+
+    with pytest.raises(ValueError):
+        registry.register("req", r"\bREQ-\d+\b")
+    with pytest.raises(ValueError):
+        registry.register("broken", r"REQ-(")
+    with pytest.raises(KeyError):
+        registry.unregister("missing")
+
+
+# ✅ Test extra patterns can come from the environment
+def test_patterns_from_environment(monkeypatch, fresh_registry):
+    monkeypatch.setenv("SPECSENSE_REQUIREMENT_ID_PATTERNS", '{"nfr": "\\\\bNFR-\\\\d+\\\\b"}')
+
+    assert [name for name, _ in get_requirement_id_registry().patterns][-1] == "nfr"
+    assert extract_requirement_statements("NFR-12 Uptime 99.9%") == [
+        {"id": "NFR-12", "text": "NFR-12 Uptime 99.9%"}
+    ]
@@ -3,22 +3,32 @@ import io
 import pytest
 from flask import Flask
 from flask_app.web.routes import main
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 
 
 @pytest.fixture
-def client():
+def app():
     app = Flask(__name__, template_folder=os.path.abspath("flask_app/templates"))
     app.config["TESTING"] = True
+    app.secret_key = "test"
     app.register_blueprint(main)
+    return app
+
+
+@pytest.fixture
+def client(app):
     return app.test_client()
 
 
 def test_upload_parses_and_runs_llm(client):
     with patch(
-        "flask_app.web.routes.analyze_requirement", return_value="🧪 Mocked analysis"
-    ), patch(
-        "flask_app.web.routes.suggest_tests", return_value="🧪 Mocked test suggestion"
+        "app.llm.analyze_with_tests_async",
+        new=AsyncMock(
+            return_value={
+                "analysis": "🧪 Mocked analysis",
+                "tests": "🧪 Mocked test suggestion",
+            }
+        ),
     ):
         data = {
             "srs_file": (
@@ -64,3 +74,41 @@ def test_traceability_download_via_text(client):
         assert resp.status_code == 200
         assert resp.mimetype == "text/markdown"
         assert b"Requirement ID" in resp.data
+
+
+def test_upload_reuses_analysis_for_unchanged_revision(client):
+    mock = AsyncMock(return_value={"analysis": "🧪 Mocked", "tests": "🧪 Tests"})
+    with patch("app.llm.analyze_with_tests_async", new=mock):
+        for _ in range(2):
+            data = {
+                "srs_file": (
+                    io.BytesIO(b"# Test Section\nREQ-1 The system shall power on."),
+                    "revised.txt",
+                )
+            }
+            response = client.post(
+                "/upload", data=data, content_type="multipart/form-data"
+            )
+
+    assert response.status_code == 200
+    assert mock.await_count == 1
+    assert "Reused analysis for 1 of".encode() in response.data
+
+
+# ✅ Test that two sessions uploading the same filename do not share history
+def test_upload_history_is_per_session(app):
+    mock = AsyncMock(return_value={"analysis": "🧪 Mocked", "tests": "🧪 Tests"})
+    with patch("app.llm.analyze_with_tests_async", new=mock):
+        for user in (app.test_client(), app.test_client()):
+            data = {
+                "srs_file": (
+                    io.BytesIO(b"# Shared Name\nREQ-1 The system shall power on."),
+                    "srs.txt",
+                )
+            }
+            response = user.post("/upload", data=data, content_type="multipart/form-data")
+
+            assert response.status_code == 200
+            assert b"Reused analysis" not in response.data
+
+    assert mock.await_count == 2
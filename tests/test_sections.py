@@ -0,0 +1,69 @@
+import json
+
+from app.parser import parse_sections_with_bodies
+from app.sections import Requirement, Section, parse_sections_compact
+from app.traceability import build_traceability_index
+
+SAMPLE = (
+    "Software Requirements Specification\n"
+    "Version: 1.0\n"
+    "\n"
+    "1. Introduction ........ 1\n"
+    "# 1 Introduction\n"
+    "  REQ-001 The system shall log in users.  \r\n"
+    "\n"
+    "2. Scope ........ 3\n"
+    "ID: NFR-7 Responses within 200 ms.\n"
+    "\n"
+    "SYSTEM FEATURES\n"
+    "\n"
+    "REQ-002 Reports export to CSV.\x0cmore text\n"
+)
+
+
+# ✅ Test compact sections compare equal to the dict parser output
+def test_compact_matches_dict_parser():
+    compact = parse_sections_compact(SAMPLE)
+    expected = parse_sections_with_bodies(SAMPLE)
+
+    assert compact == expected
+    assert [section.to_dict() for section in compact] == expected
+    assert json.dumps([s.to_dict() for s in compact]) == json.dumps(expected)
+
+
+# ✅ Test sections point into the source instead of copying it
+def test_sections_store_offsets_into_shared_source():
+    sections = parse_sections_compact(SAMPLE)
+    section = sections[0]
+
+    assert not hasattr(section, "__dict__")
+    assert section._source is SAMPLE
+    # The TOC line inside the body splits it into two source ranges
+    assert len(section._spans) == 2
+    assert section.body == (
+        "REQ-001 The system shall log in users.\n\nID: NFR-7 Responses within 200 ms."
+    )
+
+    requirement = section.requirements[0]
+    assert isinstance(requirement, Requirement)
+    assert requirement == {"id": "REQ-001", "text": "REQ-001 The system shall log in users."}
+
+
+# ✅ Test the dict-compatible view supports existing callers
+def test_section_mapping_behaviour():
+    section = parse_sections_compact(SAMPLE)[1]
+
+    assert isinstance(section, Section)
+    assert section["title"] == "SYSTEM FEATURES"
+    assert section.get("analysis") is None
+    assert list(section) == ["id", "title", "body", "requirements"]
+
+    section["analysis"] = "✅ Clear"
+    section["body"] = "Overridden"
+    assert section["analysis"] == "✅ Clear"
+    assert section.body == "Overridden"
+    assert list(section)[-1] == "analysis"
+
+    index = build_traceability_index(parse_sections_compact(SAMPLE))
+    assert index["REQ-002"]["section_title"] == "SYSTEM FEATURES"
+    assert index["ID: NFR-7"]["text"] == "ID: NFR-7 Responses within 200 ms."
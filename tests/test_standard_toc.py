@@ -0,0 +1,96 @@
+"""
+Tests for the standard TOC template registry.
+"""
+
+import json
+
+import pytest
+
+import app.standard_toc as standard_toc
+from app.standard_toc import (
+    DEFAULT_TEMPLATE_ID,
+    IEEE_830_TOC,
+    ISO_29148_TOC,
+    STANDARD_TOC,
+    get_toc_template,
+    list_toc_templates,
+    register_toc_template,
+    score_toc_templates,
+    select_toc_template,
+)
+
+
+@pytest.fixture
+def isolated_registry(monkeypatch):
+    # Work on a copy so registrations do not leak into other tests
+    monkeypatch.setattr(standard_toc, "_templates", dict(standard_toc._templates))
+    monkeypatch.setattr(standard_toc, "_indexes", dict(standard_toc._indexes))
+    monkeypatch.setattr(standard_toc, "_title_index", {})
+    standard_toc._rebuild_title_index()
+    yield
+    standard_toc._rebuild_title_index()
+
+
+# ✅ Test the built-in templates are registered, with the default first
+def test_builtin_templates():
+    ids = [t.id for t in list_toc_templates()]
+    assert ids[:3] == [DEFAULT_TEMPLATE_ID, "ieee-830", "iso-29148"]
+    assert get_toc_template().sections == tuple(STANDARD_TOC)
+    assert get_toc_template("ieee-830").toc_index.entries[0].tokens == ("introduction",)
+    with pytest.raises(KeyError):
+        get_toc_template("missing")
+
+
+# ✅ Test per-document alignments neither rebuild nor evict template indexes
+def test_template_index_kept_by_registry():
+    from app.toc_alignment import align_toc
+    from app.toc_matcher import get_toc_index
+
+    template = get_toc_template("ieee-830")
+    index = template.toc_index
+    get_toc_index.cache_clear()
+    for n in range(40):
+        align_toc([f"{n}. Custom chapter {n}"], list(template.sections), fuzzy=True)
+
+    assert get_toc_template("ieee-830").toc_index is index
+    assert get_toc_index.cache_info().currsize == 0
+
+
+# ✅ Test auto-selection picks the standard a document follows
+@pytest.mark.parametrize(
+    "toc, expected_id",
+    [
+        (IEEE_830_TOC[:8], "ieee-830"),
+        (["1 Introduction", "1.1 Purpose", "1.6 Limitations", "4 Verification"], "iso-29148"),
+        (STANDARD_TOC, DEFAULT_TEMPLATE_ID),
+        (["Nothing", "Familiar"], DEFAULT_TEMPLATE_ID),
+    ],
+)
+def test_select_toc_template(toc, expected_id):
+    assert select_toc_template(toc).id == expected_id
+
+
+# ✅ Test scores are F1 values over shared normalized titles
+def test_score_toc_templates():
+    scores = score_toc_templates(ISO_29148_TOC)
+    assert scores["iso-29148"] == 1.0
+    assert 0 < scores["ieee-830"] < 1.0
+
+
+# ✅ Test internal templates can be registered and are used for selection
+def test_register_internal_template(isolated_registry):
+    register_toc_template("acme", "ACME internal", ["Charter", "Risk Register", "Sign-off"])
+
+    assert select_toc_template(["Charter", "Risk Register"]).id == "acme"
+    with pytest.raises(ValueError):
+        register_toc_template("acme", "Again", ["Charter"])
+
+
+# ✅ Test templates listed in SPECSENSE_TOC_TEMPLATES are loaded
+def test_templates_from_environment(isolated_registry, tmp_path, monkeypatch):
+    path = tmp_path / "templates.json"
+    path.write_text(json.dumps({"ops": {"name": "Ops runbook", "sections": ["Alerts"]}}))
+    monkeypatch.setenv("SPECSENSE_TOC_TEMPLATES", str(path))
+    monkeypatch.setattr(standard_toc, "_env_loaded", False)
+
+    assert get_toc_template("ops").name == "Ops runbook"
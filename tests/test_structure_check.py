@@ -22,7 +22,7 @@ def test_structure_check_txt_strict_match():
 def monkeypatch_compare_toc(monkeypatch):
     from app import structure_check
 
-    def fake_compare_toc(actual, expected, use_llm=False):
+    def fake_compare_toc(actual, expected, use_llm=False, index=None):
         return {
             "matched": ["1. Introduction", "2. Scope"],
             "missing_from_standard": [],
@@ -52,7 +52,8 @@ def test_structure_check_txt_fuzzy_match(monkeypatch_compare_toc):
 
 @pytest.fixture
 def monkeypatch_docx(monkeypatch):
-    from app import toc_extractor
+    from app import ingestion
+    from app.docx_stream import DocParagraph
 
     paragraphs = [
         SimpleNamespace(text="1. Overview", style=SimpleNamespace(name="TOC 1")),
@@ -64,8 +65,11 @@ def monkeypatch_docx(monkeypatch):
         ),
         SimpleNamespace(text="Not a TOC item", style=SimpleNamespace(name="Heading 1")),
     ]
-    mock_doc = SimpleNamespace(paragraphs=paragraphs)
-    monkeypatch.setattr(toc_extractor, "Document", lambda x: mock_doc)
+    monkeypatch.setattr(
+        ingestion,
+        "iter_docx_lines",
+        lambda x: [DocParagraph(p.text, p.style.name) for p in paragraphs],
+    )
 
 
 # Should pass with LLM-enabled fuzzy matching (mocked)
@@ -73,7 +77,7 @@ def test_structure_check_docx_fuzzy_match_placeholder(monkeypatch_docx, monkeypa
     from app.structure_check import run_structure_check
     from io import BytesIO
 
-    def fake_compare_toc(actual, expected, use_llm=False):
+    def fake_compare_toc(actual, expected, use_llm=False, index=None):
         return {
             "matched": ["1. Overview", "2. System Description", "3. Requirements"],
             "missing_from_standard": [],
@@ -161,3 +165,21 @@ def test_compare_toc_to_parsed_sections_matches_on_id_and_title():
     ]
     result = compare_toc_to_parsed_sections(toc, parsed)
     assert "1.2 Scope" in result["matched"]
+
+
+# Should compare against the requested or auto-selected template
+def test_structure_check_template_selection():
+    sample_txt = (
+        b"1. Introduction .......... 1\n"
+        b"1.5 Overview .......... 2\n"
+        b"2. Overall Description .......... 3\n"
+        b"2.1 Product Perspective .......... 3\n"
+    )
+
+    auto = run_structure_check(BytesIO(sample_txt), is_docx=False, template_id="auto")
+    default = run_structure_check(BytesIO(sample_txt), is_docx=False)
+
+    assert auto["template"] == "ieee-830"
+    assert "2.1 Product Perspective" in auto["matched"]
+    assert default["template"] == "specsense"
+    assert "2.1 Product Perspective" in default["extra"]
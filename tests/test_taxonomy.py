@@ -0,0 +1,120 @@
+"""
+Tests for loading, caching and hot-reloading requirement taxonomies.
+"""
+
+import json
+import os
+
+import pytest
+
+from app.requirement_grouper import (
+    detect_gaps,
+    get_requirement_categories,
+    group_requirements,
+)
+from app.taxonomy import DEFAULT_CATEGORIES, get_taxonomy, load_taxonomy
+
+
+def _write(path, content, mtime_ns=None):
+    path.write_text(content, encoding="utf-8")
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+    return str(path)
+
+
+# ✅ Test a taxonomy builds one matcher per mode and reuses it
+def test_taxonomy_matcher_is_cached_per_mode():
+    taxonomy = get_taxonomy()
+
+    assert taxonomy.matcher() is get_taxonomy().matcher()
+    assert taxonomy.matcher() is not taxonomy.matcher(word_boundary=True)
+
+
+# ✅ Test the built-in taxonomy is used when no file is configured
+def test_default_taxonomy():
+    assert get_taxonomy().categories == DEFAULT_CATEGORIES
+    assert get_requirement_categories() == DEFAULT_CATEGORIES
+
+
+# ✅ Test JSON, TOML and YAML files load into the same categories
+@pytest.mark.parametrize(
+    "filename, content",
+    [
+        ("payments.json", json.dumps({"Compliance": ["pci", "audit trail"]})),
+        ("payments.toml", 'name = "payments"\n[categories]\nCompliance = ["pci", "audit trail"]\n'),
+        ("payments.yaml", "Compliance:\n  - pci\n  - audit trail\n"),
+    ],
+)
+def test_load_taxonomy_formats(tmp_path, filename, content):
+    if filename.endswith(".yaml"):
+        pytest.importorskip("yaml")
+    taxonomy = load_taxonomy(_write(tmp_path / filename, content))
+    assert taxonomy.name == "payments"
+    assert taxonomy.categories == {"Compliance": ["pci", "audit trail"]}
+
+
+# ✅ Test malformed taxonomies are rejected with ValueError
+@pytest.mark.parametrize(
+    "filename, content",
+    [
+        ("bad.json", "{not json"),
+        ("bad.json", json.dumps({"Compliance": "pci"})),
+        ("bad.json", json.dumps({})),
+        ("bad.ini", "[Compliance]"),
+    ],
+)
+def test_load_taxonomy_rejects_invalid(tmp_path, filename, content):
+    with pytest.raises(ValueError):
+        load_taxonomy(_write(tmp_path / filename, content))
+
+
+# ✅ Test grouping and gap detection follow a project taxonomy
+def test_grouping_with_taxonomy_file(tmp_path):
+    path = _write(
+        tmp_path / "project.json",
+        json.dumps({"Compliance": ["pci"], "Reporting": ["report"]}),
+    )
+    reqs = [{"id": "REQ-1", "text": "Card data shall be PCI compliant."}]
+
+    grouped = group_requirements(reqs, taxonomy_path=path)
+
+    assert grouped == {"Compliance": reqs, "Reporting": []}
+    assert detect_gaps(grouped, taxonomy_path=path) == ["Reporting"]
+
+
+# ✅ Test SPECSENSE_TAXONOMY selects the default taxonomy file
+def test_taxonomy_from_environment(tmp_path, monkeypatch):
+    path = _write(tmp_path / "env.json", json.dumps({"Compliance": ["pci"]}))
+    monkeypatch.setenv("SPECSENSE_TAXONOMY", path)
+    assert list(get_requirement_categories()) == ["Compliance"]
+
+
+# ✅ Test a file is loaded once and reloaded (with a new matcher) when it changes
+def test_taxonomy_hot_reload(tmp_path):
+    path = _write(tmp_path / "t.json", json.dumps({"A": ["alpha"]}), 1_000_000_000)
+
+    first = get_taxonomy(path)
+    assert get_taxonomy(path) is first
+
+    _write(tmp_path / "t.json", json.dumps({"B": ["beta"]}), 2_000_000_000)
+    second = get_taxonomy(path)
+
+    assert second is not first
+    assert second.matcher().match("beta release") == ["B"]
+
+
+# ✅ Test a broken edit keeps the last good version instead of failing
+def test_taxonomy_reload_keeps_previous_on_error(tmp_path):
+    path = _write(tmp_path / "t.json", json.dumps({"A": ["alpha"]}), 1_000_000_000)
+    first = get_taxonomy(path)
+
+    _write(tmp_path / "t.json", "{half written", 2_000_000_000)
+    with pytest.warns(UserWarning):
+        assert get_taxonomy(path) is first
+    assert get_taxonomy(path) is first  # no retry until the file changes again
+
+
+# ✅ Test a missing file raises ValueError
+def test_missing_taxonomy_file(tmp_path):
+    with pytest.raises(ValueError):
+        get_taxonomy(str(tmp_path / "missing.json"))
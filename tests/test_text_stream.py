@@ -0,0 +1,92 @@
+import codecs
+from io import BytesIO
+
+import pytest
+
+import app.text_stream as text_stream
+from app.parser import iter_sections, parse_sections_with_bodies
+from app.text_stream import (
+    detect_encoding,
+    iter_text_chunks,
+    iter_text_file,
+    iter_text_lines,
+    read_text,
+)
+
+SAMPLE = "1. Introduction\r\nREQ-1 The système shall démarrer.\r\n\r\n2. Scope\nCafé ü\n" * 50
+
+
+class PlainStream:
+    # A binary stream without getbuffer(), like a Flask upload's stream
+    def __init__(self, data: bytes):
+        self._file = BytesIO(data)
+
+    def read(self, size: int = -1) -> bytes:
+        return self._file.read(size)
+
+    def seek(self, offset: int) -> int:
+        return self._file.seek(offset)
+
+
+# ✅ Test encodings are detected from BOMs, UTF-8 validity and charset-normalizer
+@pytest.mark.parametrize(
+    "data, expected",
+    [
+        (codecs.BOM_UTF8 + "é".encode("utf-8"), "utf-8-sig"),
+        ("é".encode("utf-16"), "utf-16"),
+        ("é".encode("utf-32"), "utf-32"),
+        ("plain é".encode("utf-8"), "utf-8"),
+    ],
+)
+def test_detect_encoding(data, expected):
+    assert detect_encoding(data) == expected
+
+
+# ✅ Test incremental decoding matches whole-text decoding across chunk splits
+@pytest.mark.parametrize("encoding", ["utf-8", "utf-8-sig", "utf-16", "utf-32", "cp1252"])
+def test_iter_text_chunks_round_trip(encoding):
+    data = SAMPLE.encode(encoding)
+    assert "".join(iter_text_chunks(data, chunk_size=7)) == SAMPLE
+
+
+# ✅ Test lines regroup exactly as str.splitlines(), including split "\r\n"
+def test_iter_text_lines_chunk_boundaries():
+    lines = list(iter_text_lines(iter(["a\r", "\nb", "\n", "c"])))
+    assert lines == ["a\r\n", "b\n", "c"]
+    assert [line.rstrip("\r\n") for line in lines] == "a\r\nb\nc".splitlines()
+
+
+# ✅ Test files on disk, in-memory uploads and plain streams all decode
+def test_read_text_sources(tmp_path, monkeypatch):
+    data = SAMPLE.encode("cp1252")
+    path = tmp_path / "export.txt"
+    path.write_bytes(data)
+    (tmp_path / "empty.txt").write_bytes(b"")
+    upload = BytesIO(data)
+
+    assert read_text(str(path)) == SAMPLE
+    assert read_text(tmp_path / "empty.txt") == ""
+    assert read_text(upload) == SAMPLE
+    upload.write(b"!")  # the buffer view was released
+
+    assert read_text(PlainStream(data)) == SAMPLE
+    monkeypatch.setattr(text_stream, "SPOOL_MAX_MEMORY", 100)  # spool rolls to disk
+    assert read_text(PlainStream(data)) == SAMPLE
+
+
+# ✅ Test a file streams into the parser with the same sections as whole-text parsing
+def test_iter_text_file_feeds_parser(tmp_path):
+    path = tmp_path / "export.txt"
+    path.write_bytes(SAMPLE.encode("utf-16"))
+
+    assert list(iter_sections(iter_text_file(path))) == parse_sections_with_bodies(SAMPLE)
+
+    lines = iter_text_file(path)
+    next(lines)
+    lines.close()  # abandoning the stream releases the memory map
+
+
+# ✅ Test charset-normalizer results: Windows-1252 wins ties, others still detected
+def test_detect_encoding_legacy_code_pages():
+    assert detect_encoding("The système shall démarrer.".encode("cp1252")) == "cp1252"
+    assert detect_encoding("Zażółć gęślą jaźń system".encode("cp1250")) == "cp1250"
@@ -0,0 +1,86 @@
+"""
+Tests for order-aware TOC alignment.
+"""
+
+import random
+
+from app.toc_alignment import _longest_increasing, align_toc
+
+
+def _lines(items, key="line"):
+    return [item[key] for item in items]
+
+
+# ✅ Test an in-order TOC aligns completely, ignoring numbering and case
+def test_align_in_order():
+    expected = ["1. Introduction", "2. Scope", "3. References"]
+    actual = ["1 INTRODUCTION", "2.   Scope ....... 4", "3. References"]
+
+    result = align_toc(actual, expected)
+
+    assert _lines(result["matched"], "section") == expected
+    assert result["moved"] == result["missing"] == result["extra"] == []
+
+
+# ✅ Test a misplaced section is reported as moved, with positions
+def test_align_reports_moved_section():
+    expected = ["Introduction", "Scope", "References", "Appendices"]
+    actual = ["Introduction", "References", "Appendices", "Scope"]
+
+    result = align_toc(actual, expected)
+
+    assert _lines(result["matched"]) == ["Introduction", "References", "Appendices"]
+    assert result["moved"] == [
+        {
+            "section": "Scope",
+            "line": "Scope",
+            "expected_position": 1,
+            "actual_position": 3,
+        }
+    ]
+
+
+# ✅ Test missing and extra entries keep their positions
+def test_align_missing_and_extra():
+    result = align_toc(["Intro", "Scope", "Glossary"], ["Scope", "References"])
+
+    assert _lines(result["matched"]) == ["Scope"]
+    assert result["missing"] == [{"section": "References", "expected_position": 1}]
+    assert result["extra"] == [
+        {"line": "Intro", "actual_position": 0},
+        {"line": "Glossary", "actual_position": 2},
+    ]
+
+
+# ✅ Test repeated titles pair up in order of appearance
+def test_align_duplicate_titles():
+    result = align_toc(["Notes", "Scope", "Notes"], ["Notes", "Scope", "Notes"])
+    assert len(result["matched"]) == 3
+
+
+# ✅ Test fuzzy mode pairs typos left over after exact alignment
+def test_align_fuzzy():
+    expected = ["1. Introduction", "1.1 Purpose", "1.2 Scope", "2. References"]
+    actual = ["1. Introduction", "1.2 Scope", "2. References", "1.1 Pupose"]
+
+    strict = align_toc(actual, expected)
+    fuzzy = align_toc(actual, expected, fuzzy=True)
+
+    assert _lines(strict["missing"], "section") == ["1.1 Purpose"]
+    assert _lines(fuzzy["moved"]) == ["1.1 Pupose"]
+    assert fuzzy["missing"] == fuzzy["extra"] == []
+
+
+# ✅ Test the in-order run is a longest increasing subsequence
+def test_longest_increasing_length():
+    rng = random.Random(5)
+    for _ in range(200):
+        values = rng.sample(range(30), rng.randint(0, 12))
+        best = [1] * len(values)
+        for i in range(len(values)):
+            for j in range(i):
+                if values[j] < values[i]:
+                    best[i] = max(best[i], best[j] + 1)
+        chain = sorted(_longest_increasing(values))
+        assert len(chain) == max(best, default=0)
+        assert all(values[a] < values[b] for a, b in zip(chain, chain[1:]))
@@ -64,3 +64,47 @@ def test_compare_toc_with_llm_enabled(mock_llm):
         "System Overview",
     ]
     assert result["strict_comparison"]["extra"] == ["Intro", "System Scope", "Features"]
+
+
+# ✅ Test fuzzy mode scores sections locally without calling the LLM
+@patch("app.llm.compare_toc_sections_with_llm")
+def test_compare_toc_fuzzy_is_local(mock_llm):
+    result = compare_toc(["1. Introduction", "1.1 Pupose"], ["1. Introduction", "1.1 Purpose"], fuzzy=True)
+
+    fuzzy = result["fuzzy_comparison"]
+    assert [i["section"] for i in fuzzy["matched"]] == ["1. Introduction"]
+    assert [i["section"] for i in fuzzy["fuzzy_matched"]] == ["1.1 Purpose"]
+    assert "llm_fuzzy_comparison" not in result
+    mock_llm.assert_not_called()
+
+
+# ✅ Test the LLM is only consulted for sections the local matcher leaves unresolved
+@patch("app.llm.compare_toc_sections_with_llm", return_value="*Mocked*")
+def test_compare_toc_llm_only_for_unresolved(mock_llm):
+    standard = ["1. Introduction", "1.1 Purpose", "2. References"]
+    document = ["1. Introduction", "1.1 Pupose", "2. Refs"]
+
+    result = compare_toc(document, standard, use_llm=True)
+
+    mock_llm.assert_called_once_with(["2. References"], ["2. Refs"])
+    assert result["llm_fuzzy_comparison"] == "*Mocked*"
+
+
+# ✅ Test the LLM is skipped when every section is resolved locally
+@patch("app.llm.compare_toc_sections_with_llm")
+def test_compare_toc_llm_skipped_when_resolved(mock_llm):
+    result = compare_toc(["1. Introduction"], ["1. Introduction"], use_llm=True)
+
+    mock_llm.assert_not_called()
+    assert "llm_fuzzy_comparison" not in result
+
+
+# ✅ Test strict comparison flags matched sections that are out of order
+def test_compare_toc_reports_moved():
+    expected = ["1. Intro", "2. Scope", "3. References", "4. Appendices"]
+    actual = ["1. Intro", "3. References", "4. Appendices", "2. Scope"]
+
+    result = compare_toc(actual, expected)
+
+    assert result["matched"] == actual
+    assert result["moved"] == ["2. Scope"]
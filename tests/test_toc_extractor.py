@@ -21,7 +21,7 @@ def test_extract_toc_lines_from_text():
 
 
 # Ensures TOC-styled paragraphs in a .docx file are correctly extracted
-def test_extract_toc_lines_from_docx():
+def test_extract_toc_lines_from_docx(monkeypatch):
     # Fake paragraphs with mock style names
     mock_paragraphs = [
         SimpleNamespace(text="1. Overview", style=SimpleNamespace(name="TOC 1")),
@@ -32,16 +32,13 @@ def test_extract_toc_lines_from_docx():
         SimpleNamespace(text="Not a TOC", style=SimpleNamespace(name="Heading 1")),
     ]
 
-    # Fake Document object
-    mock_doc = SimpleNamespace(paragraphs=mock_paragraphs)
-
-    # Patch Document() to return our mock
+    # Patch the streaming reader to yield our mock paragraphs
     import app.toc_extractor as toc_module
 
-    def fake_doc_loader(path: str):
-        return mock_doc
+    def fake_paragraphs(path: str):
+        return [(p.text, p.style.name) for p in mock_paragraphs]
 
-    toc_module.Document = fake_doc_loader
+    monkeypatch.setattr(toc_module, "iter_docx_paragraphs", fake_paragraphs)
 
     expected = ["1. Overview", "2. System Description", "3. Requirements"]
     result = extract_toc_lines_from_docx("fake_path.docx")
@@ -0,0 +1,88 @@
+"""
+Tests for the local fuzzy TOC matcher.
+"""
+
+from app.standard_toc import STANDARD_TOC
+from app.toc_matcher import (
+    fuzzy_match_toc,
+    format_fuzzy_toc_result,
+    normalize_toc_entry,
+    title_similarity,
+    word_similarity,
+)
+
+
+def _sections(result, key):
+    return [item["section"] for item in result[key]]
+
+
+# ✅ Test numbering, dot leaders, page numbers and stopwords are normalized away
+def test_normalize_toc_entry():
+    entry = normalize_toc_entry("1.2. Overview of the System ....... 7")
+    assert entry.number == "1.2"
+    assert entry.tokens == ("overview", "system")
+    assert entry.key == "1.2 overview system"
+    assert normalize_toc_entry("Scope").number is None
+
+
+# ✅ Test word similarity tolerates typos and abbreviations
+def test_word_similarity():
+    assert word_similarity("pupose", "purpose") > 0.8
+    assert word_similarity("intro", "introduction") == 0.75
+    assert word_similarity("refs", "references") == 0.7
+    assert word_similarity("scope", "appendices") < 0.6
+
+
+# ✅ Test title similarity rewards contained and reordered titles
+def test_title_similarity():
+    assert title_similarity(("definitions",), ("definitions", "acronyms")) == 0.85
+    assert title_similarity(("system", "overview"), ("overview", "system")) == 0.85
+    assert title_similarity(("references",), ("appendices",)) == 0.0
+
+
+# ✅ Test classification into matched, fuzzy matched, unresolved and missing
+def test_fuzzy_match_toc_classification():
+    document = [
+        "1. Introduction",
+        "1.1 Pupose",
+        "1.2 Scope",
+        "1.3 Definitions and Acronyms",
+        "2. Refs",
+        "3. Overview of the System",
+        "4. System Features",
+        "6. External Interface Requirements",
+        "Glossary",
+    ]
+
+    result = fuzzy_match_toc(document, STANDARD_TOC)
+
+    assert _sections(result, "matched") == [
+        "1. Introduction",
+        "1.2 Scope",
+        "4. System Features",
+    ]
+    assert _sections(result, "fuzzy_matched") == [
+        "1.1 Purpose",
+        "1.3 Definitions",
+        "3. System Overview",
+        "5. External Interface Requirements",
+    ]
+    assert result["fuzzy_matched"][0]["match"] == "1.1 Pupose"
+    assert result["fuzzy_matched"][3]["score"] == 0.95  # renumbered
+    assert _sections(result, "unresolved") == ["2. References"]
+    assert _sections(result, "missing") == ["6. Other Requirements", "7. Appendices"]
+    assert result["extra"] == ["Glossary"]
+
+
+# ✅ Test each document line is paired with at most one standard section
+def test_fuzzy_match_toc_one_to_one():
+    result = fuzzy_match_toc(["Scope"], ["1. Scope", "2. Scope"])
+    assert _sections(result, "fuzzy_matched") == ["1. Scope"]
+    assert _sections(result, "missing") == ["2. Scope"]
+
+
+# ✅ Test the Markdown rendering uses the LLM comparison's headings
+def test_format_fuzzy_toc_result():
+    text = format_fuzzy_toc_result(fuzzy_match_toc(["1.1 Pupose"], ["1.1 Purpose"]))
+    assert "Fuzzy Matched Sections:\n- 1.1 Purpose (Fuzzy match to: '1.1 Pupose'" in text
+    assert "Missing Sections:\n- None" in text
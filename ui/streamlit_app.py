@@ -6,15 +6,17 @@ Allows users to input SRS text and view extracted section headers and content.
 
 import streamlit as st
 import json
-from app.parser import parse_sections_with_bodies
 from app.formatter import format_llm_response
-from app.llm import analyze_requirement, suggest_tests, summarize_analysis
+from app.incremental import IncrementalAnalyzer
+from app.llm import summarize_analysis
 from app.export import (
     format_analysis_as_markdown,
     generate_requirement_summary_from_sections,
     group_requirements_with_llm,
 )
-from app.file_reader import read_uploaded_file
+from app.ingestion import ingest_upload
+from app.standard_toc import get_toc_template, list_toc_templates
+from app.toc_matcher import format_fuzzy_toc_result
 from ui.components import render_section_result
 from app.traceability import (
     build_traceability_index,
@@ -38,17 +40,31 @@ def main():
         use_llm_fuzzy = st.checkbox(
             " Enable LLM fuzzy TOC comparison",
             value=False,
-            help="Uses GPT-4 to identify approximate matches between your document's TOC and a known standard. May be slower.",
+            help="Scores approximate matches between your document's TOC and a known standard locally, and asks GPT-4 only about borderline sections.",
+        )
+        templates = {"auto": "Auto-detect"}
+        templates.update((t.id, t.name) for t in list_toc_templates())
+        toc_template = st.selectbox(
+            "Standard TOC template",
+            options=list(templates),
+            format_func=templates.get,
+            help="Structure Check compares your TOC with this outline; Auto-detect picks the closest one.",
+        )
+        taxonomy_path = (
+            st.text_input(
+                "Requirement taxonomy file (optional)",
+                help="JSON, TOML or YAML file of categories and keywords. Edits are picked up on the next run.",
+            ).strip()
+            or None
         )
 
     # Upload option first
     uploaded_file = st.file_uploader(
         "Upload a .txt or .docx SRS file", type=["txt", "docx"]
     )
-    if uploaded_file:
-        is_docx = uploaded_file.name.lower().endswith(".docx")
-
-    document_text = read_uploaded_file(uploaded_file)
+    # Read the upload once; the structure check and the parser share it
+    document = ingest_upload(uploaded_file)
+    document_text = document.text if document else None
 
     # Paste fallback only if no file uploaded
     if document_text is None:
@@ -59,11 +75,16 @@ def main():
     if st.button("Run Structure Check"):
         from app.structure_check import run_structure_check
 
-        # Dispatch to structure_check.py, which extracts TOC lines and compares to STANDARD_TOC
-        toc_result = run_structure_check(uploaded_file, is_docx, use_llm=use_llm_fuzzy)
+        if document is None:
+            st.warning("Please upload a .txt or .docx file to check its structure.")
+            return
+
+        # Dispatch to structure_check.py, which extracts TOC lines and compares
+        # them to the selected standard TOC template
+        toc_result = run_structure_check(
+            document, document.is_docx, use_llm=use_llm_fuzzy, template_id=toc_template
+        )
         display_structure_check_results(toc_result)
-        # Rewind the file stream so it can be re-used later by read_uploaded_file()
-        uploaded_file.seek(0)
 
     # Run parser + analysis on button click
     if st.button("Analyze"):
@@ -71,8 +92,12 @@ def main():
             st.warning("Please provide SRS content either via upload or paste.")
             return
 
-        # Step 1: Parse SRS into sections (headers + body content)
-        results = parse_sections_with_bodies(document_text)
+        # Step 1: Parse SRS into sections (headers + body content), reusing
+        # unchanged sections from the previous run in this session
+        analyzer = st.session_state.setdefault(
+            "incremental_analyzer", IncrementalAnalyzer()
+        )
+        results = analyzer.parse(document_text)
         st.session_state["parsed_sections"] = results
         st.success(f"Found {len(results)} sections.")
 
@@ -85,30 +110,31 @@ def main():
         # Generate requirement group summary
 
         with st.expander("📊 Requirements Overview"):
-            st.markdown(generate_requirement_summary_from_sections(results))
-
-        # Step 2: Analyze each section via LLM and format results
+            try:
+                st.markdown(
+                    generate_requirement_summary_from_sections(results, taxonomy_path)
+                )
+            except ValueError as e:
+                st.warning(f"Could not load taxonomy: {e}")
+
+        # Step 2: Analyze all sections concurrently via LLM and format results
         analysis_results = {}
-        for section in results:
-            body = section["body"]
-
-            # Run analysis first
-            analysis = analyze_requirement(body)
-            formatted = format_llm_response(analysis)
-
-            # Only call suggest_tests if analysis was actually performed
-            if "Skipped analysis" in analysis:
-                test_suggestions = "⚠️ Skipped: section too short or empty."
-            else:
-                test_suggestions = suggest_tests(body)
+        llm_results = analyzer.analyze(results)
+        if analyzer.report["reused_analyses"]:
+            st.info(
+                f"♻️ Reused analysis for {analyzer.report['reused_analyses']} of "
+                f"{analyzer.report['sections']} sections from the previous run."
+            )
+        for section, llm_result in zip(results, llm_results):
+            analysis = llm_result["analysis"]
 
             analysis_results[section["title"]] = {
                 "id": section.get("id"),
                 "title": section["title"],
-                "body": body,
-                "analysis": formatted,
+                "body": section["body"],
+                "analysis": format_llm_response(analysis),
                 "raw": analysis,
-                "tests": test_suggestions,
+                "tests": llm_result["tests"],
             }
         st.session_state["analysis_results"] = analysis_results
         # Optional: View raw analysis result dictionary
@@ -188,8 +214,11 @@ def display_structure_check_results(result: dict):
       - matched (found in both doc and standard)
       - missing (expected but not present)
       - extra (present but not expected)
+      - out of order (present, but not in the standard's order)
     """
     st.subheader("📋 TOC Conformance Result")
+    if "template" in result:
+        st.caption(f"Checked against: {get_toc_template(result['template']).name}")
     if "strict_comparison" in result:
         strict_result = result["strict_comparison"]
     else:
@@ -216,8 +245,30 @@ def display_structure_check_results(result: dict):
         else:
             st.success("No extra sections found.")
 
+    moved = (
+        result["alignment"]["moved"]
+        if "alignment" in result
+        else [{"line": line} for line in strict_result.get("moved", [])]
+    )
+    with st.expander("🔀 Out-of-Order Sections"):
+        if moved:
+            for item in moved:
+                position = (
+                    f" (standard position {item['expected_position'] + 1}, "
+                    f"document position {item['actual_position'] + 1})"
+                    if "expected_position" in item
+                    else ""
+                )
+                st.markdown(f"- {item['line']}{position}")
+        else:
+            st.success("All matched sections follow the standard order.")
+
+    if "fuzzy_comparison" in result:
+        with st.expander("🔎 Fuzzy Match Results"):
+            st.markdown(format_fuzzy_toc_result(result["fuzzy_comparison"]))
+
     if "llm_fuzzy_comparison" in result:
-        with st.expander("🧠 LLM Fuzzy Match Results"):
+        with st.expander("🧠 LLM Review of Unresolved Sections"):
             st.markdown(result["llm_fuzzy_comparison"])
 
 